@@ -0,0 +1,303 @@
+"""
+Asynchronous engine for the Documentation Analyzer Agent.
+Fetches with httpx, calls Claude through AsyncAnthropic and bounds the number
+of in-flight articles with a semaphore, so one event loop can serve hundreds
+of analyses. CPU-bound parsing and readability scoring run in a worker pool
+(threads by default; pass a ProcessPoolExecutor to use every core), and the
+blocking SQLite cache and page store calls run in threads off the loop.
+Prompts, section builders, caching and result assembly are shared with
+DocumentationAnalyzer, so both engines produce identical reports.
+"""
+
+import asyncio
+import contextvars
+import copy
+import functools
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import anthropic
+import httpx
+
+from batch_analyzer import error_record
+from doc_analyzer import (ANALYZERS, COMBINED_MAX_TOKENS, MAX_TOKENS, MODEL, PROMPTS, DocumentationAnalyzer,
+                          SuggestionParser, combined_prompt, conditional_headers, parse_combined_response, replayable)
+from llm_cache import LLMCache
+from metrics import Metrics, add_stages, count, recording, timed
+from page_store import PageStore
+from parse_stage import parse_and_time
+from rate_limiter import RETRY_STATUSES, RateLimiter, estimate_tokens
+
+class AsyncDocumentationAnalyzer:
+    def __init__(self, anthropic_api_key: str, max_concurrency: int = 32, requests_per_minute: int = 50,
+                 cache: Optional[LLMCache] = None, page_store: Optional[PageStore] = None,
+                 combined: bool = False, partial_parse: bool = False, metrics: bool = False, metrics_sink=None,
+                 executor: Optional[Executor] = None, retries: int = 3, backoff: float = 0.5,
+                 incremental: bool = False, tokens_per_minute: Optional[int] = None,
+                 rate_limiter: Optional[RateLimiter] = None, prescreen: bool = False,
+                 chunk_tokens: Optional[int] = None, max_chunks: int = 8,
+                 on_suggestion: Optional[Callable[[str, str], None]] = None):
+        # The synchronous analyzer supplies prompts, section builders and result assembly;
+        # its own Anthropic client and requests session are never built.
+        self.core = DocumentationAnalyzer(anthropic_api_key, cache=cache, page_store=page_store,
+                                          partial_parse=partial_parse, combined=combined,
+                                          metrics=metrics, metrics_sink=metrics_sink, incremental=incremental,
+                                          requests_per_minute=requests_per_minute,
+                                          tokens_per_minute=tokens_per_minute, rate_limiter=rate_limiter,
+                                          prescreen=prescreen, chunk_tokens=chunk_tokens, max_chunks=max_chunks,
+                                          on_suggestion=on_suggestion)
+        self.client = anthropic.AsyncAnthropic(api_key=anthropic_api_key, max_retries=0)
+        self.http = httpx.AsyncClient(
+            headers={'User-Agent': 'Mozilla/5.0', 'Accept-Encoding': 'gzip, deflate'}, timeout=30,
+            follow_redirects=True, limits=httpx.Limits(max_connections=max_concurrency)
+        )
+        self.max_concurrency = max_concurrency
+        self.rate_limiter = self.core.rate_limiter
+        # A pool created here is shut down by aclose(); one passed in belongs to the caller.
+        self._own_executor = executor is None
+        self.executor = executor or ThreadPoolExecutor()
+        self.retries = retries
+        self.backoff = backoff
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> 'AsyncDocumentationAnalyzer':
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self.http.aclose()
+        await self.client.close()
+        if self._own_executor:
+            self.executor.shutdown(wait=False)
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        # Created lazily so it belongs to the loop that runs the analyses.
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def _offload(self, func, *args):
+        """Run CPU-bound func in the worker pool; a thread pool carries the current metrics context along."""
+        loop = asyncio.get_running_loop()
+        if not isinstance(self.executor, ProcessPoolExecutor):
+            func, args = contextvars.copy_context().run, (func,) + args
+        return await loop.run_in_executor(self.executor, functools.partial(func, *args))
+
+    async def _blocking(self, func, *args):
+        """Run a blocking SQLite (cache or page store) call in a thread, off the event loop."""
+        return await asyncio.to_thread(func, *args)
+
+    async def _get(self, url: str, headers: Dict[str, str]) -> httpx.Response:
+        for attempt in range(self.retries + 1):
+            try:
+                response = await self.http.get(url, headers=headers)
+            except httpx.TransportError:
+                # Connection and read failures are retried too, as urllib3's Retry does for the sync session.
+                if attempt == self.retries:
+                    raise
+                count('retries')
+                await asyncio.sleep(self.backoff * 2 ** attempt)
+                continue
+            if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                return response
+            count('retries')
+            retry_after = response.headers.get('Retry-After', '')
+            await asyncio.sleep(float(retry_after) if retry_after.isdigit() else self.backoff * 2 ** attempt)
+        return response
+
+    async def fetch_page(self, url: str) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+        page_store = self.core.page_store
+        stored = await self._blocking(page_store.get, url) if page_store else None
+        with timed('fetch'):
+            response = await self._get(url, conditional_headers(stored))
+        if response.status_code == 304 and stored:
+            # Without a replayable result the stored content is analyzed again.
+            return stored['content'], replayable(stored)
+        response.raise_for_status()
+        content, stages = await self._offload(parse_and_time, url, response.text, self.core.partial_parse,
+                                              not self.core.incremental)
+        add_stages(stages)
+        if page_store:
+            await self._blocking(page_store.save_page, url, response.text, response.headers.get('ETag'),
+                                 response.headers.get('Last-Modified'), content)
+        return content, None
+
+    async def _cached(self, prompt: str, max_tokens: int) -> Optional[str]:
+        return await self._blocking(self.core._cached, prompt, max_tokens) if self.core.cache else None
+
+    async def _store(self, prompt: str, max_tokens: int, text: str) -> None:
+        if self.core.cache:
+            await self._blocking(self.core.cache.put, MODEL, prompt, max_tokens, text)
+
+    async def _complete(self, prompt: str, max_tokens: int = MAX_TOKENS) -> str:
+        cached = await self._cached(prompt, max_tokens)
+        if cached is not None:
+            return cached
+        message = await self.rate_limiter.call_async(lambda: self.client.messages.create(
+            model=MODEL,
+            max_tokens=max_tokens,
+            messages=[{"role": "user", "content": prompt}]
+        ), estimate_tokens(prompt, max_tokens))
+        self.core._record_usage(message)
+        text = message.content[0].text
+        await self._store(prompt, max_tokens, text)
+        return text
+
+    async def _complete_streaming(self, prompt: str, on_suggestion: Callable[[str], None],
+                                  max_tokens: int = MAX_TOKENS) -> str:
+        cached = await self._cached(prompt, max_tokens)
+        if cached is not None:
+            for suggestion in self.core._extract_feedback_suggestions(cached):
+                on_suggestion(suggestion)
+            return cached
+        emitted = set()
+
+        def emit(suggestions: List[str]) -> None:
+            # A retried stream repeats the suggestions it already delivered; pass each one on once.
+            for suggestion in suggestions:
+                if suggestion not in emitted:
+                    emitted.add(suggestion)
+                    on_suggestion(suggestion)
+
+        async def attempt() -> Tuple[str, SuggestionParser, Any]:
+            parser = SuggestionParser()
+            chunks = []
+            async with self.client.messages.stream(
+                model=MODEL,
+                max_tokens=max_tokens,
+                messages=[{"role": "user", "content": prompt}]
+            ) as stream:
+                async for text in stream.text_stream:
+                    chunks.append(text)
+                    emit(parser.feed(text))
+                    # Leaving the stream early closes the connection and stops generation.
+                    if parser.done:
+                        break
+                message = getattr(stream, 'current_message_snapshot', None)
+            emit(parser.close())
+            return ''.join(chunks), parser, message
+
+        text, parser, message = await self.rate_limiter.call_async(attempt, estimate_tokens(prompt, max_tokens))
+        self.core._record_usage(message)
+        if not parser.done:
+            await self._store(prompt, max_tokens, text)
+        return text
+
+    async def _assess(self, name: str, content: Dict[str, Any], prompt: Optional[str] = None) -> Union[str, Exception]:
+        prompt = prompt or PROMPTS[name](content)
+        on_suggestion = self.core.on_suggestion
+        try:
+            with timed(f'llm_{name}'):
+                if on_suggestion:
+                    return await self._complete_streaming(prompt, lambda s: on_suggestion(name, s))
+                return await self._complete(prompt)
+        except Exception as e:
+            return e
+
+    async def _section(self, name: str, content: Dict[str, Any], assessment: Union[str, Exception]) -> Dict[str, Any]:
+        # Readability scores are precomputed by parse_and_score, so the builders are cheap enough to run inline.
+        return self.core.section(name, content, assessment)
+
+    async def _combined_sections(self, content: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        prompt = combined_prompt(content)
+        try:
+            with timed('llm_combined'):
+                parsed = parse_combined_response(await self._complete(prompt, max_tokens=COMBINED_MAX_TOKENS))
+        except Exception:
+            parsed = {}
+        return self.core.combined_sections(content, parsed,
+                                           await self._run_analyzers(content, [n for n in ANALYZERS if n not in parsed]))
+
+    async def _analyze(self, name: str, content: Dict[str, Any]) -> Dict[str, Any]:
+        chunks = self.core.chunks_for(name, content)
+        if not chunks:
+            return await self._section(name, content, await self._assess(name, content))
+        results = await asyncio.gather(*(self._assess(name, content, prompt)
+                                         for prompt in self.core.chunk_prompts(name, content, chunks)))
+        return self.core.merge_chunks(name, content, chunks, list(results))
+
+    async def _run_analyzers(self, content: Dict[str, Any], names=ANALYZERS) -> Dict[str, Dict[str, Any]]:
+        sections = await asyncio.gather(*(self._analyze(name, content) for name in names))
+        return dict(zip(names, sections))
+
+    async def _build_result(self, content: Dict[str, Any], sections: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        # build_result saves to the page store, if there is one.
+        return await self._blocking(self.core.build_result, content, sections)
+
+    async def analyze_content(self, content: Dict[str, Any]) -> Dict[str, Any]:
+        if self.core.prescreen:
+            return self.core.build_result(content, self.core.prescreen_sections(content))
+        if self.core.incremental:
+            # Reads the snapshot from the page store, so it runs in a thread rather than the worker pool.
+            baseline = await self._blocking(self.core.baseline, content)
+            stale = baseline.stale()
+            if self.core.combined and stale:
+                fresh = await self._combined_sections(baseline.content)
+            else:
+                fresh = await self._run_analyzers(baseline.content, stale)
+            return await self._blocking(self.core.incremental_result, baseline, fresh)
+        if self.core.combined:
+            return await self._build_result(content, await self._combined_sections(content))
+        return await self._build_result(content, await self._run_analyzers(content))
+
+    async def stream_analysis(self, content: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """Yield {'analyzer', 'suggestion'} events as the four concurrent streams produce them,
+        then a final {'result': ...} (or {'error': ...}) event."""
+        events: asyncio.Queue = asyncio.Queue()
+        finished = object()
+        worker = copy.copy(self)
+        worker.core = copy.copy(self.core)
+        worker.core.on_suggestion = lambda name, suggestion: events.put_nowait({'analyzer': name, 'suggestion': suggestion})
+
+        async def run() -> None:
+            try:
+                events.put_nowait({'result': await worker.analyze_content(content)})
+            except Exception as e:
+                events.put_nowait({'error': str(e)})
+            finally:
+                events.put_nowait(finished)
+
+        task = asyncio.ensure_future(run())
+        try:
+            while True:
+                event = await events.get()
+                if event is finished:
+                    return
+                yield event
+        finally:
+            task.cancel()
+
+    async def _analyze_document(self, url: str, stages: List[str]) -> Dict[str, Any]:
+        # Appends 'Analysis' once the fetch is done, so a caller can tell the two kinds of failure apart.
+        async with self.semaphore:
+            metrics = Metrics() if self.core.collects_metrics else None
+            with recording(metrics), timed('total'):
+                content, previous = await self.fetch_page(url)
+                stages.append('Analysis')
+                result = previous if previous is not None else await self.analyze_content(content)
+            return self.core.finish_metrics(result, metrics)
+
+    async def analyze_document(self, url: str) -> Dict[str, Any]:
+        return await self._analyze_document(url, [])
+
+    async def analyze_urls(self, urls: Iterable[str]) -> AsyncIterator[Dict[str, Any]]:
+        """Yield results (or error records, labelled 'Fetch failed' or 'Analysis failed') in completion order."""
+        async def guarded(url: str) -> Dict[str, Any]:
+            stages = ['Fetch']
+            try:
+                return await self._analyze_document(url, stages)
+            except Exception as e:
+                return error_record(url, stages[-1], e)
+
+        for future in asyncio.as_completed([guarded(url) for url in urls]):
+            yield await future
+
+def analyze_urls(anthropic_api_key: str, urls: Iterable[str], **kwargs) -> List[Dict[str, Any]]:
+    """Synchronous entry point: analyze urls on one event loop and return results in completion order."""
+    async def run() -> List[Dict[str, Any]]:
+        async with AsyncDocumentationAnalyzer(anthropic_api_key, **kwargs) as analyzer:
+            return [result async for result in analyzer.analyze_urls(urls)]
+    return asyncio.run(run())
@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+Batch mode for the Documentation Analyzer Agent.
+Reads URLs from a file or sitemap, fetches and analyzes them with bounded
+worker pools and streams one compact JSON record per finished article. HTML parsing
+and readability scoring can be moved to a process pool so they use every core.
+"""
+
+import argparse
+import copy
+import json
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from chunking import count_tokens
+from dedupe import CorpusIndex
+from doc_analyzer import ANALYZERS, PROMPT_CONTENT, DocumentationAnalyzer, has_errors, prompt_view
+from llm_cache import LLMCache
+from page_store import PageStore
+from message_batches import MessageBatchBackend
+from metrics import Metrics, add_stages, recording, sink_from_options, timed
+from output_sinks import complete_lines, open_sinks, truncate_partial
+from parse_stage import parse_and_time
+
+LOC_RE = re.compile(r'<loc>\s*(.*?)\s*</loc>', re.IGNORECASE | re.DOTALL)
+
+def _parse_sitemap(xml: str) -> List[str]:
+    return [loc.replace('&amp;', '&') for loc in LOC_RE.findall(xml)]
+
+def load_urls(source: str, session=None) -> List[str]:
+    """Load URLs from a text file (one per line), a local sitemap.xml or a sitemap URL.
+
+    Sitemap indexes are followed one level at a time until only article URLs remain.
+    """
+    if source.startswith(('http://', 'https://')):
+        response = session.get(source, timeout=30)
+        response.raise_for_status()
+        text = response.text
+    else:
+        with open(source, encoding='utf-8') as f:
+            text = f.read()
+    if '<urlset' not in text and '<sitemapindex' not in text:
+        return [line.strip() for line in text.splitlines() if line.strip() and not line.lstrip().startswith('#')]
+    urls = []
+    for loc in _parse_sitemap(text):
+        if '<sitemapindex' in text:
+            urls.extend(load_urls(loc, session))
+        else:
+            urls.append(loc)
+    return urls
+
+def load_completed(output_path: str) -> Set[str]:
+    """Return URLs already analyzed successfully in a partial (possibly compressed) JSONL output file.
+
+    A record with a failed section is not complete, so its URL is analyzed again.
+    A trailing half-written line (left behind by a crash) is truncated so
+    appending new records keeps the file valid JSONL.
+    """
+    if not os.path.exists(output_path):
+        return set()
+    truncate_partial(output_path)
+    done = set()
+    for line in complete_lines(output_path):
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        if not has_errors(record):
+            done.add(record['url'])
+    return done
+
+def error_record(url: str, stage: str, exc: Exception) -> Dict[str, Any]:
+    return {'url': url, 'analysis_timestamp': datetime.now().isoformat(), 'error': f"{stage} failed: {exc}"}
+
+def reusable_sections(result: Dict[str, Any]) -> Optional[Dict[str, Dict[str, Any]]]:
+    """The LLM output of a result that duplicates may reuse; None when any section failed."""
+    if 'error' in result or any('error' in result[name] or not isinstance(result[name].get('assessment'), str) for name in ANALYZERS):
+        return None
+    return {name: {'assessment': result[name]['assessment'], 'suggestions': result[name]['suggestions']}
+            for name in ANALYZERS}
+
+class BatchAnalyzer:
+    """Two-stage pipeline: a fetch pool feeds an analysis pool, results are written as they finish.
+
+    With parse_workers > 0 the fetch threads hand raw HTML to a process pool
+    for extraction and readability scoring instead of parsing under the GIL.
+    With a dedupe index, boilerplate shared across pages is stripped before
+    prompting and near-duplicate articles reuse an earlier analysis.
+    """
+
+    def __init__(self, analyzer: DocumentationAnalyzer, fetch_workers: int = 8, analysis_workers: int = 4,
+                 parse_workers: int = 0, dedupe: Optional[CorpusIndex] = None):
+        self.analyzer = analyzer
+        self.fetch_workers = fetch_workers
+        self.analysis_workers = analysis_workers
+        self.parse_workers = parse_workers
+        self.dedupe = dedupe
+
+    def _parse_pool(self):
+        return ProcessPoolExecutor(self.parse_workers) if self.parse_workers > 0 else nullcontext()
+
+    def _parser(self, parse_pool) -> Optional[Callable[[str, str], Dict[str, Any]]]:
+        if parse_pool is None:
+            return None
+        partial, score = self.analyzer.partial_parse, not self.analyzer.incremental
+
+        def parse(url: str, html: str) -> Dict[str, Any]:
+            content, stages = parse_pool.submit(parse_and_time, url, html, partial, score).result()
+            add_stages(stages)
+            return content
+        return parse
+
+    def _prompt_tokens(self, content: Dict[str, Any]) -> int:
+        return sum(count_tokens(prompt) for prompt in set(self.analyzer.prompt_inputs(content).values()))
+
+    def _strip(self, content: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, int]]:
+        """content with its boilerplate-free view attached for prompting, and the report of what was removed."""
+        stripped, blocks = self.dedupe.strip(content)
+        if not blocks:
+            return content, {}
+        report = {'blocks_removed': blocks,
+                  'characters_removed': len(content['full_text']) - len(stripped['full_text']),
+                  'tokens_saved': self._prompt_tokens(content) - self._prompt_tokens(stripped)}
+        self.dedupe.count(boilerplate_blocks=blocks, tokens_saved=report['tokens_saved'])
+        # Sections, metrics and metadata still describe the whole article; only the prompts use stripped.
+        content = copy.copy(content)
+        content[PROMPT_CONTENT] = stripped
+        return content, report
+
+    def _reuse(self, content: Dict[str, Any], match, source: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        result = self.analyzer.reuse_result(content, source)
+        tokens = self._prompt_tokens(content)
+        self.dedupe.count(duplicates=1, tokens_saved=tokens)
+        result['duplicate_of'] = {'url': match.url, 'similarity': match.similarity, 'tokens_saved': tokens}
+        return result
+
+    def _analyze(self, content: Dict[str, Any]) -> Dict[str, Any]:
+        """analyze_content, deduplicated against the rest of the run when a dedupe index is set."""
+        if self.dedupe is None:
+            return self.analyzer.analyze_content(content)
+        content, report = self._strip(content)
+        match = self.dedupe.match(prompt_view(content))
+        # Waits for the original if it is still being analyzed; None if its analysis failed.
+        source = match.result() if match else None
+        if source is not None:
+            result = self._reuse(content, match, source)
+        else:
+            try:
+                result = self.analyzer.analyze_content(content)
+            except Exception:
+                if not match:
+                    self.dedupe.resolve(content['url'], None)
+                raise
+            if not match:
+                self.dedupe.resolve(content['url'], reusable_sections(result))
+        return dict(result, boilerplate=report) if report else result
+
+    def _stats(self) -> Dict[str, int]:
+        return dict({'skipped': 0, 'analyzed': 0, 'failed': 0, 'unchanged': 0},
+                    **({'duplicates': 0, 'boilerplate_blocks': 0, 'tokens_saved': 0} if self.dedupe else {}))
+
+    def _finish(self, stats: Dict[str, int], totals: Dict[str, int]) -> Dict[str, int]:
+        if self.dedupe:
+            stats.update({key: value - totals[key] for key, value in self.dedupe.totals.items()})
+        return stats
+
+    def run(self, urls: Iterable[str], output_path: str, resume: bool = True,
+            on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+            summary_path: Optional[str] = None) -> Dict[str, int]:
+        completed = load_completed(output_path) if resume else set()
+        stats = self._stats()
+        totals = dict(self.dedupe.totals) if self.dedupe else {}
+        # Caps the number of articles held in memory between fetch and write.
+        in_flight = threading.BoundedSemaphore(self.fetch_workers + 2 * self.analysis_workers)
+        write_lock = threading.Lock()
+        with open_sinks(output_path, summary_path, append=resume) as out, \
+                ThreadPoolExecutor(self.fetch_workers) as fetch_pool, \
+                ThreadPoolExecutor(self.analysis_workers) as analysis_pool, \
+                self._parse_pool() as parse_pool:
+            parser = self._parser(parse_pool)
+
+            def write(record: Dict[str, Any]) -> None:
+                with write_lock:
+                    out.write(record)
+                    stats['failed' if 'error' in record else 'analyzed'] += 1
+                in_flight.release()
+                if on_result:
+                    on_result(record)
+
+            def fail(url: str, stage: str, exc: Exception) -> None:
+                write(error_record(url, stage, exc))
+
+            def analyze(url: str, content: Dict[str, Any], metrics: Optional[Metrics]) -> None:
+                try:
+                    with recording(metrics), timed('total'):
+                        result = self._analyze(content)
+                except Exception as e:
+                    fail(url, 'Analysis', e)
+                else:
+                    write(self.analyzer.finish_metrics(result, metrics))
+
+            def fetch(url: str) -> None:
+                metrics = Metrics() if self.analyzer.collects_metrics else None
+                try:
+                    with recording(metrics), timed('total'):
+                        content, previous = self.analyzer.fetch_page(url, parser)
+                except Exception as e:
+                    fail(url, 'Fetch', e)
+                else:
+                    if previous is not None:
+                        stats['unchanged'] += 1
+                        write(self.analyzer.finish_metrics(previous, metrics))
+                    else:
+                        if self.dedupe:
+                            self.dedupe.observe(content)
+                        analysis_pool.submit(analyze, url, content, metrics)
+
+            seen = set()
+            for url in urls:
+                if url in completed or url in seen:
+                    stats['skipped'] += 1
+                    continue
+                seen.add(url)
+                in_flight.acquire()
+                fetch_pool.submit(fetch, url)
+            fetch_pool.shutdown(wait=True)
+        return self._finish(stats, totals)
+
+    def run_message_batches(self, urls: Iterable[str], output_path: str, backend: MessageBatchBackend,
+                            docs_per_batch: int = 1000, resume: bool = True,
+                            on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+                            summary_path: Optional[str] = None) -> Dict[str, int]:
+        """Like run, but analyzes groups of docs_per_batch articles through one message batch each."""
+        completed = load_completed(output_path) if resume else set()
+        stats = self._stats()
+        totals = dict(self.dedupe.totals) if self.dedupe else {}
+        todo, seen = [], set()
+        for url in urls:
+            if url in completed or url in seen:
+                stats['skipped'] += 1
+            else:
+                seen.add(url)
+                todo.append(url)
+
+        with open_sinks(output_path, summary_path, append=resume) as out, \
+                ThreadPoolExecutor(self.fetch_workers) as fetch_pool, \
+                self._parse_pool() as parse_pool:
+            parser = self._parser(parse_pool)
+
+            def fetch(url: str):
+                try:
+                    return self.analyzer.fetch_page(url, parser)
+                except Exception as e:
+                    return e
+
+            def write(record: Dict[str, Any]) -> None:
+                out.write(record)
+                stats['failed' if 'error' in record else 'analyzed'] += 1
+                if on_result:
+                    on_result(record)
+
+            for start in range(0, len(todo), docs_per_batch):
+                group = todo[start:start + docs_per_batch]
+                contents = []
+                for url, fetched in zip(group, fetch_pool.map(fetch, group)):
+                    if isinstance(fetched, Exception):
+                        write(error_record(url, 'Fetch', fetched))
+                    elif fetched[1] is not None:
+                        stats['unchanged'] += 1
+                        write(fetched[1])
+                    else:
+                        contents.append(fetched[0])
+                duplicates, reports = [], {}
+                if self.dedupe:
+                    # The whole group is counted before any of it is stripped.
+                    for content in contents:
+                        self.dedupe.observe(content)
+                    originals = []
+                    for content in contents:
+                        content, reports[content['url']] = self._strip(content)
+                        match = self.dedupe.match(prompt_view(content))
+                        (duplicates if match else originals).append((content, match))
+                    contents = [content for content, _ in originals]
+                try:
+                    results = backend.analyze_contents(contents) if contents else []
+                except Exception as e:
+                    results = [error_record(content['url'], 'Analysis', e) for content in contents]
+                for content, result in zip(contents, results):
+                    if self.dedupe:
+                        self.dedupe.resolve(content['url'], reusable_sections(result))
+                    write(dict(result, boilerplate=reports[content['url']]) if reports.get(content['url']) else result)
+                for content, match in duplicates:
+                    source = match.result()
+                    try:
+                        # An original whose analysis failed leaves its duplicates to the regular API.
+                        result = self._reuse(content, match, source) if source else self.analyzer.analyze_content(content)
+                    except Exception as e:
+                        result = error_record(content['url'], 'Analysis', e)
+                    write(dict(result, boilerplate=reports[content['url']]) if reports.get(content['url']) else result)
+        return self._finish(stats, totals)
+
+def main():
+    parser = argparse.ArgumentParser(description='Analyze many documentation URLs into a JSONL file')
+    parser.add_argument('source', help='Text file with one URL per line, or a sitemap file/URL')
+    parser.add_argument('--output', '-o', default='analysis_results.jsonl',
+                        help='JSONL output path (.jsonl.gz or .jsonl.zst to compress)')
+    parser.add_argument('--summary', help='Also write one row per article to this .csv or .parquet file')
+    parser.add_argument('--api-key', help='Anthropic API key')
+    parser.add_argument('--fetch-workers', type=int, default=8, help='Concurrent page fetches')
+    parser.add_argument('--analysis-workers', type=int, default=4, help='Articles analyzed concurrently')
+    parser.add_argument('--parse-workers', type=int, default=0,
+                        help='Processes for HTML parsing and scoring (0 parses in the fetch threads)')
+    parser.add_argument('--rpm', type=int, default=50, help='Max Anthropic requests per minute')
+    parser.add_argument('--tpm', type=int, help='Max Anthropic tokens per minute (input plus max output)')
+    parser.add_argument('--cache', help='SQLite file for caching LLM responses between runs')
+    parser.add_argument('--page-store', help='SQLite file for conditional (ETag/Last-Modified) fetching')
+    parser.add_argument('--combined', action='store_true', help='Send one combined prompt per article instead of four')
+    parser.add_argument('--message-batches', action='store_true',
+                        help='Submit prompts through the Message Batches API (slower, cheaper)')
+    parser.add_argument('--docs-per-batch', type=int, default=1000, help='Articles per message batch')
+    parser.add_argument('--metrics', action='store_true', help='Include a metrics block in every record')
+    parser.add_argument('--metrics-log', help='Append per-document metrics as JSON lines to this file')
+    parser.add_argument('--metrics-prom', help='Write aggregated metrics to this Prometheus text file')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only re-analyze the parts of changed articles that differ (requires --page-store)')
+    parser.add_argument('--prescreen', action='store_true',
+                        help='Run local scores and style rules only, no LLM calls (for high-volume screening)')
+    parser.add_argument('--chunk-tokens', type=int,
+                        help='Analyze long articles in full as parallel chunks of about this many tokens')
+    parser.add_argument('--dedupe', action='store_true',
+                        help='Strip boilerplate shared across pages and reuse analyses of near-duplicate articles')
+    parser.add_argument('--boilerplate-pages', type=int, default=3,
+                        help='Pages a paragraph or list item must appear on to count as boilerplate')
+    parser.add_argument('--duplicate-threshold', type=float, default=0.9,
+                        help='Estimated similarity (0-1) at which an article reuses an earlier analysis')
+    parser.add_argument('--no-resume', action='store_true', help='Overwrite the output instead of resuming it')
+    args = parser.parse_args()
+    api_key = args.api_key or os.getenv('ANTHROPIC_API_KEY')
+    if not api_key:
+        print("API key required.")
+        return 1
+    if args.incremental and not args.page_store:
+        print("--incremental requires --page-store.")
+        return 1
+    cache = LLMCache(args.cache) if args.cache else None
+    page_store = PageStore(args.page_store) if args.page_store else None
+    analyzer = DocumentationAnalyzer(api_key, concurrent=True, requests_per_minute=args.rpm,
+                                     tokens_per_minute=args.tpm, cache=cache,
+                                     page_store=page_store, pool_size=2 * args.fetch_workers, combined=args.combined,
+                                     metrics=args.metrics,
+                                     metrics_sink=sink_from_options(args.metrics_log, args.metrics_prom),
+                                     incremental=args.incremental, prescreen=args.prescreen,
+                                     chunk_tokens=args.chunk_tokens)
+    urls = load_urls(args.source, analyzer.session)
+    # Pre-screening makes no LLM calls, so there is nothing for deduplication to save.
+    dedupe = CorpusIndex(args.boilerplate_pages, args.duplicate_threshold) if args.dedupe and not args.prescreen else None
+    batch = BatchAnalyzer(analyzer, args.fetch_workers, args.analysis_workers, args.parse_workers, dedupe)
+    if args.message_batches and not args.prescreen:
+        stats = batch.run_message_batches(urls, args.output, MessageBatchBackend(analyzer),
+                                          args.docs_per_batch, resume=not args.no_resume,
+                                          summary_path=args.summary)
+    else:
+        stats = batch.run(urls, args.output, resume=not args.no_resume, summary_path=args.summary)
+    print(f"Analyzed {stats['analyzed']} ({stats['unchanged']} unchanged), failed {stats['failed']}, "
+          f"skipped {stats['skipped']} -> {args.output}")
+    if dedupe:
+        print(f"Deduplication: {stats['duplicates']} near-duplicates reused, {stats['boilerplate_blocks']} boilerplate "
+              f"blocks stripped, ~{stats['tokens_saved']} prompt tokens saved")
+    if cache:
+        print(f"LLM cache: {cache.hits} hits, {cache.misses} misses")
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark suite for the Documentation Analyzer Agent.
+Serves the checked-in corpus from a local HTTP stand-in, points the real
+Anthropic SDK at a fake messages endpoint (configurable latency and 429
+injection) and reports articles/sec, p50/p95 latency per article and peak
+RSS for the single-URL, batch and parse-only paths. Each path runs in its
+own process so peak RSS is measured per path.
+
+    python benchmarks/bench.py --latency 0.5 --rate-limit-every 25
+    python benchmarks/bench.py --json current.json --baseline baseline.json
+"""
+
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import CORPUS_DIR, HELP_CENTER, load_corpus
+from benchmarks.servers import corpus_server, fake_anthropic_server
+
+PATHS = ('single', 'batch', 'parse')
+
+def peak_rss_mb() -> float:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS.
+    return rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+
+def percentile(values: List[float], q: float) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method='inclusive')[q - 1]
+
+def summarize(path: str, latencies: List[float], elapsed: float, **extra) -> Dict[str, Any]:
+    return dict({
+        'path': path, 'articles': len(latencies), 'seconds': round(elapsed, 3),
+        'articles_per_sec': round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 1), 'p95_ms': round(percentile(latencies, 95) * 1000, 1),
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+    }, **extra)
+
+def _failures(record: Dict[str, Any]) -> int:
+    if 'error' in record:
+        return 1
+    return sum('error' in record.get(name, {}) for name in ('readability', 'structure', 'completeness', 'style_guidelines'))
+
+def make_analyzer(args, **kwargs):
+    from doc_analyzer import DocumentationAnalyzer
+    from rate_limiter import RateLimiter
+    return DocumentationAnalyzer('bench-key', concurrent=True,
+                                 rate_limiter=RateLimiter(args.rpm, backoff=0.05), **kwargs)
+
+def bench_parse(args, pages) -> Dict[str, Any]:
+    from parse_stage import parse_and_score
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for name, html in pages:
+            t = time.perf_counter()
+            parse_and_score(HELP_CENTER + name, html)
+            latencies.append(time.perf_counter() - t)
+    return summarize('parse', latencies, time.perf_counter() - start)
+
+def bench_llm_path(args, pages, path: str) -> Dict[str, Any]:
+    from batch_analyzer import BatchAnalyzer
+    with corpus_server(pages) as urls, \
+            fake_anthropic_server(args.latency, args.rate_limit_every, args.retry_after) as (base, stats):
+        os.environ['ANTHROPIC_BASE_URL'] = base
+        urls = urls * args.repeat
+        failures = 0
+        start = time.perf_counter()
+        if path == 'single':
+            analyzer = make_analyzer(args, chunk_tokens=args.chunk_tokens)
+            latencies = []
+            for url in urls:
+                t = time.perf_counter()
+                failures += _failures(analyzer.analyze_document(url))
+                latencies.append(time.perf_counter() - t)
+        else:
+            analyzer = make_analyzer(args, chunk_tokens=args.chunk_tokens, metrics=True,
+                                     pool_size=2 * args.fetch_workers)
+            records = []
+            with tempfile.TemporaryDirectory() as tmp:
+                BatchAnalyzer(analyzer, args.fetch_workers, args.analysis_workers, args.parse_workers).run(
+                    urls, os.path.join(tmp, 'results.jsonl'), resume=False, on_result=records.append)
+            # Per-article service time (fetch + analysis, excluding time spent queued).
+            latencies = [r.get('metrics', {}).get('stages', {}).get('total', 0.0) for r in records]
+            failures = sum(_failures(r) for r in records)
+        elapsed = time.perf_counter() - start
+        return summarize(path, latencies, elapsed, llm_requests=stats.requests,
+                         injected_429s=stats.rate_limited, failures=failures)
+
+def run_path(args, path: str) -> Dict[str, Any]:
+    pages = load_corpus(args.corpus)
+    if args.limit:
+        pages = pages[:args.limit]
+    return bench_parse(args, pages) if path == 'parse' else bench_llm_path(args, pages, path)
+
+def run_isolated(path: str) -> Dict[str, Any]:
+    argv = [a for a in sys.argv[1:]]
+    out = subprocess.run([sys.executable, os.path.abspath(__file__)] + argv + ['--path', path, '--child'],
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+def regressions(results: List[Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], tolerance: float) -> List[str]:
+    found = []
+    for result in results:
+        before = baseline.get(result['path'])
+        if not before:
+            continue
+        if result['articles_per_sec'] < before['articles_per_sec'] * (1 - tolerance):
+            found.append(f"{result['path']}: articles/sec {before['articles_per_sec']} -> {result['articles_per_sec']}")
+        for key in ('p95_ms', 'peak_rss_mb'):
+            if result[key] > before[key] * (1 + tolerance):
+                found.append(f"{result['path']}: {key} {before[key]} -> {result[key]}")
+    return found
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline benchmarks for the single-URL, batch and parse paths')
+    parser.add_argument('--path', choices=PATHS + ('all',), default='all')
+    parser.add_argument('--corpus', default=CORPUS_DIR, help='Directory of saved *.html pages')
+    parser.add_argument('--limit', type=int, default=0, help='Use only the first N pages')
+    parser.add_argument('--repeat', type=int, default=1, help='Pass over the corpus this many times')
+    parser.add_argument('--latency', type=float, default=0.2, help='Fake Anthropic response latency in seconds')
+    parser.add_argument('--rate-limit-every', type=int, default=0, help='Answer every Nth LLM request with a 429')
+    parser.add_argument('--retry-after', type=float, default=0.1, help='retry-after seconds sent with injected 429s')
+    parser.add_argument('--rpm', type=int, default=0, help='Client requests-per-minute limit (0 = unlimited)')
+    parser.add_argument('--chunk-tokens', type=int, help='Enable chunking of long articles')
+    parser.add_argument('--fetch-workers', type=int, default=8)
+    parser.add_argument('--analysis-workers', type=int, default=4)
+    parser.add_argument('--parse-workers', type=int, default=0)
+    parser.add_argument('--json', help='Write the results to this file')
+    parser.add_argument('--baseline', help='Earlier --json output; exit 1 if a path regressed')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed relative regression')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_path(args, args.path)))
+        return 0
+    paths = PATHS if args.path == 'all' else (args.path,)
+    results = [run_isolated(path) for path in paths]
+    print(f"{'path':>8} {'articles':>9} {'art/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'RSS MB':>8} {'429s':>6} {'fails':>6}")
+    for r in results:
+        print(f"{r['path']:>8} {r['articles']:>9} {r['articles_per_sec']:>9} {r['p50_ms']:>9} {r['p95_ms']:>9} "
+              f"{r['peak_rss_mb']:>8} {r.get('injected_429s', '-'):>6} {r.get('failures', '-'):>6}")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({r['path']: r for r in results}, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            found = regressions(results, json.load(f), args.tolerance)
+        for line in found:
+            print(f"REGRESSION {line}")
+        return 1 if found else 0
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
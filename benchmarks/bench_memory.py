@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Memory held per in-flight article: the extracted content kept as a plain
+dict (separate strings for full_text, paragraphs, list items and code) versus
+the compact document.Document, over the local corpus. Every page stays alive
+at once, as articles do between the fetch and analysis pools of a batch run.
+
+    python benchmarks/bench_memory.py --repeat 5
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+from typing import Any, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import CORPUS_DIR, HELP_CENTER, load_corpus
+from extractor import extract_content
+
+def measure(pages: List[Tuple[str, str]], as_dict: bool) -> Dict[str, Any]:
+    """Traced bytes per article while all pages are extracted and held (retained) and at the peak."""
+    gc.collect()
+    tracemalloc.start()
+    held = []
+    for name, html in pages:
+        content = extract_content(HELP_CENTER + name, html)
+        held.append(content.as_dict() if as_dict else content)
+        content = None
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'articles': len(held), 'retained_kb': round(retained / len(held) / 1024, 1),
+            'peak_kb': round(peak / len(held) / 1024, 1)}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--corpus', default=CORPUS_DIR, help='Directory of saved *.html pages')
+    parser.add_argument('--repeat', type=int, default=1, help='Hold this many copies of the corpus at once')
+    args = parser.parse_args()
+    pages = load_corpus(args.corpus) * args.repeat
+    rows = [('dict', measure(pages, True)), ('document', measure(pages, False))]
+    print(f"{len(pages)} articles in flight")
+    for name, row in rows:
+        print(f"{name:>10}: {row['retained_kb']:8.1f} KB retained/article  {row['peak_kb']:8.1f} KB peak/article")
+    print(f"{'saving':>10}: {1 - rows[1][1]['retained_kb'] / rows[0][1]['retained_kb']:8.1%} retained")
+
+if __name__ == "__main__":
+    main()
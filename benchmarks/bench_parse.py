@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Throughput of the parse and scoring stage: serial, a thread pool (bound by
+the GIL) and a process pool, over a local corpus of saved HTML pages.
+
+    python benchmarks/bench_parse.py --workers 8
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import CORPUS_DIR, HELP_CENTER, load_corpus
+from parse_stage import parse_and_score
+
+def _timed_map(pool, pages):
+    start = time.perf_counter()
+    if pool is None:
+        results = [parse_and_score(url, html) for url, html in pages]
+    else:
+        urls, htmls = zip(*pages)
+        results = list(pool.map(parse_and_score, urls, htmls, chunksize=max(1, len(pages) // 64)))
+    return time.perf_counter() - start, results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--corpus', default=CORPUS_DIR,
+                        help='Directory of saved *.html pages (synthetic pages are generated when empty)')
+    parser.add_argument('--size', type=int, default=200, help='Synthetic pages to generate for an empty corpus')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Threads/processes for the pooled runs')
+    args = parser.parse_args()
+    pages = [(HELP_CENTER + name, html) for name, html in load_corpus(args.corpus, args.size)]
+    print(f"{len(pages)} pages, {args.workers} workers, {os.cpu_count()} CPUs")
+
+    serial, expected = _timed_map(None, pages)
+    rows = [('serial', serial)]
+    with ThreadPoolExecutor(args.workers) as pool:
+        rows.append(('threads', _timed_map(pool, pages)[0]))
+    with ProcessPoolExecutor(args.workers) as pool:
+        pool.submit(int).result()  # exclude worker start-up from the timing
+        elapsed, results = _timed_map(pool, pages)
+        assert results == expected, "process pool output differs from serial parsing"
+        rows.append(('processes', elapsed))
+    for name, elapsed in rows:
+        print(f"{name:>10}: {elapsed:7.3f}s  {len(pages) / elapsed:8.1f} pages/s  x{serial / elapsed:.2f}")
+
+if __name__ == "__main__":
+    main()
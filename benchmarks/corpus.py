@@ -0,0 +1,74 @@
+"""
+Local corpus of saved help-center pages for benchmarks.
+benchmarks/corpus/ holds the checked-in pages; pages saved from the live
+help center can be added there as *.html files. Other directories that are
+empty are filled with deterministic synthetic articles built from the same
+help-center template (navigation, breadcrumbs, article body with headings,
+steps, tables and code, related articles, scripts), sized from short FAQs
+to long SDK guides.
+"""
+
+import glob
+import os
+import random
+from typing import List, Tuple
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpus')
+HELP_CENTER = 'https://help.moengage.com/hc/en-us/articles/'
+
+WORDS = ('campaign segment user push notification SDK integrate configure dashboard attribute event '
+         'analytics flow journey channel email message template audience delivery report data track '
+         'device install token the a to of and for with your you can this in on before after').split()
+
+def _sentence(rng: random.Random) -> str:
+    words = [rng.choice(WORDS) for _ in range(rng.randint(8, 28))]
+    return ' '.join(words).capitalize() + '.'
+
+def make_article(index: int, sections: int = 0) -> str:
+    rng = random.Random(index)
+    # Mostly short and medium articles with a tail of long integration guides.
+    sections = sections or rng.choice((2, 3, 4, 5, 6, 8, 10, 14, 20, 28))
+    title = _sentence(rng)[:-1]
+    body = [f'<p>{_sentence(rng)} {_sentence(rng)}</p>']
+    for s in range(sections):
+        body.append(f'<h2>Section {s + 1}: {rng.choice(WORDS).capitalize()} setup</h2>')
+        body += [f'<p>{" ".join(_sentence(rng) for _ in range(rng.randint(2, 6)))}</p>' for _ in range(rng.randint(1, 4))]
+        if s % 3 == 0:
+            body.append('<ol>' + ''.join(f'<li>{_sentence(rng)}</li>' for _ in range(rng.randint(3, 6))) + '</ol>')
+        if s % 4 == 1:
+            body.append(f'<h3>Example</h3><pre><code>MoEngage.initialize(this, "APP_{index}");\n'
+                        f'MoEngage.trackEvent("{rng.choice(WORDS)}");</code></pre>')
+        if s % 5 == 2:
+            rows = ''.join(f'<tr><td>{rng.choice(WORDS)}</td><td>{_sentence(rng)}</td></tr>' for _ in range(3))
+            body.append(f'<table><tr><th>Field</th><th>Description</th></tr>{rows}</table>')
+    nav = ''.join(f'<li><a href="/hc/en-us/categories/{i}">Category {i}</a></li>' for i in range(12))
+    related = ''.join(f'<li><a href="/hc/en-us/articles/{index + i}">Related article {index + i}</a></li>'
+                      for i in range(1, 8))
+    return (f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>{title} – MoEngage Help Center</title>'
+            f'<script>window.HelpCenter = {{"article": {index}}};</script><style>body {{ margin: 0 }}</style></head>'
+            f'<body><header><nav><ul>{nav}</ul></nav></header>'
+            f'<ol class="breadcrumbs"><li>Help Center</li><li>Developer Guide</li></ol>'
+            f'<article class="article"><h1 class="article-title">{title}</h1>'
+            f'<div class="article-body">{"".join(body)}</div></article>'
+            f'<aside><h3>Related articles</h3><ul>{related}</ul></aside>'
+            f'<footer>MoEngage Help Center</footer><script src="/assets/app.js"></script></body></html>')
+
+def write_corpus(directory: str, size: int) -> None:
+    os.makedirs(directory, exist_ok=True)
+    for i in range(size):
+        with open(os.path.join(directory, f'article-{i:04d}.html'), 'w', encoding='utf-8') as f:
+            f.write(make_article(i))
+
+def load_corpus(directory: str = CORPUS_DIR, size: int = 200) -> List[Tuple[str, str]]:
+    """Return (name, html) pairs from directory, generating size synthetic pages if it has none."""
+    if not glob.glob(os.path.join(directory, '*.html')):
+        write_corpus(directory, size)
+    pages = []
+    for path in sorted(glob.glob(os.path.join(directory, '*.html'))):
+        with open(path, encoding='utf-8') as f:
+            pages.append((os.path.basename(path)[:-5], f.read()))
+    return pages
+
+if __name__ == "__main__":
+    # Regenerates the checked-in corpus.
+    write_corpus(CORPUS_DIR, 40)
@@ -0,0 +1,144 @@
+"""
+Local stand-ins for the help center and the Anthropic API.
+CorpusServer serves saved article pages (with ETags, so conditional fetches
+answer 304). FakeAnthropicServer answers POST /v1/messages after a
+configurable latency, can inject 429s with a retry-after header and runs
+message batches under /v1/messages/batches, so the real SDK, retry
+scheduler and pipelines can be measured without a network.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Tuple
+
+ARTICLE_PATH = '/hc/en-us/articles/'
+REPLY = ("The article is clear overall but dense in places.\n"
+         "1. Consider adding a short summary before the first section.\n"
+         "2. Consider defining SDK and API on first use.\n"
+         "3. Add a screenshot for each configuration step.\n")
+
+class _QuietHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str, headers: Dict[str, str] = None) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+@contextmanager
+def _serve(handler) -> Iterator[str]:
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f'http://127.0.0.1:{server.server_address[1]}'
+    finally:
+        server.shutdown()
+        server.server_close()
+
+@contextmanager
+def corpus_server(pages: List[Tuple[str, str]]) -> Iterator[List[str]]:
+    """Serve (name, html) pages; yields their URLs in order."""
+    bodies = {name: html.encode('utf-8') for name, html in pages}
+    etags = {name: '"%s"' % hashlib.sha1(body).hexdigest()[:16] for name, body in bodies.items()}
+
+    class Handler(_QuietHandler):
+        def do_GET(self):
+            name = self.path[len(ARTICLE_PATH):] if self.path.startswith(ARTICLE_PATH) else None
+            if name not in bodies:
+                self._send(404, b'Not found', 'text/plain')
+            elif self.headers.get('If-None-Match') == etags[name]:
+                self.send_response(304)
+                self.send_header('ETag', etags[name])
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+            else:
+                self._send(200, bodies[name], 'text/html; charset=utf-8', {'ETag': etags[name]})
+
+    with _serve(Handler) as base:
+        yield [f'{base}{ARTICLE_PATH}{name}' for name, _ in pages]
+
+class FakeAnthropicStats:
+    def __init__(self):
+        self.requests = 0
+        self.rate_limited = 0
+        self._lock = threading.Lock()
+
+    def next_request(self) -> int:
+        with self._lock:
+            self.requests += 1
+            return self.requests
+
+def _message(n: int, model: str, prompt: str) -> Dict:
+    if 'Respond with only a JSON' in prompt:
+        section = {'assessment': REPLY.splitlines()[0], 'suggestions': REPLY.splitlines()[1:]}
+        text = json.dumps(dict.fromkeys(('readability', 'structure', 'completeness', 'style_guidelines'), section))
+    else:
+        text = REPLY
+    return {
+        'id': f'msg_{n}', 'type': 'message', 'role': 'assistant', 'model': model,
+        'content': [{'type': 'text', 'text': text}], 'stop_reason': 'end_turn', 'stop_sequence': None,
+        'usage': {'input_tokens': len(prompt) // 4, 'output_tokens': len(text) // 4},
+    }
+
+@contextmanager
+def fake_anthropic_server(latency: float = 0.0, rate_limit_every: int = 0,
+                          retry_after: float = 0.1) -> Iterator[Tuple[str, FakeAnthropicStats]]:
+    """Messages and message-batches endpoints; every rate_limit_every-th message is answered with a 429 (0 disables).
+
+    A batch reports in_progress on its first poll and ended afterwards.
+    """
+    stats = FakeAnthropicStats()
+    batches: Dict[str, Dict] = {}
+
+    class Handler(_QuietHandler):
+        def do_GET(self):
+            parts = self.path.split('?')[0].rstrip('/').split('/')
+            batch = batches.get(parts[4]) if len(parts) > 4 and parts[1:4] == ['v1', 'messages', 'batches'] else None
+            if batch is None:
+                self._send(404, b'{"type": "error", "error": {"type": "not_found_error", "message": "Not found"}}',
+                           'application/json')
+            elif parts[-1] == 'results':
+                lines = [json.dumps({'custom_id': r['custom_id'], 'result': {
+                    'type': 'succeeded', 'message': _message(stats.next_request(), r['params']['model'],
+                                                             r['params']['messages'][0]['content'])}})
+                         for r in batch['requests']]
+                self._send(200, ('\n'.join(lines) + '\n').encode(), 'application/x-jsonl')
+            else:
+                batch['polls'] += 1
+                status = 'ended' if batch['polls'] > 1 else 'in_progress'
+                self._send(200, json.dumps({'id': parts[4], 'type': 'message_batch',
+                                            'processing_status': status}).encode(), 'application/json')
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+            if self.path.startswith('/v1/messages/batches'):
+                batch_id = f'msgbatch_{len(batches)}'
+                batches[batch_id] = {'requests': body['requests'], 'polls': 0}
+                self._send(200, json.dumps({'id': batch_id, 'type': 'message_batch',
+                                            'processing_status': 'in_progress'}).encode(), 'application/json')
+                return
+            n = stats.next_request()
+            if rate_limit_every and n % rate_limit_every == 0:
+                stats.rate_limited += 1
+                error = {'type': 'error', 'error': {'type': 'rate_limit_error', 'message': 'Rate limited'}}
+                self._send(429, json.dumps(error).encode(), 'application/json', {'retry-after': str(retry_after)})
+                return
+            time.sleep(latency)
+            message = _message(n, body.get('model'), body['messages'][0]['content'])
+            self._send(200, json.dumps(message).encode(), 'application/json')
+
+    with _serve(Handler) as base:
+        yield base, stats
@@ -0,0 +1,105 @@
+"""
+Token-aware chunking for long articles.
+The full text is cut at the extracted headings, oversized sections are
+split at sentence boundaries, and neighbouring sections are packed into
+chunks that fit a token budget. Token counts are estimated locally, so
+sizing chunks costs no API calls. Helpers merge the per-chunk suggestions
+and report how much of the article the LLM actually saw.
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+PIECE_RE = re.compile(r"\w+|[^\w\s]")
+SENTENCE_END_RE = re.compile(r'(?<=[.!?])\s+')
+SPACE_RE = re.compile(r'\s+')
+NORMALIZE_RE = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s*|[^\w\s]")
+# Two suggestions sharing this fraction of their words are treated as the same advice.
+DUPLICATE_OVERLAP = 0.8
+
+def count_tokens(text: str) -> int:
+    """Rough Claude token count: about four characters per token, at least one per word or symbol."""
+    return max(len(text) // 4, len(PIECE_RE.findall(text)))
+
+def section_spans(content: Dict[str, Any]) -> List[Tuple[int, int, Optional[str]]]:
+    """(start, end, heading) spans of full_text, cut where each heading's text appears."""
+    text = content['full_text']
+    starts: List[Tuple[int, Optional[str]]] = [(0, None)]
+    cursor = 0
+    for heading in content['headings']:
+        pos = text.find(heading['text'], cursor) if heading['text'] else -1
+        if pos < 0:
+            continue
+        if pos == 0:
+            starts[0] = (0, heading['text'])
+        else:
+            starts.append((pos, heading['text']))
+        cursor = pos + len(heading['text'])
+    ends = [start for start, _ in starts[1:]] + [len(text)]
+    return [(start, end, heading) for (start, heading), end in zip(starts, ends) if text[start:end].strip()]
+
+def _split_span(text: str, start: int, end: int, max_tokens: int) -> List[Tuple[int, int]]:
+    spans = []
+    while count_tokens(text[start:end]) > max_tokens:
+        limit = min(end, start + max_tokens * 4)
+        while True:
+            window = text[start:limit]
+            cuts = [m.end() for m in SENTENCE_END_RE.finditer(window)] or [m.end() for m in SPACE_RE.finditer(window)]
+            cut = start + cuts[-1] if cuts and cuts[-1] < len(window) else limit
+            if count_tokens(text[start:cut]) <= max_tokens or limit - start <= 1:
+                break
+            limit = start + (limit - start) * 9 // 10
+        spans.append((start, cut))
+        start = cut
+    spans.append((start, end))
+    return spans
+
+def chunk_content(content: Dict[str, Any], max_tokens: int, max_chunks: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Pack heading sections into chunks of at most max_tokens (by count_tokens), in document order."""
+    text = content['full_text']
+    pieces = []
+    for start, end, heading in section_spans(content):
+        for i, (s, e) in enumerate(_split_span(text, start, end, max_tokens)):
+            pieces.append((s, e, heading if i == 0 else None))
+    chunks: List[Dict[str, Any]] = []
+    for start, end, heading in pieces:
+        last = chunks[-1] if chunks else None
+        if last and count_tokens(text[last['start']:end]) <= max_tokens:
+            last['end'] = end
+            if heading:
+                last['headings'].append(heading)
+        else:
+            chunks.append({'start': start, 'end': end, 'headings': [heading] if heading else []})
+    for chunk in chunks:
+        chunk['text'] = text[chunk['start']:chunk['end']].strip()
+        chunk['tokens'] = count_tokens(chunk['text'])
+    return chunks[:max_chunks] if max_chunks else chunks
+
+def _words(suggestion: str) -> set:
+    return set(NORMALIZE_RE.sub(' ', suggestion.lower()).split())
+
+def merge_suggestions(per_chunk: Sequence[List[str]], limit: int) -> List[str]:
+    """Interleave the chunks' suggestions (so every part is represented) and drop near-duplicates."""
+    merged, seen = [], []
+    for rank in range(max((len(s) for s in per_chunk), default=0)):
+        for suggestions in per_chunk:
+            if rank >= len(suggestions) or len(merged) >= limit:
+                continue
+            words = _words(suggestions[rank])
+            if any(len(words & other) >= DUPLICATE_OVERLAP * max(len(words), len(other), 1) for other in seen):
+                continue
+            seen.append(words)
+            merged.append(suggestions[rank])
+    return merged
+
+def coverage(content: Dict[str, Any], spans: Sequence[Tuple[int, int]],
+             results: Optional[Sequence[Union[str, Exception]]] = None) -> Dict[str, Any]:
+    """Share of full_text sent to the LLM; spans whose result is an exception do not count."""
+    total = len(content['full_text'])
+    results = results if results is not None else ['' for _ in spans]
+    analyzed = sum(end - start for (start, end), result in zip(spans, results) if not isinstance(result, Exception))
+    return {
+        'chunks': len(spans), 'analyzed_chunks': sum(not isinstance(r, Exception) for r in results),
+        'characters_analyzed': min(analyzed, total), 'characters_total': total,
+        'ratio': round(min(analyzed, total) / total, 3) if total else 1.0
+    }
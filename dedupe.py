@@ -0,0 +1,145 @@
+"""
+Cross-document boilerplate and near-duplicate detection for batch runs.
+Every paragraph and list item is hashed after normalization. A block seen
+on min_pages different pages is boilerplate (navigation text, legal
+footers, shared "Prerequisites" steps) and is stripped before prompting.
+Whole articles are MinHashed over word shingles and bucketed with LSH
+bands, so an article whose estimated Jaccard similarity to an article
+already analyzed reaches the threshold reuses that analysis.
+"""
+
+import hashlib
+import random
+import re
+import threading
+from collections import Counter, defaultdict
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from document import Document
+
+WORD_RE = re.compile(r'\w+')
+SPACE_RE = re.compile(r'\s+')
+# Shorter blocks ("Note", "Next steps") are too generic to call boilerplate.
+MIN_BLOCK_CHARS = 40
+SHINGLE_WORDS = 5
+NUM_PERM = 64
+# 16 bands of 4 rows: articles more than about 50% similar share a bucket and are compared.
+BANDS = 16
+MERSENNE = (1 << 61) - 1
+_rng = random.Random(20240601)
+PERMUTATIONS = [(_rng.randrange(1, MERSENNE), _rng.randrange(MERSENNE)) for _ in range(NUM_PERM)]
+
+def _hash(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'big')
+
+def block_key(text: str) -> Optional[int]:
+    normalized = ' '.join(WORD_RE.findall(text.lower()))
+    return _hash(normalized) if len(normalized) >= MIN_BLOCK_CHARS else None
+
+def shingles(text: str, size: int = SHINGLE_WORDS) -> Set[int]:
+    words = WORD_RE.findall(text.lower())
+    return {_hash(' '.join(words[i:i + size])) for i in range(max(1, len(words) - size + 1))}
+
+def minhash(hashes: Set[int]) -> Tuple[int, ...]:
+    if not hashes:
+        return (MERSENNE,) * NUM_PERM
+    return tuple(min((a * h + b) % MERSENNE for h in hashes) for a, b in PERMUTATIONS)
+
+def similarity(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures."""
+    return sum(x == y for x, y in zip(a, b)) / NUM_PERM
+
+def _blocks(content: Dict[str, Any]) -> List[Tuple[Optional[Tuple[int, int]], str]]:
+    if isinstance(content, Document):
+        return content.blocks()
+    return [(None, p) for p in content['paragraphs']] + \
+           [(None, item) for lst in content['lists'] for item in lst['items']]
+
+def _block_pattern(text: str) -> re.Pattern:
+    # A block's text joins its text nodes without separators (inline markup), while full_text joins them
+    # with spaces, so the block is found in full_text with optional whitespace between any two characters.
+    return re.compile(r'\s*'.join(re.escape(char) for char in ''.join(text.split())))
+
+def _strip_dict(content: Dict[str, Any], drop: Set[int]) -> Dict[str, Any]:
+    full_text = content['full_text']
+    for _, text in _blocks(content):
+        if block_key(text) in drop:
+            full_text = _block_pattern(text).sub(' ', full_text)
+    full_text = SPACE_RE.sub(' ', full_text).strip()
+    paragraphs = [p for p in content['paragraphs'] if block_key(p) not in drop]
+    lists = [{'type': lst['type'], 'items': [i for i in lst['items'] if block_key(i) not in drop]}
+             for lst in content['lists']]
+    stripped = {key: value for key, value in content.items() if key != 'readability_scores'}
+    return dict(stripped, full_text=full_text, paragraphs=paragraphs, lists=lists,
+                word_count=len(full_text.split()), paragraph_count=len(paragraphs))
+
+class Match:
+    """An earlier article this one nearly duplicates; result() waits until that article is analyzed."""
+
+    def __init__(self, url: str, score: float, future: Future):
+        self.url = url
+        self.similarity = round(score, 3)
+        self._future = future
+
+    def result(self) -> Optional[Dict[str, Any]]:
+        return self._future.result()
+
+class CorpusIndex:
+    """Shared across the workers of one batch run; all methods are thread-safe."""
+
+    def __init__(self, min_pages: int = 3, threshold: float = 0.9):
+        self.min_pages = min_pages
+        self.threshold = threshold
+        self._block_pages: Counter = Counter()
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], List[str]] = defaultdict(list)
+        self._signatures: Dict[str, Tuple[int, ...]] = {}
+        self._analyses: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.totals = {'duplicates': 0, 'boilerplate_blocks': 0, 'tokens_saved': 0}
+
+    def observe(self, content: Dict[str, Any]) -> None:
+        """Count the page's distinct blocks; call for every fetched page, ahead of analysis."""
+        keys = {block_key(text) for _, text in _blocks(content)} - {None}
+        with self._lock:
+            self._block_pages.update(keys)
+
+    def strip(self, content: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+        """content without its boilerplate blocks (as known so far), and how many blocks were removed."""
+        with self._lock:
+            found = [(span, key) for span, key in ((span, block_key(text)) for span, text in _blocks(content))
+                     if key is not None and self._block_pages[key] >= self.min_pages]
+        if not found:
+            return content, 0
+        if isinstance(content, Document):
+            return content.without(span for span, _ in found), len(found)
+        return _strip_dict(content, {key for _, key in found}), len(found)
+
+    def match(self, content: Dict[str, Any]) -> Optional[Match]:
+        """The earlier article content nearly duplicates, or None after registering content as a new original.
+
+        An original must be settled with resolve() once its analysis finishes (or fails).
+        """
+        signature = minhash(shingles(content['full_text']))
+        rows = NUM_PERM // BANDS
+        bands = [(band, signature[band * rows:(band + 1) * rows]) for band in range(BANDS)]
+        with self._lock:
+            candidates = {url for band in bands for url in self._buckets.get(band, ())}
+            scored = [(similarity(signature, self._signatures[url]), url) for url in candidates]
+            best = max(scored, default=None)
+            if best and best[0] >= self.threshold:
+                return Match(best[1], best[0], self._analyses[best[1]])
+            self._signatures[content['url']] = signature
+            self._analyses[content['url']] = Future()
+            for band in bands:
+                self._buckets[band].append(content['url'])
+        return None
+
+    def resolve(self, url: str, result: Optional[Dict[str, Any]]) -> None:
+        """Hand the original's result (None if it failed) to the duplicates waiting for it."""
+        self._analyses[url].set_result(result)
+
+    def count(self, **amounts: int) -> None:
+        with self._lock:
+            for key, amount in amounts.items():
+                self.totals[key] += amount
@@ -1,91 +1,434 @@
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
-import re
 from datetime import datetime
 import anthropic
-from textstat import flesch_kincaid_grade, gunning_fog
 import argparse
 import os
-from typing import Dict, List, Any
-import time
+import sys
+from typing import Callable, Dict, Iterator, List, Any, Optional, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
+import copy
+import queue
+import threading
+from llm_cache import LLMCache
+from page_store import PageStore
+from parse_stage import parse_and_time, readability_scores
+from incremental import Baseline, take_snapshot
+from metrics import Metrics, add_stages, count, recording, sink_from_options, timed
+from rate_limiter import RETRY_STATUSES, RateLimiter, estimate_tokens
+from style_rules import heading_issues, rule_suggestions, style_issues
+from chunking import chunk_content, coverage, merge_suggestions
+from output_sinks import is_jsonl, open_sinks
+import contextvars
+
+MODEL = "claude-3-sonnet-20240229"
+MAX_TOKENS = 1500
+
+ANALYZERS = ('readability', 'structure', 'completeness', 'style_guidelines')
+# Content key holding the article with its boilerplate removed (set by batch dedupe); prompts are built from it.
+PROMPT_CONTENT = 'prompt_content'
+# Characters of full_text each text-based prompt includes; longer articles are chunked when enabled.
+PROMPT_SLICES = {'readability': 2000, 'completeness': 2500, 'style_guidelines': 2500}
+PROMPTS = {
+    'readability': lambda content: f"Analyze readability:\n{prompt_text(content, 'readability')}",
+    'structure': lambda content: f"Structure analysis for:\n{content['title']}",
+    'completeness': lambda content: f"Evaluate completeness:\n{prompt_text(content, 'completeness')}",
+    'style_guidelines': lambda content: f"Style guide compliance:\n{prompt_text(content, 'style_guidelines')}",
+}
+CHUNK_PROMPTS = {
+    'readability': "Analyze readability (part {part} of {parts} of \"{title}\"):\n{text}",
+    'completeness': "Evaluate completeness (part {part} of {parts} of \"{title}\"):\n{text}",
+    'style_guidelines': "Style guide compliance (part {part} of {parts} of \"{title}\"):\n{text}",
+}
+COMBINED_MAX_TOKENS = 4000
+COMBINED_PROMPT = (
+    "Review this documentation article for a non-technical marketer audience. Respond with only a JSON "
+    "object with the keys \"readability\", \"structure\", \"completeness\" and \"style_guidelines\". "
+    "Each value must be an object with an \"assessment\" string and a \"suggestions\" array of specific, "
+    "actionable improvements (at most 10).\n\nTitle: {title}\n\nArticle:\n{text}"
+)
+FAILURE_LABELS = {
+    'readability': 'LLM', 'structure': 'Structure analysis',
+    'completeness': 'Completeness analysis', 'style_guidelines': 'Style analysis',
+}
+
+SUGGESTION_KEYWORDS = ['suggest', 'recommend', 'consider', 'improve', 'add', 'remove', 'change']
+MAX_SUGGESTIONS = 10
+
+def is_suggestion(line: str) -> bool:
+    return any(k in line.lower() for k in SUGGESTION_KEYWORDS) and len(line.strip()) > 20
+
+def prompt_view(content: Dict[str, Any]) -> Dict[str, Any]:
+    """The content prompts are built from; metrics and metadata always use content itself."""
+    return content.get(PROMPT_CONTENT, content)
+
+def prompt_text(content: Dict[str, Any], name: str) -> str:
+    return prompt_view(content)['full_text'][:PROMPT_SLICES[name]]
+
+def combined_prompt(content: Dict[str, Any]) -> str:
+    return COMBINED_PROMPT.format(title=content['title'], text=prompt_view(content)['full_text'][:2500])
+
+def has_errors(result: Dict[str, Any]) -> bool:
+    """Whether the result, or any of its sections, records a failure (and must be analyzed again)."""
+    return 'error' in result or any('error' in result.get(name, {}) for name in ANALYZERS)
+
+def conditional_headers(stored: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    """If-None-Match / If-Modified-Since headers for a page kept in the page store."""
+    headers = {}
+    if stored and stored['etag']:
+        headers['If-None-Match'] = stored['etag']
+    if stored and stored['last_modified']:
+        headers['If-Modified-Since'] = stored['last_modified']
+    return headers
+
+def replayable(stored: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """The stored result of an unchanged (304) page, unless it is missing or has failed sections."""
+    result = stored['result']
+    return result if result is not None and not has_errors(result) else None
+
+def parse_combined_response(text: str) -> Dict[str, Dict[str, Any]]:
+    """Pull the per-analyzer sections out of a combined-prompt reply; missing or malformed sections are dropped."""
+    start, end = text.find('{'), text.rfind('}')
+    try:
+        data = json.loads(text[start:end + 1]) if start != -1 else {}
+    except ValueError:
+        return {}
+    sections = {}
+    for name in ANALYZERS:
+        part = data.get(name) if isinstance(data, dict) else None
+        if isinstance(part, dict) and isinstance(part.get('assessment'), str):
+            suggestions = part.get('suggestions') if isinstance(part.get('suggestions'), list) else []
+            sections[name] = {
+                'assessment': part['assessment'],
+                'suggestions': [s.strip() for s in suggestions if isinstance(s, str) and s.strip()][:MAX_SUGGESTIONS]
+            }
+    return sections
+
+class SuggestionParser:
+    """Extracts suggestion lines from streamed text as soon as each line is complete."""
+
+    def __init__(self):
+        self._buffer = ''
+        self.suggestions: List[str] = []
+
+    @property
+    def done(self) -> bool:
+        return len(self.suggestions) >= MAX_SUGGESTIONS
+
+    def feed(self, text: str) -> List[str]:
+        *lines, self._buffer = (self._buffer + text).split('\n')
+        return self._take(lines)
+
+    def close(self) -> List[str]:
+        lines, self._buffer = [self._buffer], ''
+        return self._take(lines)
+
+    def _take(self, lines: List[str]) -> List[str]:
+        new = []
+        for line in lines:
+            if self.done:
+                break
+            if is_suggestion(line):
+                new.append(line.strip())
+                self.suggestions.append(line.strip())
+        return new
+
+def build_session(pool_size: int = 32, retries: int = 3, backoff: float = 0.5) -> requests.Session:
+    session = requests.Session()
+    session.headers.update({'User-Agent': 'Mozilla/5.0', 'Accept-Encoding': 'gzip, deflate'})
+    retry = Retry(total=retries, backoff_factor=backoff, status_forcelist=sorted(RETRY_STATUSES),
+                  allowed_methods=['GET', 'HEAD'], respect_retry_after_header=True)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
 
 class DocumentationAnalyzer:
-    def __init__(self, anthropic_api_key: str):
-        self.client = anthropic.Anthropic(api_key=anthropic_api_key)
-        self.session = requests.Session()
-        self.session.headers.update({'User-Agent': 'Mozilla/5.0'})
+    # Defaults for subclasses that replace __init__ (e.g. to supply content and analyses without an API client).
+    page_store: Optional[PageStore] = None
+    cache: Optional[LLMCache] = None
+    partial_parse = combined = concurrent = incremental = prescreen = metrics = False
+    on_suggestion: Optional[Callable[[str, str], None]] = None
+    metrics_sink = None
+    chunk_tokens: Optional[int] = None
+
+    def __init__(self, anthropic_api_key: str, concurrent: bool = False, max_workers: int = 4,
+                 requests_per_minute: int = 50, cache: Optional[LLMCache] = None,
+                 page_store: Optional[PageStore] = None, pool_size: int = 32, partial_parse: bool = False,
+                 on_suggestion: Optional[Callable[[str, str], None]] = None, combined: bool = False,
+                 metrics: bool = False, metrics_sink=None, incremental: bool = False,
+                 tokens_per_minute: Optional[int] = None, rate_limiter: Optional[RateLimiter] = None,
+                 prescreen: bool = False, chunk_tokens: Optional[int] = None, max_chunks: int = 8):
+        self.api_key = anthropic_api_key
+        self.pool_size = pool_size
+        # Built on first use, so AsyncDocumentationAnalyzer (which only borrows the builders) never creates them.
+        self._client = None
+        self._session = None
+        self._clients_lock = threading.Lock()
+        self.page_store = page_store
+        self.partial_parse = partial_parse
+        # When set, responses are streamed and on_suggestion(analyzer, suggestion) fires per suggestion line.
+        self.on_suggestion = on_suggestion
+        # One structured prompt for all four analyzers instead of four calls.
+        self.combined = combined
+        self.concurrent = concurrent
+        self.max_workers = max_workers
+        self.rate_limiter = rate_limiter or RateLimiter(requests_per_minute, tokens_per_minute)
+        self.cache = cache
+        # metrics adds a 'metrics' block to every result; metrics_sink.emit(url, metrics) receives them too.
+        self.metrics = metrics
+        self.metrics_sink = metrics_sink
+        # Reuse the unchanged parts of the previous analysis kept in page_store (see incremental.py).
+        self.incremental = incremental
+        # Report local scores and rule findings only, without any LLM call.
+        self.prescreen = prescreen
+        # Long articles are split into chunks of about chunk_tokens and analyzed in parallel (None truncates).
+        self.chunk_tokens = chunk_tokens
+        self.max_chunks = max_chunks
+
+    @property
+    def client(self) -> anthropic.Anthropic:
+        with self._clients_lock:
+            if self._client is None:
+                # Retries are scheduled by the shared rate limiter, not per call inside the SDK.
+                self._client = anthropic.Anthropic(api_key=self.api_key, max_retries=0)
+            return self._client
+
+    @client.setter
+    def client(self, client) -> None:
+        self._client = client
+
+    @property
+    def session(self) -> requests.Session:
+        with self._clients_lock:
+            if self._session is None:
+                self._session = build_session(self.pool_size)
+            return self._session
+
+    @session.setter
+    def session(self, session) -> None:
+        self._session = session
+
+    @property
+    def collects_metrics(self) -> bool:
+        return bool(self.metrics or self.metrics_sink)
+
+    def finish_metrics(self, result: Dict[str, Any], metrics: Optional[Metrics]) -> Dict[str, Any]:
+        if metrics is None:
+            return result
+        recorded = metrics.as_dict()
+        if self.metrics_sink:
+            self.metrics_sink.emit(result['url'], recorded)
+        return dict(result, metrics=recorded) if self.metrics else result
 
     def fetch_content(self, url: str) -> Dict[str, Any]:
-        response = self.session.get(url, timeout=30)
+        """The extracted article as a plain dict; the pipeline itself passes the compact Document along.
+
+        Override it to supply content some other way; fetch_page then uses it for every article.
+        """
+        content = dict(self._fetch_page(url)[0])
+        # Scores precomputed by parse_and_score are an internal shortcut, not part of the extracted article.
+        content.pop('readability_scores', None)
+        return content
+
+    def fetch_page(self, url: str, parser: Optional[Callable[[str, str], Dict[str, Any]]] = None
+                   ) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+        """Fetch and parse url; the second item is the stored result when the page is unchanged (304).
+
+        parser(url, html) replaces parse_html, e.g. to hand the work to a process pool.
+        An overridden fetch_content (on a subclass or the instance) is called instead,
+        without conditional fetching.
+        """
+        if getattr(self.fetch_content, '__func__', None) is not DocumentationAnalyzer.fetch_content:
+            return self.fetch_content(url), None
+        return self._fetch_page(url, parser)
+
+    def _fetch_page(self, url: str, parser: Optional[Callable[[str, str], Dict[str, Any]]] = None
+                    ) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+        stored = self.page_store.get(url) if self.page_store else None
+        with timed('fetch'):
+            response = self.session.get(url, timeout=30, headers=conditional_headers(stored))
+        retries = getattr(getattr(response, 'raw', None), 'retries', None)
+        count('retries', len(retries.history) if retries else 0)
+        if response.status_code == 304 and stored:
+            # Without a replayable result the stored content is analyzed again.
+            return stored['content'], replayable(stored)
         response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
-        article_content = soup.find('article') or soup.find('div', class_='article-body') or soup.find('main')
-        if not article_content:
-            article_content = soup.find('div', {'class': re.compile(r'content|article|body')})
-        if not article_content:
-            raise ValueError("Could not locate main article content")
-        title = (soup.find('h1') or soup.find('title')).get_text(strip=True) if soup.find('h1') or soup.find('title') else "No title"
-        headings = [{'level': int(h.name[1]), 'text': h.get_text(strip=True)} for h in article_content.find_all(['h1','h2','h3','h4','h5','h6'])]
-        paragraphs = [p.get_text(strip=True) for p in article_content.find_all('p') if p.get_text(strip=True)]
-        lists = [{'type': ul.name, 'items': [li.get_text(strip=True) for li in ul.find_all('li')]} for ul in article_content.find_all(['ul','ol'])]
-        code_blocks = [c.get_text(strip=True) for c in article_content.find_all(['code','pre'])]
-        full_text = article_content.get_text(separator=' ', strip=True)
-        return {
-            'url': url, 'title': title, 'full_text': full_text, 'headings': headings,
-            'paragraphs': paragraphs, 'lists': lists, 'code_blocks': code_blocks,
-            'word_count': len(full_text.split()), 'paragraph_count': len(paragraphs)
-        }
+        # The parser records the parse and readability_scores stages itself.
+        content = (parser or self.parse_html)(url, response.text)
+        if self.page_store:
+            self.page_store.save_page(url, response.text, response.headers.get('ETag'),
+                                      response.headers.get('Last-Modified'), content)
+        return content, None
+
+    def parse_html(self, url: str, html: str) -> Dict[str, Any]:
+        content, stages = parse_and_time(url, html, self.partial_parse, not self.incremental)
+        add_stages(stages)
+        return content
 
     def _extract_feedback_suggestions(self, assessment: str) -> List[str]:
         lines = assessment.split('\n')
-        return [line.strip() for line in lines if any(k in line.lower() for k in ['suggest','recommend','consider','improve','add','remove','change']) and len(line.strip()) > 20][:10]
+        return [line.strip() for line in lines if is_suggestion(line)][:MAX_SUGGESTIONS]
 
-    def analyze_readability(self, content: Dict[str, Any]) -> Dict[str, Any]:
-        text = content['full_text']
-        fk = flesch_kincaid_grade(text)
-        fog = gunning_fog(text)
+    def _cached(self, prompt: str, max_tokens: int) -> Optional[str]:
+        if not self.cache:
+            return None
+        cached = self.cache.get(MODEL, prompt, max_tokens)
+        count('cache_misses' if cached is None else 'cache_hits')
+        return cached
+
+    def _record_usage(self, message: Any) -> None:
+        usage = getattr(message, 'usage', None)
+        count('llm_calls')
+        if usage is not None:
+            count('input_tokens', getattr(usage, 'input_tokens', 0) or 0)
+            count('output_tokens', getattr(usage, 'output_tokens', 0) or 0)
+
+    def _complete(self, prompt: str, max_tokens: int = MAX_TOKENS) -> str:
+        cached = self._cached(prompt, max_tokens)
+        if cached is not None:
+            return cached
+        message = self.rate_limiter.call(lambda: self.client.messages.create(
+            model=MODEL,
+            max_tokens=max_tokens,
+            messages=[{"role": "user", "content": prompt}]
+        ), estimate_tokens(prompt, max_tokens))
+        self._record_usage(message)
+        text = message.content[0].text
+        if self.cache:
+            self.cache.put(MODEL, prompt, max_tokens, text)
+        return text
+
+    def _complete_streaming(self, prompt: str, on_suggestion: Callable[[str], None],
+                            max_tokens: int = MAX_TOKENS) -> str:
+        cached = self._cached(prompt, max_tokens)
+        if cached is not None:
+            for suggestion in self._extract_feedback_suggestions(cached):
+                on_suggestion(suggestion)
+            return cached
+        emitted = set()
+
+        def emit(suggestions: List[str]) -> None:
+            # A retried stream repeats the suggestions it already delivered; pass each one on once.
+            for suggestion in suggestions:
+                if suggestion not in emitted:
+                    emitted.add(suggestion)
+                    on_suggestion(suggestion)
+
+        def attempt() -> Tuple[str, SuggestionParser, Any]:
+            parser = SuggestionParser()
+            chunks = []
+            with self.client.messages.stream(
+                model=MODEL,
+                max_tokens=max_tokens,
+                messages=[{"role": "user", "content": prompt}]
+            ) as stream:
+                for text in stream.text_stream:
+                    chunks.append(text)
+                    emit(parser.feed(text))
+                    # Leaving the stream early closes the connection and stops generation.
+                    if parser.done:
+                        break
+                message = getattr(stream, 'current_message_snapshot', None)
+            emit(parser.close())
+            return ''.join(chunks), parser, message
+
+        text, parser, message = self.rate_limiter.call(attempt, estimate_tokens(prompt, max_tokens))
+        self._record_usage(message)
+        if self.cache and not parser.done:
+            self.cache.put(MODEL, prompt, max_tokens, text)
+        return text
+
+    def _assess(self, name: str, content: Dict[str, Any], prompt: Optional[str] = None) -> Union[str, Exception]:
+        """The LLM assessment, or the exception left after the rate limiter gave up retrying."""
+        prompt = prompt or PROMPTS[name](content)
         try:
-            message = self.client.messages.create(
-                model="claude-3-sonnet-20240229",
-                max_tokens=1500,
-                messages=[{"role": "user", "content": f"Analyze readability:\n{text[:2000]}"}]
-            )
-            llm = message.content[0].text
+            with timed(f'llm_{name}'):
+                if self.on_suggestion:
+                    return self._complete_streaming(prompt, lambda s: self.on_suggestion(name, s))
+                return self._complete(prompt)
         except Exception as e:
-            llm = f"LLM failed: {str(e)}"
-        return {'flesch_kincaid_grade': fk, 'gunning_fog_score': fog, 'assessment': llm, 'suggestions': self._extract_feedback_suggestions(llm)}
+            return e
 
-    def analyze_structure(self, content: Dict[str, Any]) -> Dict[str, Any]:
+    def section(self, name: str, content: Dict[str, Any], assessment: Union[str, Exception]) -> Dict[str, Any]:
+        """Report section for an analyzer; a failed LLM call yields an 'error' field and no assessment."""
+        builder = getattr(self, f'{name}_section')
+        if isinstance(assessment, Exception):
+            section = dict(builder(content, ''), assessment=None, error=f"{FAILURE_LABELS[name]} failed: {assessment}")
+        else:
+            section = builder(content, assessment)
+        if self.chunk_tokens and name in PROMPT_SLICES:
+            section['coverage'] = coverage(prompt_view(content), [(0, PROMPT_SLICES[name])], [assessment])
+        return section
+
+    def chunks_for(self, name: str, content: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Chunks for an analyzer whose input would otherwise be truncated; empty when one prompt suffices.
+
+        An article longer than the prompt slice that fits in a single chunk is still
+        sent as that one chunk, so it is analyzed in full rather than truncated.
+        """
+        view = prompt_view(content)
+        if not self.chunk_tokens or len(view['full_text']) <= PROMPT_SLICES.get(name, float('inf')):
+            return []
+        return chunk_content(view, self.chunk_tokens, self.max_chunks)
+
+    def chunk_prompts(self, name: str, content: Dict[str, Any], chunks: List[Dict[str, Any]]) -> List[str]:
+        return [CHUNK_PROMPTS[name].format(part=i, parts=len(chunks), title=content['title'], text=chunk['text'])
+                for i, chunk in enumerate(chunks, 1)]
+
+    def merge_chunks(self, name: str, content: Dict[str, Any], chunks: List[Dict[str, Any]],
+                     results: List[Union[str, Exception]]) -> Dict[str, Any]:
+        """One section from per-chunk assessments: parts labelled by heading, suggestions interleaved and deduplicated."""
+        answered = [(chunk, result) for chunk, result in zip(chunks, results) if isinstance(result, str)]
+        if not answered:
+            section = self.section(name, content, results[0])
+        elif len(chunks) == 1:
+            section = self.section(name, content, answered[0][1])
+        else:
+            parts = [f"[Part {chunks.index(chunk) + 1}/{len(chunks)}: {', '.join(chunk['headings']) or content['title']}]\n"
+                     f"{result}" for chunk, result in answered]
+            section = self.section(name, content, '\n\n'.join(parts))
+            section['suggestions'] = merge_suggestions(
+                [self._extract_feedback_suggestions(result) for _, result in answered], MAX_SUGGESTIONS)
+            failed = [result for result in results if isinstance(result, Exception)]
+            if failed:
+                # The partial assessment is kept, but the error keeps the section from being stored or snapshotted.
+                section['error'] = f"{FAILURE_LABELS[name]} failed for {len(failed)} of {len(chunks)} chunks: {failed[0]}"
+        section['coverage'] = coverage(prompt_view(content), [(chunk['start'], chunk['end']) for chunk in chunks], results)
+        return section
+
+    def _analyze(self, name: str, content: Dict[str, Any]) -> Dict[str, Any]:
+        chunks = self.chunks_for(name, content)
+        if not chunks:
+            return self.section(name, content, self._assess(name, content))
+        # Chunks always run in parallel so a long article costs about one round-trip.
+        with ThreadPoolExecutor(max_workers=len(chunks)) as pool:
+            futures = [pool.submit(contextvars.copy_context().run, self._assess, name, content, prompt)
+                       for prompt in self.chunk_prompts(name, content, chunks)]
+            results = [f.result() for f in futures]
+        return self.merge_chunks(name, content, chunks, results)
+
+    def readability_section(self, content: Dict[str, Any], llm: str) -> Dict[str, Any]:
+        scores = content.get('readability_scores')
+        if scores is None:
+            with timed('readability_scores'):
+                scores = readability_scores(content)
+        return dict(scores, assessment=llm, suggestions=self._extract_feedback_suggestions(llm))
+
+    def structure_section(self, content: Dict[str, Any], assessment: str) -> Dict[str, Any]:
         headings = content['headings']
         paragraphs = content['paragraphs']
         lists = content['lists']
         avg_par_len = sum(len(p.split()) for p in paragraphs) / len(paragraphs) if paragraphs else 0
-        try:
-            message = self.client.messages.create(
-                model="claude-3-sonnet-20240229",
-                max_tokens=1500,
-                messages=[{"role": "user", "content": f"Structure analysis for:\n{content['title']}"}]
-            )
-            assessment = message.content[0].text
-        except Exception as e:
-            assessment = f"Structure analysis failed: {str(e)}"
         return {
             'heading_count': len(headings), 'paragraph_count': len(paragraphs), 'list_count': len(lists),
-            'avg_paragraph_length': avg_par_len, 'hierarchy_issues': [],
+            'avg_paragraph_length': avg_par_len, 'hierarchy_issues': heading_issues(headings),
             'assessment': assessment, 'suggestions': self._extract_feedback_suggestions(assessment)
         }
 
-    def analyze_completeness(self, content: Dict[str, Any]) -> Dict[str, Any]:
-        try:
-            message = self.client.messages.create(
-                model="claude-3-sonnet-20240229",
-                max_tokens=1500,
-                messages=[{"role": "user", "content": f"Evaluate completeness:\n{content['full_text'][:2500]}"}]
-            )
-            assessment = message.content[0].text
-        except Exception as e:
-            assessment = f"Completeness analysis failed: {str(e)}"
+    def completeness_section(self, content: Dict[str, Any], assessment: str) -> Dict[str, Any]:
         return {
             'word_count': content['word_count'],
             'code_examples_count': len(content['code_blocks']),
@@ -94,39 +437,170 @@ class DocumentationAnalyzer:
             'suggestions': self._extract_feedback_suggestions(assessment)
         }
 
-    def analyze_style_guidelines(self, content: Dict[str, Any]) -> Dict[str, Any]:
-        try:
-            message = self.client.messages.create(
-                model="claude-3-sonnet-20240229",
-                max_tokens=1500,
-                messages=[{"role": "user", "content": f"Style guide compliance:\n{content['full_text'][:2500]}"}]
-            )
-            assessment = message.content[0].text
-        except Exception as e:
-            assessment = f"Style analysis failed: {str(e)}"
+    def style_guidelines_section(self, content: Dict[str, Any], assessment: str) -> Dict[str, Any]:
         return {
+            'rule_issues': style_issues(content),
             'assessment': assessment,
             'suggestions': self._extract_feedback_suggestions(assessment)
         }
 
+    def analyze_readability(self, content: Dict[str, Any]) -> Dict[str, Any]:
+        return self._analyze('readability', content)
+
+    def analyze_structure(self, content: Dict[str, Any]) -> Dict[str, Any]:
+        return self._analyze('structure', content)
+
+    def analyze_completeness(self, content: Dict[str, Any]) -> Dict[str, Any]:
+        return self._analyze('completeness', content)
+
+    def analyze_style_guidelines(self, content: Dict[str, Any]) -> Dict[str, Any]:
+        return self._analyze('style_guidelines', content)
+
     def analyze_document(self, url: str) -> Dict[str, Any]:
-        content = self.fetch_content(url)
-        time.sleep(1)
-        readability = self.analyze_readability(content)
-        time.sleep(1)
-        structure = self.analyze_structure(content)
-        time.sleep(1)
-        completeness = self.analyze_completeness(content)
-        time.sleep(1)
-        style = self.analyze_style_guidelines(content)
-        return {
-            'url': url,
+        metrics = Metrics() if self.collects_metrics else None
+        with recording(metrics), timed('total'):
+            content, previous = self.fetch_page(url)
+            result = previous if previous is not None else self.analyze_content(content)
+        return self.finish_metrics(result, metrics)
+
+    def _combined_sections(self, content: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        prompt = combined_prompt(content)
+        try:
+            with timed('llm_combined'):
+                parsed = parse_combined_response(self._complete(prompt, max_tokens=COMBINED_MAX_TOKENS))
+        except Exception:
+            parsed = {}
+        return self.combined_sections(content, parsed,
+                                      self._run_analyzers(content, [name for name in ANALYZERS if name not in parsed]))
+
+    def combined_sections(self, content: Dict[str, Any], parsed: Dict[str, Dict[str, Any]],
+                          fallback: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Sections from a parsed combined reply; fallback has the sections analyzed through their own
+        (chunk-aware) prompts for anything the reply did not cover."""
+        sections = {}
+        for name in ANALYZERS:
+            if name in parsed:
+                sections[name] = getattr(self, f'{name}_section')(content, parsed[name]['assessment'])
+                sections[name]['suggestions'] = parsed[name]['suggestions']
+            else:
+                sections[name] = fallback[name]
+        return sections
+
+    def _run_analyzers(self, content: Dict[str, Any], names=ANALYZERS) -> Dict[str, Dict[str, Any]]:
+        analyzers = [getattr(self, f'analyze_{name}') for name in names]
+        if self.concurrent and len(analyzers) > 1:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                # Each task gets its own copy of the context so metrics land on this document.
+                futures = [pool.submit(contextvars.copy_context().run, analyzer, content) for analyzer in analyzers]
+                sections = [f.result() for f in futures]
+        else:
+            sections = [analyzer(content) for analyzer in analyzers]
+        return dict(zip(names, sections))
+
+    def prescreen_sections(self, content: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Sections built from local scores and style rules alone; rule findings stand in for suggestions."""
+        sections = {name: dict(getattr(self, f'{name}_section')(content, ''), assessment=None) for name in ANALYZERS}
+        sections['structure']['suggestions'] = sections['structure']['hierarchy_issues'][:MAX_SUGGESTIONS]
+        sections['style_guidelines']['suggestions'] = \
+            rule_suggestions(sections['style_guidelines']['rule_issues'])[:MAX_SUGGESTIONS]
+        return sections
+
+    def analyze_content(self, content: Dict[str, Any]) -> Dict[str, Any]:
+        if self.prescreen:
+            return self.build_result(content, self.prescreen_sections(content))
+        if self.incremental:
+            return self._analyze_incremental(content)
+        if self.combined:
+            return self.build_result(content, self._combined_sections(content))
+        return self.build_result(content, self._run_analyzers(content))
+
+    def prompt_inputs(self, content: Dict[str, Any]) -> Dict[str, str]:
+        """The prompt each analyzer's assessment depends on."""
+        if self.combined:
+            return dict.fromkeys(ANALYZERS, combined_prompt(content))
+        prompts = {}
+        for name in ANALYZERS:
+            chunks = self.chunks_for(name, content)
+            prompts[name] = '\n'.join(self.chunk_prompts(name, content, chunks)) if chunks else PROMPTS[name](content)
+        return prompts
+
+    def baseline(self, content: Dict[str, Any]) -> Baseline:
+        snapshot = self.page_store.get_snapshot(content['url']) if self.page_store else None
+        with timed('readability_scores'):
+            return Baseline(snapshot, content, self.prompt_inputs(content))
+
+    def _analyze_incremental(self, content: Dict[str, Any]) -> Dict[str, Any]:
+        baseline = self.baseline(content)
+        stale = baseline.stale()
+        if self.combined and stale:
+            fresh = self._combined_sections(baseline.content)
+        else:
+            fresh = self._run_analyzers(baseline.content, stale)
+        return self.incremental_result(baseline, fresh)
+
+    def incremental_result(self, baseline: Baseline, fresh: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Combine freshly analyzed sections with the reusable ones from the baseline."""
+        sections = {}
+        for name in ANALYZERS:
+            if name in fresh:
+                sections[name] = fresh[name]
+            else:
+                sections[name] = baseline.reuse(name, getattr(self, f'{name}_section'))
+                if self.on_suggestion:
+                    for suggestion in sections[name]['suggestions']:
+                        self.on_suggestion(name, suggestion)
+        return self.build_result(baseline.content, sections, incremental=baseline.report(fresh))
+
+    def stream_analysis(self, content: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Yield {'analyzer', 'suggestion'} events as the four concurrent streams produce them,
+        then a final {'result': ...} (or {'error': ...}) event."""
+        events = queue.Queue()
+        finished = object()
+        worker = copy.copy(self)
+        worker.concurrent = True
+        worker.on_suggestion = lambda name, suggestion: events.put({'analyzer': name, 'suggestion': suggestion})
+
+        def run():
+            try:
+                events.put({'result': worker.analyze_content(content)})
+            except Exception as e:
+                events.put({'error': str(e)})
+            finally:
+                events.put(finished)
+
+        threading.Thread(target=contextvars.copy_context().run, args=(run,), daemon=True).start()
+        while True:
+            event = events.get()
+            if event is finished:
+                return
+            yield event
+
+    def reuse_result(self, content: Dict[str, Any], source: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Result for content built from another article's LLM output ({name: {'assessment', 'suggestions'}}).
+
+        Local metrics are computed for content itself; only the assessments and suggestions are carried over.
+        """
+        sections = {}
+        for name in ANALYZERS:
+            sections[name] = getattr(self, f'{name}_section')(content, source[name]['assessment'])
+            sections[name]['suggestions'] = list(source[name]['suggestions'])
+        return self.build_result(content, sections)
+
+    def assemble_result(self, content: Dict[str, Any], assessments: Dict[str, Union[str, Exception]]) -> Dict[str, Any]:
+        """Build the analyze_document output from raw LLM assessments obtained elsewhere (e.g. a batch)."""
+        sections = {name: self.section(name, content, assessments[name]) for name in ANALYZERS}
+        return self.build_result(content, sections)
+
+    def build_result(self, content: Dict[str, Any], sections: Dict[str, Dict[str, Any]],
+                     incremental: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        result = {
+            'url': content['url'],
             'title': content['title'],
             'analysis_timestamp': datetime.now().isoformat(),
-            'readability': readability,
-            'structure': structure,
-            'completeness': completeness,
-            'style_guidelines': style,
+            'readability': sections['readability'],
+            'structure': sections['structure'],
+            'completeness': sections['completeness'],
+            'style_guidelines': sections['style_guidelines'],
             'metadata': {
                 'word_count': content['word_count'],
                 'paragraph_count': content['paragraph_count'],
@@ -134,25 +608,72 @@ class DocumentationAnalyzer:
                 'code_blocks_count': len(content['code_blocks'])
             }
         }
+        if incremental is not None:
+            result['incremental'] = incremental
+        if self.prescreen:
+            # Not stored: a later full run must not reuse an LLM-free result for an unchanged page.
+            result['prescreen'] = True
+        elif self.page_store:
+            if not has_errors(result):
+                # A result with failed sections is not kept, so an unchanged page (304) is analyzed again.
+                self.page_store.save_result(content['url'], result)
+            if self.incremental:
+                # Failed assessments are left out of the snapshot so they are retried next time.
+                prompts = {name: prompt for name, prompt in self.prompt_inputs(content).items()
+                           if 'error' not in sections[name]}
+                self.page_store.save_snapshot(content['url'], take_snapshot(content, prompts, result))
+        return result
+
+def print_suggestion(analyzer: str, suggestion: str) -> None:
+    print(f"[{analyzer}] {suggestion}", file=sys.stderr, flush=True)
 
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument('url', help='URL to analyze')
     parser.add_argument('--api-key', help='Anthropic API key')
-    parser.add_argument('--output', '-o', help='Output file path')
+    parser.add_argument('--output', '-o', help='Output file path (.jsonl, .jsonl.gz or .jsonl.zst for one compact line)')
+    parser.add_argument('--summary', help='Also write a one-row summary to this .csv or .parquet file')
+    parser.add_argument('--concurrent', action='store_true', help='Run the four analyzers in parallel')
+    parser.add_argument('--rpm', type=int, default=50, help='Max Anthropic requests per minute')
+    parser.add_argument('--tpm', type=int, help='Max Anthropic tokens per minute (input plus max output)')
+    parser.add_argument('--cache', help='SQLite file for caching LLM responses between runs')
+    parser.add_argument('--page-store', help='SQLite file for conditional (ETag/Last-Modified) fetching')
+    parser.add_argument('--combined', action='store_true', help='Send one combined prompt instead of four')
+    parser.add_argument('--metrics', action='store_true', help='Include a metrics block in the output')
+    parser.add_argument('--metrics-log', help='Append per-document metrics as JSON lines to this file')
+    parser.add_argument('--metrics-prom', help='Write aggregated metrics to this Prometheus text file')
+    parser.add_argument('--stream', action='store_true', help='Stream responses and print suggestions as they arrive')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only re-analyze the parts of a changed article that differ (requires --page-store)')
+    parser.add_argument('--prescreen', action='store_true', help='Run local scores and style rules only, no LLM calls')
+    parser.add_argument('--chunk-tokens', type=int,
+                        help='Analyze long articles in full as parallel chunks of about this many tokens')
     args = parser.parse_args()
     api_key = args.api_key or os.getenv('ANTHROPIC_API_KEY')
     if not api_key:
         print("API key required.")
         return 1
-    analyzer = DocumentationAnalyzer(api_key)
+    if args.incremental and not args.page_store:
+        print("--incremental requires --page-store.")
+        return 1
+    cache = LLMCache(args.cache) if args.cache else None
+    page_store = PageStore(args.page_store) if args.page_store else None
+    analyzer = DocumentationAnalyzer(api_key, concurrent=args.concurrent, requests_per_minute=args.rpm,
+                                     tokens_per_minute=args.tpm, cache=cache, page_store=page_store,
+                                     on_suggestion=print_suggestion if args.stream else None,
+                                     combined=args.combined, metrics=args.metrics,
+                                     metrics_sink=sink_from_options(args.metrics_log, args.metrics_prom),
+                                     incremental=args.incremental, prescreen=args.prescreen,
+                                     chunk_tokens=args.chunk_tokens)
     result = analyzer.analyze_document(args.url)
-    output_json = json.dumps(result, indent=2)
-    if args.output:
+    jsonl = args.output if args.output and is_jsonl(args.output) else None
+    with open_sinks(jsonl, args.summary) as sink:
+        sink.write(result)
+    if not args.output:
+        print(json.dumps(result, indent=2))
+    elif not jsonl:
         with open(args.output, 'w') as f:
-            f.write(output_json)
-    else:
-        print(output_json)
+            json.dump(result, f, indent=2)
     return 0
 
 if __name__ == "__main__":
@@ -0,0 +1,139 @@
+"""
+Compact in-memory representation of an extracted article.
+The article text is stored once, as full_text; headings, paragraphs, list
+items and code blocks are ranges of its text parts (the stripped text nodes
+that full_text joins with single spaces), kept in flat integer arrays. The
+content-dict keys are rebuilt on access, so a Document can be used anywhere
+the dict returned by the original extraction was.
+"""
+
+from array import array
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+FIELDS = ('url', 'title', 'full_text', 'headings', 'paragraphs', 'lists', 'code_blocks',
+          'word_count', 'paragraph_count')
+
+Span = Tuple[int, int]
+
+def _pairs(spans: Sequence[Span]) -> array:
+    return array('I', [i for span in spans for i in span])
+
+class Document(Mapping):
+    """Read-only mapping over the extracted article; only extra keys (e.g. readability_scores) can be set."""
+
+    __slots__ = ('url', 'title', 'full_text', 'word_count', '_starts', '_headings', '_paragraphs',
+                 '_lists', '_code_blocks', '_extra')
+
+    def __init__(self, url: str, title: str, parts: Sequence[str], headings: Sequence[Tuple[int, int, int]],
+                 paragraphs: Sequence[Span], lists: Sequence[Tuple[str, Sequence[Span]]], code_blocks: Sequence[Span]):
+        """parts are the article's text parts; every other span is a (first, end) range of part indexes."""
+        self.url = url
+        self.title = title
+        self.full_text = ' '.join(parts)
+        self.word_count = len(self.full_text.split())
+        # Offset of each part in full_text, plus one past the end so part k ends at _starts[k + 1] - 1.
+        starts, offset = array('I'), 0
+        for part in parts:
+            starts.append(offset)
+            offset += len(part) + 1
+        starts.append(offset)
+        self._starts = starts
+        self._headings = array('I', [i for heading in headings for i in heading])
+        self._paragraphs = _pairs([span for span in paragraphs if span[1] > span[0]])
+        self._lists = tuple((kind, _pairs(items)) for kind, items in lists)
+        self._code_blocks = _pairs(code_blocks)
+        self._extra: Optional[Dict[str, Any]] = None
+
+    def text_of(self, first: int, end: int) -> str:
+        """Text of parts first..end-1 concatenated without separators (BeautifulSoup's get_text(strip=True))."""
+        text, starts = self.full_text, self._starts
+        return ''.join(text[starts[k]:starts[k + 1] - 1] for k in range(first, end))
+
+    def _texts(self, pairs: array) -> List[str]:
+        return [self.text_of(pairs[i], pairs[i + 1]) for i in range(0, len(pairs), 2)]
+
+    @property
+    def headings(self) -> List[Dict[str, Any]]:
+        h = self._headings
+        return [{'level': h[i], 'text': self.text_of(h[i + 1], h[i + 2])} for i in range(0, len(h), 3)]
+
+    @property
+    def paragraphs(self) -> List[str]:
+        return self._texts(self._paragraphs)
+
+    @property
+    def lists(self) -> List[Dict[str, Any]]:
+        return [{'type': kind, 'items': self._texts(items)} for kind, items in self._lists]
+
+    @property
+    def code_blocks(self) -> List[str]:
+        return self._texts(self._code_blocks)
+
+    @property
+    def paragraph_count(self) -> int:
+        return len(self._paragraphs) // 2
+
+    def __getitem__(self, key: str) -> Any:
+        if key in FIELDS:
+            return getattr(self, key)
+        if self._extra and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in FIELDS:
+            raise KeyError(f"{key} is derived from the article text and cannot be replaced")
+        if self._extra is None:
+            self._extra = {}
+        self._extra[key] = value
+
+    def __iter__(self) -> Iterator[str]:
+        yield from FIELDS
+        yield from self._extra or ()
+
+    def __len__(self) -> int:
+        return len(FIELDS) + len(self._extra or ())
+
+    def __copy__(self) -> 'Document':
+        # Shares the (immutable) text and arrays; extra keys set on the copy stay on the copy.
+        copy = object.__new__(Document)
+        for slot in self.__slots__:
+            setattr(copy, slot, getattr(self, slot))
+        copy._extra = dict(self._extra) if self._extra else None
+        return copy
+
+    def blocks(self) -> List[Tuple[Span, str]]:
+        """(span, text) of every paragraph and list item, in that order."""
+        pairs = [self._paragraphs] + [items for _, items in self._lists]
+        return [((p[i], p[i + 1]), self.text_of(p[i], p[i + 1])) for p in pairs for i in range(0, len(p), 2)]
+
+    def without(self, spans: Iterable[Span]) -> 'Document':
+        """A new Document with the parts in spans removed; extra keys (computed from this text) are not carried over."""
+        count = len(self._starts) - 1
+        dropped = bytearray(count)
+        for first, end in spans:
+            dropped[first:end] = b'\x01' * (end - first)
+        if not any(dropped):
+            return self
+        # Old part index -> new part index (parts before it that survive), one past the end included.
+        index, kept = array('I'), 0
+        for k in range(count + 1):
+            index.append(kept)
+            kept += k < count and not dropped[k]
+
+        def remap(p: array) -> List[Span]:
+            # Items emptied by the removal go; items that were already empty stay.
+            return [(index[p[i]], index[p[i + 1]]) for i in range(0, len(p), 2)
+                    if index[p[i + 1]] > index[p[i]] or p[i + 1] == p[i]]
+        h = self._headings
+        return Document(self.url, self.title, [self.text_of(k, k + 1) for k in range(count) if not dropped[k]],
+                        [(h[i], index[h[i + 1]], index[h[i + 2]]) for i in range(0, len(h), 3)],
+                        remap(self._paragraphs), [(kind, remap(items)) for kind, items in self._lists],
+                        remap(self._code_blocks))
+
+    def as_dict(self) -> Dict[str, Any]:
+        return dict(self)
+
+    def __repr__(self) -> str:
+        return f"Document({self.url!r}, {self.word_count} words)"
@@ -7,36 +7,14 @@ This script demonstrates how to use the analyzer programmatically.
 import json
 import os
 from doc_analyzer import DocumentationAnalyzer
+from batch_analyzer import BatchAnalyzer
 
 def run_example_analysis():
     """Run example analysis on sample MoEngage documentation URLs."""
     
     # Get API key from environment
     api_key = os.getenv('ANTHROPIC_API_KEY')
-    if __name__ == "__main__":
-    print("Documentation Analyzer - Example Usage")
-    print("=" * 40)
-    
-    choice = input("\nChoose an option:\n1. Run example analysis on multiple URLs\n2. Demonstrate single detailed analysis\n3. Custom URL analysis\n\nEnter choice (1-3): ")
-    
-    if choice == '1':
-        run_example_analysis()
-    elif choice == '2':
-        demonstrate_single_analysis()
-    elif choice == '3':
-        custom_url = input("Enter MoEngage documentation URL: ")
-        api_key = os.getenv('ANTHROPIC_API_KEY')
-        if not api_key:
-            print("Error: Please set ANTHROPIC_API_KEY environment variable")
-        else:
-            try:
-                analyzer = DocumentationAnalyzer(api_key)
-                result = analyzer.analyze_document(custom_url)
-                print(json.dumps(result, indent=2, ensure_ascii=False))
-            except Exception as e:
-                print(f"Error: {str(e)}")
-    else:
-        print("Invalid choice. Please run again and select 1, 2, or 3.") not api_key:
+    if not api_key:
         print("Error: Please set ANTHROPIC_API_KEY environment variable")
         return
     
@@ -49,38 +27,29 @@ def run_example_analysis():
         "https://help.moengage.com/hc/en-us/articles/229399928-Email-Campaigns"
     ]
     
-    results = []
-    
-    for url in example_urls:
-        try:
-            print(f"\nAnalyzing: {url}")
-            print("-" * 50)
-            
-            # Perform analysis
-            result = analyzer.analyze_document(url)
-            results.append(result)
-            
-            # Print summary
-            print(f"Title: {result['title']}")
-            print(f"Word count: {result['metadata']['word_count']}")
-            print(f"Readability grade: {result['readability']['flesch_kincaid_grade']:.1f}")
-            print(f"Total suggestions: {len(result['readability']['suggestions']) + len(result['structure']['suggestions']) + len(result['completeness']['suggestions']) + len(result['style_guidelines']['suggestions'])}")
-            
-            # Print top suggestions from each category
-            print("\nTop Suggestions:")
-            for category in ['readability', 'structure', 'completeness', 'style_guidelines']:
-                if result[category]['suggestions']:
-                    print(f"  {category.title()}: {result[category]['suggestions'][0]}")
-            
-        except Exception as e:
-            print(f"Error analyzing {url}: {str(e)}")
+    def print_summary(result):
+        print(f"\nAnalyzed: {result['url']}")
+        print("-" * 50)
+        if 'error' in result:
+            print(f"Error: {result['error']}")
+            return
+        print(f"Title: {result['title']}")
+        print(f"Word count: {result['metadata']['word_count']}")
+        print(f"Readability grade: {result['readability']['flesch_kincaid_grade']:.1f}")
+        print(f"Total suggestions: {len(result['readability']['suggestions']) + len(result['structure']['suggestions']) + len(result['completeness']['suggestions']) + len(result['style_guidelines']['suggestions'])}")
+        
+        # Print top suggestions from each category
+        print("\nTop Suggestions:")
+        for category in ['readability', 'structure', 'completeness', 'style_guidelines']:
+            if result[category]['suggestions']:
+                print(f"  {category.title()}: {result[category]['suggestions'][0]}")
     
-    # Save all results
-    output_file = "example_analysis_results.json"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(results, f, indent=2, ensure_ascii=False)
+    # Results are streamed to gzipped JSONL as each article finishes; rerunning resumes
+    output_file = "example_analysis_results.jsonl.gz"
+    summary_file = "example_analysis_summary.csv"
+    BatchAnalyzer(analyzer).run(example_urls, output_file, on_result=print_summary, summary_path=summary_file)
     
-    print(f"\nComplete results saved to: {output_file}")
+    print(f"\nComplete results saved to: {output_file} (summary: {summary_file})")
 
 def demonstrate_single_analysis():
     """Demonstrate detailed analysis of a single document."""
@@ -148,4 +117,27 @@ def demonstrate_single_analysis():
     except Exception as e:
         print(f"Error: {str(e)}")
 
-if
\ No newline at end of file
+if __name__ == "__main__":
+    print("Documentation Analyzer - Example Usage")
+    print("=" * 40)
+    
+    choice = input("\nChoose an option:\n1. Run example analysis on multiple URLs\n2. Demonstrate single detailed analysis\n3. Custom URL analysis\n\nEnter choice (1-3): ")
+    
+    if choice == '1':
+        run_example_analysis()
+    elif choice == '2':
+        demonstrate_single_analysis()
+    elif choice == '3':
+        custom_url = input("Enter MoEngage documentation URL: ")
+        api_key = os.getenv('ANTHROPIC_API_KEY')
+        if not api_key:
+            print("Error: Please set ANTHROPIC_API_KEY environment variable")
+        else:
+            try:
+                analyzer = DocumentationAnalyzer(api_key)
+                result = analyzer.analyze_document(custom_url)
+                print(json.dumps(result, indent=2, ensure_ascii=False))
+            except Exception as e:
+                print(f"Error: {str(e)}")
+    else:
+        print("Invalid choice. Please run again and select 1, 2, or 3.")
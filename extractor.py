@@ -0,0 +1,159 @@
+"""
+Single-pass article extractor built on lxml.
+Produces the same content as the original BeautifulSoup extraction (title,
+headings, paragraphs, lists, code blocks, full text) while walking the
+article tree only once, packed into a compact document.Document.
+"""
+
+import re
+from io import BytesIO
+from typing import List, Optional, Tuple
+
+from lxml import etree
+
+from document import Document
+
+HEADINGS = {'h1', 'h2', 'h3', 'h4', 'h5', 'h6'}
+LIST_TAGS = {'ul', 'ol'}
+CODE_TAGS = {'code', 'pre'}
+# Strings inside these tags are not part of the readable text (matches BeautifulSoup's get_text).
+SILENT_TAGS = {'script', 'style', 'template'}
+CONTAINER_CLASS_RE = re.compile(r'content|article|body')
+
+def _parse(html: str) -> Optional[etree._Element]:
+    return etree.fromstring(html.encode('utf-8'), etree.HTMLParser(encoding='utf-8'))
+
+def _classes(el: etree._Element) -> List[str]:
+    return (el.get('class') or '').split()
+
+def _text(el: etree._Element) -> str:
+    # get_text(strip=True): every string stripped and concatenated.
+    parts = []
+    def visit(node, silent):
+        silent = silent or node.tag in SILENT_TAGS
+        if node.text and not silent:
+            parts.append(node.text.strip())
+        for child in node:
+            if isinstance(child.tag, str):
+                visit(child, silent)
+            if child.tail and not silent:
+                parts.append(child.tail.strip())
+    visit(el, False)
+    return ''.join(parts)
+
+def find_container(root: etree._Element) -> Optional[etree._Element]:
+    for el in root.iter('article'):
+        return el
+    for el in root.iter('div'):
+        if 'article-body' in _classes(el):
+            return el
+    for el in root.iter('main'):
+        return el
+    for el in root.iter('div'):
+        if any(CONTAINER_CLASS_RE.search(c) for c in _classes(el)):
+            return el
+    return None
+
+def find_title(root: etree._Element) -> str:
+    for tag in ('h1', 'title'):
+        for el in root.iter(tag):
+            return _text(el)
+    return "No title"
+
+def walk_container(container: etree._Element) -> Tuple[List[str], List[List[int]], List[List[int]],
+                                                    List[Tuple[str, List[List[int]]]], List[List[int]]]:
+    """Collect text parts plus heading, paragraph, list item and code spans in one traversal.
+
+    Each span is a range of indexes into the returned parts, started when its
+    element opens (so spans stay in document order) and closed when it closes.
+    Headings are [level, first, end].
+    """
+    parts: List[str] = []
+    headings: List[List[int]] = []
+    paragraphs: List[List[int]] = []
+    lists: List[Tuple[str, List[List[int]]]] = []
+    code_blocks: List[List[int]] = []
+    open_lists: List[List[List[int]]] = []
+
+    def feed(text: Optional[str]) -> None:
+        if text:
+            text = text.strip()
+            if text:
+                parts.append(text)
+
+    def visit(el: etree._Element, silent: bool) -> None:
+        tag = el.tag
+        silent = silent or tag in SILENT_TAGS
+        first = len(parts)
+        spans = []
+        if tag in HEADINGS:
+            headings.append([int(tag[1]), first, first])
+            spans.append(headings[-1])
+        elif tag == 'p':
+            paragraphs.append([first, first])
+            spans.append(paragraphs[-1])
+        elif tag == 'li':
+            for items in open_lists:
+                items.append([first, first])
+                spans.append(items[-1])
+        if tag in CODE_TAGS:
+            code_blocks.append([first, first])
+            spans.append(code_blocks[-1])
+        if tag in LIST_TAGS:
+            lists.append((tag, []))
+            open_lists.append(lists[-1][1])
+        if not silent:
+            feed(el.text)
+        for child in el:
+            if isinstance(child.tag, str):
+                visit(child, silent)
+            if not silent:
+                feed(child.tail)
+        if tag in LIST_TAGS:
+            open_lists.pop()
+        for span in spans:
+            span[-1] = len(parts)
+
+    visit(container, False)
+    return parts, headings, paragraphs, lists, code_blocks
+
+def _partial_parse(html: str):
+    """SoupStrainer-style parse: stop reading the page once the first <article> closes.
+
+    Returns (article, title) or None when the page has no <article>. Only
+    headings seen up to the end of the article are considered for the title.
+    An <article> nested inside it does not end the parse.
+    """
+    title_h1 = title_tag = None
+    depth = 0
+    events = etree.iterparse(BytesIO(html.encode('utf-8')), events=('start', 'end'), html=True,
+                             encoding='utf-8', tag=('article', 'h1', 'title'))
+    try:
+        for event, el in events:
+            if el.tag == 'article':
+                depth += 1 if event == 'start' else -1
+                if depth == 0:
+                    title_el = title_h1 if title_h1 is not None else title_tag
+                    return el, _text(title_el) if title_el is not None else "No title"
+            elif event == 'end' and el.tag == 'h1' and title_h1 is None:
+                title_h1 = el
+            elif event == 'end' and el.tag == 'title' and title_tag is None:
+                title_tag = el
+    except etree.XMLSyntaxError:
+        pass
+    return None
+
+def extract_content(url: str, html: str, partial: bool = False) -> Document:
+    found = _partial_parse(html) if partial else None
+    if found:
+        container, title = found
+    else:
+        root = _parse(html)
+        container = find_container(root) if root is not None else None
+        if container is None:
+            raise ValueError("Could not locate main article content")
+        title = find_title(root)
+    extracted = walk_container(container)
+    # Only the collected strings are needed from here on; let the parse tree go before packing them.
+    container = found = root = None
+    return Document(url, title, *extracted)
@@ -0,0 +1,111 @@
+"""
+Section-level snapshots for incremental re-analysis.
+After an article is analyzed, its headings, paragraphs and lists are
+hashed item by item, together with each analyzer's prompt (its input slice)
+and the inputs of its deterministic metrics. When the article changes, a
+Baseline built from that snapshot tells the analyzer which LLM assessments
+and metrics can be carried over and which must be recomputed.
+"""
+
+import copy
+import hashlib
+import json
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional
+
+from readability_scores import score_paragraphs, score_text
+
+SNAPSHOT_ITEMS = ('headings', 'paragraphs', 'lists')
+# Content keys each section's deterministic metrics are derived from (keys also fix the analyzer order).
+METRIC_INPUTS = {
+    'readability': ('full_text', 'paragraphs'),
+    'structure': ('headings', 'paragraphs', 'lists'),
+    'completeness': ('word_count', 'code_blocks', 'headings'),
+    'style_guidelines': ('headings', 'paragraphs', 'lists'),
+}
+
+def digest(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()[:16]
+
+def _metric_hashes(content: Dict[str, Any]) -> Dict[str, str]:
+    return {name: digest([content[key] for key in keys]) for name, keys in METRIC_INPUTS.items()}
+
+def take_snapshot(content: Dict[str, Any], prompts: Dict[str, str], result: Dict[str, Any]) -> Dict[str, Any]:
+    """Snapshot of an analyzed article; only analyzers present in prompts can be reused later."""
+    paragraphs = [digest(p) for p in content['paragraphs']]
+    return {
+        'analysis_timestamp': result['analysis_timestamp'],
+        'title': digest(content['title']),
+        'items': {key: [digest(item) for item in content[key]] for key in SNAPSHOT_ITEMS},
+        'metrics': _metric_hashes(content),
+        'prompts': {name: digest(prompt) for name, prompt in prompts.items()},
+        'paragraph_grades': dict(zip(paragraphs, result['readability']['paragraph_grades'])),
+        'sections': {name: result[name] for name in METRIC_INPUTS},
+    }
+
+class Baseline:
+    """Compares freshly parsed content with the snapshot of the previous analysis (None on the first run)."""
+
+    def __init__(self, snapshot: Optional[Dict[str, Any]], content: Dict[str, Any], prompts: Dict[str, str]):
+        self.snapshot = snapshot or {'prompts': {}, 'metrics': {}, 'paragraph_grades': {}, 'sections': {}}
+        self.first_run = snapshot is None
+        self.prompts = {name: digest(prompt) for name, prompt in prompts.items()}
+        self.metrics = _metric_hashes(content)
+        self.paragraph_grades_reused = 0
+        self.content = copy.copy(content)
+        self.content['readability_scores'] = self._readability_scores(content)
+
+    def assessment_reusable(self, name: str) -> bool:
+        return self.snapshot['prompts'].get(name) == self.prompts[name]
+
+    def metrics_reusable(self, name: str) -> bool:
+        return self.snapshot['metrics'].get(name) == self.metrics[name]
+
+    def stale(self) -> List[str]:
+        """Analyzers whose prompt changed since the snapshot and must be sent to the LLM again."""
+        return [name for name in METRIC_INPUTS if not self.assessment_reusable(name)]
+
+    def _readability_scores(self, content: Dict[str, Any]) -> Dict[str, Any]:
+        if 'readability_scores' in content:
+            return content['readability_scores']
+        previous = self.snapshot['sections'].get('readability')
+        if previous and self.metrics_reusable('readability'):
+            self.paragraph_grades_reused = len(previous['paragraph_grades'])
+            return {key: value for key, value in previous.items() if key not in ('assessment', 'suggestions')}
+        # Only paragraphs that were edited or added are scored again.
+        known = self.snapshot['paragraph_grades']
+        hashes = [digest(p) for p in content['paragraphs']]
+        missing = [(h, p) for h, p in zip(hashes, content['paragraphs']) if h not in known]
+        fresh = dict(zip([h for h, _ in missing], score_paragraphs([p for _, p in missing])))
+        self.paragraph_grades_reused = len(hashes) - len(missing)
+        grades = [known[h] if h in known else fresh[h] for h in hashes]
+        return dict(score_text(content['full_text']), paragraph_grades=grades)
+
+    def reuse(self, name: str, builder: Callable[[Dict[str, Any], str], Dict[str, Any]]) -> Dict[str, Any]:
+        """Previous section for an analyzer whose prompt is unchanged, with its metrics rebuilt if needed."""
+        previous = self.snapshot['sections'][name]
+        if self.metrics_reusable(name):
+            return dict(previous)
+        section = builder(self.content, previous['assessment'])
+        section['suggestions'] = previous['suggestions']
+        return section
+
+    def changes(self, content: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if self.first_run:
+            return None
+        changed = {'title': digest(content['title']) != self.snapshot['title']}
+        for key in SNAPSHOT_ITEMS:
+            old = Counter(self.snapshot['items'][key])
+            new = Counter(digest(item) for item in content[key])
+            changed[key] = {'added': sum((new - old).values()), 'removed': sum((old - new).values())}
+        return changed
+
+    def report(self, recomputed_assessments) -> Dict[str, Any]:
+        reused, recomputed = [], []
+        for name in METRIC_INPUTS:
+            (recomputed if name in recomputed_assessments else reused).append(f'{name}.assessment')
+            (reused if self.metrics_reusable(name) else recomputed).append(f'{name}.metrics')
+        return {
+            'baseline': self.snapshot.get('analysis_timestamp'), 'changed': self.changes(self.content),
+            'reused': reused, 'recomputed': recomputed, 'paragraph_grades_reused': self.paragraph_grades_reused
+        }
@@ -0,0 +1,118 @@
+"""
+Message Batches backend for offline audits.
+Collects the four analyzer prompts of many documents, submits them as one
+Anthropic message batch, polls until it ends and reassembles the answers
+into the regular analyze_document output.
+"""
+
+import json
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+import httpx
+
+from doc_analyzer import ANALYZERS, MAX_TOKENS, MODEL, PROMPTS, DocumentationAnalyzer
+
+BATCHES_PATH = '/v1/messages/batches'
+
+def _namespace(value: Any) -> Any:
+    if isinstance(value, dict):
+        return SimpleNamespace(**{key: _namespace(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return [_namespace(item) for item in value]
+    return value
+
+def _error_text(result: Any) -> str:
+    error = getattr(result, 'error', None)
+    # API entries nest the message as {'type': 'error', 'error': {'type': ..., 'message': ...}}.
+    detail = getattr(error, 'error', error)
+    return getattr(detail, 'message', None) or (error if isinstance(error, str) else None) or result.type
+
+class HTTPBatches:
+    """The Message Batches endpoints called through the client's own HTTP layer.
+
+    Used when the installed SDK predates client.messages.batches; auth,
+    base URL and status errors are handled by the client as for any call.
+    """
+
+    def __init__(self, client):
+        self.client = client
+
+    def create(self, requests: List[Dict[str, Any]]) -> SimpleNamespace:
+        return _namespace(self.client.post(BATCHES_PATH, body={'requests': requests}, cast_to=httpx.Response).json())
+
+    def retrieve(self, batch_id: str) -> SimpleNamespace:
+        return _namespace(self.client.get(f'{BATCHES_PATH}/{batch_id}', cast_to=httpx.Response).json())
+
+    def results(self, batch_id: str) -> Iterator[SimpleNamespace]:
+        # Results are JSON Lines, one entry per request.
+        response = self.client.get(f'{BATCHES_PATH}/{batch_id}/results', cast_to=httpx.Response)
+        for line in response.text.splitlines():
+            if line.strip():
+                yield _namespace(json.loads(line))
+
+class MessageBatchBackend:
+    """Runs analyses through the Message Batches API instead of messages.create."""
+
+    def __init__(self, analyzer: DocumentationAnalyzer, poll_interval: float = 30.0,
+                 max_requests: int = 10000, timeout: Optional[float] = 24 * 3600):
+        self.analyzer = analyzer
+        self.poll_interval = poll_interval
+        self.max_requests = max_requests
+        self.timeout = timeout
+
+    @property
+    def batches(self):
+        client = self.analyzer.client
+        if hasattr(client.messages, 'batches'):
+            return client.messages.batches
+        beta = getattr(getattr(client, 'beta', None), 'messages', None)
+        return beta.batches if hasattr(beta, 'batches') else HTTPBatches(client)
+
+    def analyze_contents(self, contents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Analyze parsed documents; results are returned in the same order as contents."""
+        cache = self.analyzer.cache
+        assessments: List[Dict[str, Union[str, Exception]]] = [{} for _ in contents]
+        pending: Dict[str, tuple] = {}
+        for i, content in enumerate(contents):
+            for name in ANALYZERS:
+                prompt = PROMPTS[name](content)
+                cached = cache.get(MODEL, prompt, MAX_TOKENS) if cache else None
+                if cached is not None:
+                    assessments[i][name] = cached
+                else:
+                    pending[f'doc{i}-{name}'] = (i, name, prompt)
+        ids = list(pending)
+        for start in range(0, len(ids), self.max_requests):
+            chunk = ids[start:start + self.max_requests]
+            for custom_id, text in self._run_batch({cid: pending[cid][2] for cid in chunk}).items():
+                i, name, prompt = pending[custom_id]
+                assessments[i][name] = text
+                if cache and isinstance(text, str):
+                    cache.put(MODEL, prompt, MAX_TOKENS, text)
+        return [self.analyzer.assemble_result(content, assessments[i]) for i, content in enumerate(contents)]
+
+    def _run_batch(self, prompts: Dict[str, str]) -> Dict[str, Union[str, Exception]]:
+        """Answer text per custom_id, or the error for requests that did not succeed."""
+        batch = self.batches.create(requests=[
+            {'custom_id': custom_id,
+             'params': {'model': MODEL, 'max_tokens': MAX_TOKENS,
+                        'messages': [{'role': 'user', 'content': prompt}]}}
+            for custom_id, prompt in prompts.items()
+        ])
+        deadline = time.monotonic() + self.timeout if self.timeout else None
+        while batch.processing_status != 'ended':
+            if deadline and time.monotonic() > deadline:
+                raise TimeoutError(f"Message batch {batch.id} did not finish in time")
+            time.sleep(self.poll_interval)
+            batch = self.batches.retrieve(batch.id)
+        texts = {}
+        for entry in self.batches.results(batch.id):
+            if entry.result.type == 'succeeded':
+                texts[entry.custom_id] = entry.result.message.content[0].text
+            else:
+                texts[entry.custom_id] = RuntimeError(_error_text(entry.result))
+        for custom_id in prompts:
+            texts.setdefault(custom_id, RuntimeError("missing from batch results"))
+        return texts
@@ -0,0 +1,143 @@
+"""
+Per-document instrumentation for the Documentation Analyzer Agent.
+Stage timings and counters are recorded into the Metrics object of the
+document currently being processed (tracked with a context variable, so
+worker threads started with copy_context() report to the right document)
+and can be forwarded to pluggable sinks.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+COUNTERS = ('llm_calls', 'input_tokens', 'output_tokens', 'retries', 'cache_hits', 'cache_misses')
+
+_current: ContextVar[Optional['Metrics']] = ContextVar('document_metrics', default=None)
+
+class Metrics:
+    """Wall time per stage plus token, retry and cache counters for one document."""
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+        self.counters: Dict[str, int] = dict.fromkeys(COUNTERS, 0)
+        self._lock = threading.Lock()
+
+    def add_time(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def add(self, counter: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[counter] = self.counters.get(counter, 0) + n
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            stages = {stage: round(seconds, 4) for stage, seconds in self.stages.items()}
+            return dict(self.counters, stages=stages)
+
+def current() -> Optional[Metrics]:
+    return _current.get()
+
+@contextmanager
+def recording(metrics: Optional[Metrics]):
+    """Make metrics the target of timed()/count() calls in this context (no-op for None)."""
+    token = _current.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current.reset(token)
+
+@contextmanager
+def timed(stage: str):
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.add_time(stage, time.perf_counter() - start)
+
+def add_stages(stages: Dict[str, float]) -> None:
+    """Record stage times measured elsewhere, e.g. in a worker process that has no metrics context."""
+    metrics = _current.get()
+    if metrics is not None:
+        for stage, seconds in stages.items():
+            metrics.add_time(stage, seconds)
+
+def count(counter: str, n: int = 1) -> None:
+    metrics = _current.get()
+    if metrics is not None and n:
+        metrics.add(counter, n)
+
+class JsonLogSink:
+    """Writes one JSON line per document to a file (appending) or stderr."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def emit(self, url: str, metrics: Dict[str, Any]) -> None:
+        line = json.dumps({'url': url, 'timestamp': time.time(), **metrics}) + '\n'
+        with self._lock:
+            if self.path:
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(line)
+            else:
+                sys.stderr.write(line)
+
+class PrometheusTextfileSink:
+    """Aggregates documents into a Prometheus text file (node_exporter textfile collector format).
+
+    The file is rewritten atomically after every document.
+    """
+
+    def __init__(self, path: str, prefix: str = 'doc_analyzer'):
+        self.path = path
+        self.prefix = prefix
+        self.documents = 0
+        self.counters: Dict[str, int] = dict.fromkeys(COUNTERS, 0)
+        self.stage_seconds: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def emit(self, url: str, metrics: Dict[str, Any]) -> None:
+        with self._lock:
+            self.documents += 1
+            for counter in COUNTERS:
+                self.counters[counter] += metrics.get(counter, 0)
+            for stage, seconds in metrics.get('stages', {}).items():
+                self.stage_seconds[stage] = self.stage_seconds.get(stage, 0.0) + seconds
+            self._write()
+
+    def _write(self) -> None:
+        p = self.prefix
+        lines = [f'# TYPE {p}_documents_total counter', f'{p}_documents_total {self.documents}']
+        for counter in COUNTERS:
+            lines += [f'# TYPE {p}_{counter}_total counter', f'{p}_{counter}_total {self.counters[counter]}']
+        lines.append(f'# TYPE {p}_stage_seconds_total counter')
+        lines += [f'{p}_stage_seconds_total{{stage="{stage}"}} {seconds:.6f}'
+                  for stage, seconds in sorted(self.stage_seconds.items())]
+        tmp = f'{self.path}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(tmp, self.path)
+
+class CompositeSink:
+    def __init__(self, *sinks):
+        self.sinks = sinks
+
+    def emit(self, url: str, metrics: Dict[str, Any]) -> None:
+        for sink in self.sinks:
+            sink.emit(url, metrics)
+
+def sink_from_options(json_log: Optional[str] = None, prometheus: Optional[str] = None):
+    sinks = ([JsonLogSink(json_log)] if json_log else []) + ([PrometheusTextfileSink(prometheus)] if prometheus else [])
+    if not sinks:
+        return None
+    return sinks[0] if len(sinks) == 1 else CompositeSink(*sinks)
@@ -0,0 +1,194 @@
+"""
+Streaming output sinks for analysis results.
+Every record is written as soon as it is produced, so memory stays flat
+however many articles a run covers: compact JSONL (gzip or zstd compressed
+when the path ends in .gz or .zst) and a one-row-per-article summary of the
+metadata and score fields as CSV or Parquet for dashboards.
+"""
+
+import csv
+import gzip
+import json
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard is optional
+    zstandard = None
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover - pyarrow is optional
+    pyarrow = None
+
+SECTIONS = ('readability', 'structure', 'completeness', 'style_guidelines')
+SCORES = ('flesch_kincaid_grade', 'gunning_fog_score', 'smog_index', 'coleman_liau_index')
+METADATA = ('word_count', 'paragraph_count', 'heading_count', 'code_blocks_count')
+SUMMARY_COLUMNS = ('url', 'title', 'analysis_timestamp') + METADATA + SCORES + ('suggestion_count', 'error')
+JSONL_SUFFIXES = ('.jsonl', '.jsonl.gz', '.jsonl.zst')
+
+def is_jsonl(path: str) -> bool:
+    """Whether path names a (possibly compressed) JSONL file; report.json.gz, say, does not."""
+    return path.endswith(JSONL_SUFFIXES)
+
+def compression_for(path: str) -> Optional[str]:
+    if path.endswith('.gz'):
+        return 'gzip'
+    if path.endswith('.zst'):
+        return 'zstd'
+    return None
+
+def open_stream(path: str, mode: str):
+    """Open a (possibly compressed) file; text modes ('r', 'w', 'a') use UTF-8, 'rb' reads raw bytes."""
+    text = 'b' not in mode
+    compression = compression_for(path)
+    if compression == 'gzip':
+        return gzip.open(path, mode + 't', encoding='utf-8') if text else gzip.open(path, mode)
+    if compression == 'zstd':
+        if zstandard is None:
+            raise ImportError("Reading or writing .zst output requires the 'zstandard' package")
+        return zstandard.open(path, mode + 't', encoding='utf-8') if text else zstandard.open(path, mode)
+    return open(path, mode, encoding='utf-8') if text else open(path, mode)
+
+READ_ERRORS = (EOFError, OSError) + ((zstandard.ZstdError,) if zstandard else ())
+
+def _complete(path: str) -> Iterator[bytes]:
+    # Reads in chunks so everything decompressed before a cut-off or corrupt tail is still returned.
+    pending = b''
+    try:
+        with open_stream(path, 'rb') as f:
+            for chunk in iter(lambda: f.read1(1 << 16), b''):
+                *lines, pending = (pending + chunk).split(b'\n')
+                yield from lines
+    except READ_ERRORS:
+        pending = None
+    if pending != b'':
+        yield None
+
+def complete_lines(path: str) -> Iterator[str]:
+    """Lines of a (possibly compressed) text file up to a truncated or unreadable tail."""
+    for line in _complete(path):
+        if line is None:
+            return
+        yield line.decode('utf-8') + '\n'
+
+def truncate_partial(path: str) -> None:
+    """Drop a half-written last record (left behind by a crash) so appending keeps the file valid JSONL."""
+    if not compression_for(path):
+        with open(path, 'rb+') as f:
+            data = f.read()
+            if data and not data.endswith(b'\n'):
+                f.truncate(data.rfind(b'\n') + 1)
+        return
+    if None not in _complete(path):
+        return
+    # A compressed stream cut off mid-frame cannot be appended to; rewrite what is readable.
+    tmp = path + '.partial' + os.path.splitext(path)[1]
+    with open_stream(tmp, 'w') as out:
+        for line in complete_lines(path):
+            out.write(line)
+    os.replace(tmp, path)
+
+def summary_row(record: Dict[str, Any]) -> Dict[str, Any]:
+    metadata = record.get('metadata', {})
+    readability = record.get('readability', {})
+    return dict(
+        {'url': record.get('url'), 'title': record.get('title'), 'analysis_timestamp': record.get('analysis_timestamp')},
+        **{key: metadata.get(key) for key in METADATA}, **{key: readability.get(key) for key in SCORES},
+        suggestion_count=sum(len(record.get(name, {}).get('suggestions', [])) for name in SECTIONS),
+        error=record.get('error')
+    )
+
+class Sink(ABC):
+    @abstractmethod
+    def write(self, record: Dict[str, Any]) -> None:
+        """Write one result record."""
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> 'Sink':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+class JsonlSink(Sink):
+    """One compact JSON object per line, flushed per record so partial runs stay readable."""
+
+    def __init__(self, path: str, append: bool = False):
+        self.path = path
+        self._file = open_stream(path, 'a' if append else 'w')
+
+    def write(self, record: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n')
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+class CsvSummarySink(Sink):
+    def __init__(self, path: str, append: bool = False):
+        new = not (append and os.path.exists(path) and os.path.getsize(path))
+        self._file = open(path, 'a' if append else 'w', encoding='utf-8', newline='')
+        self._writer = csv.DictWriter(self._file, fieldnames=SUMMARY_COLUMNS)
+        if new:
+            self._writer.writeheader()
+
+    def write(self, record: Dict[str, Any]) -> None:
+        self._writer.writerow(summary_row(record))
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+class ParquetSummarySink(Sink):
+    """Buffers at most row_group_size rows before writing them as one Parquet row group."""
+
+    def __init__(self, path: str, row_group_size: int = 1000):
+        if pyarrow is None:
+            raise ImportError("Writing a Parquet summary requires the 'pyarrow' package")
+        def column_type(column):
+            if column in SCORES:
+                return pyarrow.float64()
+            return pyarrow.int64() if column in METADATA or column == 'suggestion_count' else pyarrow.string()
+        self.schema = pyarrow.schema([(column, column_type(column)) for column in SUMMARY_COLUMNS])
+        self.row_group_size = row_group_size
+        self._rows: List[Dict[str, Any]] = []
+        self._writer = pyarrow.parquet.ParquetWriter(path, self.schema)
+
+    def write(self, record: Dict[str, Any]) -> None:
+        self._rows.append(summary_row(record))
+        if len(self._rows) >= self.row_group_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._rows:
+            self._writer.write_table(pyarrow.Table.from_pylist(self._rows, schema=self.schema))
+            self._rows = []
+
+    def close(self) -> None:
+        self._flush()
+        self._writer.close()
+
+class MultiSink(Sink):
+    def __init__(self, *sinks):
+        self.sinks = sinks
+
+    def write(self, record: Dict[str, Any]) -> None:
+        for sink in self.sinks:
+            sink.write(record)
+
+    def close(self) -> None:
+        for sink in self.sinks:
+            sink.close()
+
+def open_sinks(output: Optional[str] = None, summary: Optional[str] = None, append: bool = False) -> MultiSink:
+    """JSONL records to output and/or a .csv or .parquet summary (a Parquet summary covers this run only)."""
+    sinks = [JsonlSink(output, append)] if output else []
+    if summary:
+        sinks.append(ParquetSummarySink(summary) if summary.endswith('.parquet') else CsvSummarySink(summary, append))
+    return MultiSink(*sinks)
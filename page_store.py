@@ -0,0 +1,73 @@
+"""
+Local store of fetched help-center pages.
+Keeps the raw HTML, its ETag/Last-Modified validators, the parsed content
+and the last analysis result so unchanged pages can be served from disk,
+plus a section-level snapshot of the last analysis for incremental runs.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+class PageStore:
+    """SQLite-backed page store used for conditional (304) fetching."""
+
+    def __init__(self, path: str = '.page_store.sqlite'):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS pages ('
+            'url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, html TEXT NOT NULL, '
+            'content TEXT NOT NULL, result TEXT, fetched REAL NOT NULL)'
+        )
+        # Kept apart from pages: a changed page resets its result but keeps the snapshot to diff against.
+        self._conn.execute('CREATE TABLE IF NOT EXISTS snapshots (url TEXT PRIMARY KEY, snapshot TEXT NOT NULL)')
+        self._conn.commit()
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT etag, last_modified, html, content, result, fetched FROM pages WHERE url = ?', (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            'etag': row[0], 'last_modified': row[1], 'html': row[2], 'content': json.loads(row[3]),
+            'result': json.loads(row[4]) if row[4] else None, 'fetched': row[5]
+        }
+
+    def save_page(self, url: str, html: str, etag: Optional[str], last_modified: Optional[str],
+                  content: Dict[str, Any]) -> None:
+        # A changed page invalidates the stored result until it is analyzed again.
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO pages (url, etag, last_modified, html, content, result, fetched) '
+                'VALUES (?, ?, ?, ?, ?, NULL, ?)',
+                (url, etag, last_modified, html, json.dumps(dict(content), ensure_ascii=False), time.time())
+            )
+            self._conn.commit()
+
+    def save_result(self, url: str, result: Dict[str, Any]) -> None:
+        with self._lock:
+            self._conn.execute('UPDATE pages SET result = ? WHERE url = ?',
+                               (json.dumps(result, ensure_ascii=False), url))
+            self._conn.commit()
+
+    def get_snapshot(self, url: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute('SELECT snapshot FROM snapshots WHERE url = ?', (url,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save_snapshot(self, url: str, snapshot: Dict[str, Any]) -> None:
+        with self._lock:
+            self._conn.execute('INSERT OR REPLACE INTO snapshots (url, snapshot) VALUES (?, ?)',
+                               (url, json.dumps(snapshot, ensure_ascii=False)))
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
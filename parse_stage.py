@@ -0,0 +1,33 @@
+"""
+CPU-bound stage of the pipeline: HTML extraction plus deterministic metrics.
+parse_and_score is a plain top-level function taking and returning only
+picklable data, so it can run in a ProcessPoolExecutor and scale with cores
+while the I/O side (fetching, LLM calls) stays in threads or asyncio.
+parse_and_time also returns the seconds spent extracting and scoring, which
+the caller records as the parse and readability_scores metric stages.
+"""
+
+import time
+from typing import Any, Dict, Tuple
+
+from extractor import extract_content
+from readability_scores import score_paragraphs, score_text
+
+def readability_scores(content: Dict[str, Any]) -> Dict[str, Any]:
+    return dict(score_text(content['full_text']), paragraph_grades=score_paragraphs(content['paragraphs']))
+
+def parse_and_time(url: str, html: str, partial: bool = False, score: bool = True
+                   ) -> Tuple[Dict[str, Any], Dict[str, float]]:
+    """parse_and_score plus the wall time of each step, as {'parse': seconds, 'readability_scores': seconds}."""
+    start = time.perf_counter()
+    content = extract_content(url, html, partial=partial)
+    stages = {'parse': time.perf_counter() - start}
+    # score=False leaves scoring to the analysis stage (incremental runs only rescore changed paragraphs).
+    if score:
+        start = time.perf_counter()
+        content['readability_scores'] = readability_scores(content)
+        stages['readability_scores'] = time.perf_counter() - start
+    return content, stages
+
+def parse_and_score(url: str, html: str, partial: bool = False, score: bool = True) -> Dict[str, Any]:
+    return parse_and_time(url, html, partial, score)[0]
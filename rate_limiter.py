@@ -0,0 +1,156 @@
+"""
+Adaptive request scheduler for Anthropic calls.
+One RateLimiter is shared by every worker thread or task of an analyzer:
+token buckets cap requests and tokens per minute, a 429's retry-after
+pauses all workers at once, and failed calls are retried with jittered
+exponential backoff instead of being reported as assessments.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+import anthropic
+
+from metrics import count, timed
+
+RETRY_STATUSES = {408, 409, 429, 500, 502, 503, 504, 529}
+
+def estimate_tokens(prompt: str, max_tokens: int) -> int:
+    # About four characters per input token; output is reserved at max_tokens and refunded after the call.
+    return len(prompt) // 4 + max_tokens
+
+def is_retryable(exc: Exception) -> bool:
+    status = getattr(exc, 'status_code', None)
+    if status is not None:
+        return status in RETRY_STATUSES
+    return isinstance(exc, anthropic.APIConnectionError)
+
+def retry_after(exc: Exception) -> Optional[float]:
+    headers = getattr(getattr(exc, 'response', None), 'headers', None) or {}
+    try:
+        return max(0.0, float(headers.get('retry-after')))
+    except (TypeError, ValueError):
+        return None
+
+class TokenBucket:
+    """Holds up to capacity tokens, refilled continuously at capacity per period."""
+
+    def __init__(self, capacity: int, period: float = 60.0):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.level = float(capacity)
+        self.updated = time.monotonic()
+
+    def wait_time(self, n: int, now: float) -> float:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+        # Oversized requests only need a full bucket, otherwise they would wait forever.
+        n = min(n, self.capacity)
+        return 0.0 if self.level >= n else (n - self.level) / self.rate
+
+    def take(self, n: int) -> None:
+        self.level -= min(n, self.capacity)
+
+    def give(self, n: int) -> None:
+        self.level = min(self.capacity, self.level + n)
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute buckets plus a retry scheduler, shared by all workers."""
+
+    def __init__(self, requests_per_minute: int = 50, tokens_per_minute: Optional[int] = None,
+                 period: float = 60.0, max_retries: int = 5, backoff: float = 1.0, max_backoff: float = 60.0):
+        self.requests = TokenBucket(requests_per_minute, period) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute, period) if tokens_per_minute else None
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: int = 0) -> float:
+        """Take capacity if it is available (returns 0), otherwise return how long to wait before retrying."""
+        with self._lock:
+            now = time.monotonic()
+            wait = self._paused_until - now
+            if self.requests:
+                wait = max(wait, self.requests.wait_time(1, now))
+            if self.tokens and tokens:
+                wait = max(wait, self.tokens.wait_time(tokens, now))
+            if wait > 0:
+                return wait
+            if self.requests:
+                self.requests.take(1)
+            if self.tokens and tokens:
+                self.tokens.take(tokens)
+            return 0.0
+
+    def acquire(self, tokens: int = 0) -> None:
+        wait = self._reserve(tokens)
+        while wait > 0:
+            time.sleep(wait)
+            wait = self._reserve(tokens)
+
+    async def acquire_async(self, tokens: int = 0) -> None:
+        wait = self._reserve(tokens)
+        while wait > 0:
+            await asyncio.sleep(wait)
+            wait = self._reserve(tokens)
+
+    def pause(self, seconds: float) -> None:
+        """Hold every worker for seconds (used for a 429's retry-after)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def refund(self, tokens: int) -> None:
+        if self.tokens and tokens > 0:
+            with self._lock:
+                self.tokens.give(tokens)
+
+    def _settle(self, reserved: int, result: Any) -> None:
+        usage = getattr(result, 'usage', None)
+        if usage is not None:
+            self.refund(reserved - (getattr(usage, 'input_tokens', 0) or 0) - (getattr(usage, 'output_tokens', 0) or 0))
+
+    def _retry_delay(self, attempt: int, exc: Exception, tokens: int) -> float:
+        """Schedule the next attempt; returns how long the failed caller itself should sleep."""
+        count('retries')
+        self.refund(tokens)
+        jitter = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+        delay = retry_after(exc)
+        if getattr(exc, 'status_code', None) == 429:
+            # Account-wide limit: every worker waits, not just the one that hit it.
+            self.pause(jitter if delay is None else delay + random.uniform(0, self.backoff))
+            return 0.0
+        return jitter if delay is None else delay
+
+    def call(self, request: Callable[[], Any], tokens: int = 0) -> Any:
+        """Run request() within the limits, retrying rate-limit, overload and connection errors."""
+        for attempt in range(self.max_retries + 1):
+            with timed('rate_limit_wait'):
+                self.acquire(tokens)
+            try:
+                result = request()
+            except Exception as e:
+                if attempt == self.max_retries or not is_retryable(e):
+                    raise
+                time.sleep(self._retry_delay(attempt, e, tokens))
+                continue
+            self._settle(tokens, result)
+            return result
+
+    async def call_async(self, request: Callable[[], Awaitable[Any]], tokens: int = 0) -> Any:
+        for attempt in range(self.max_retries + 1):
+            with timed('rate_limit_wait'):
+                await self.acquire_async(tokens)
+            try:
+                result = await request()
+            except Exception as e:
+                if attempt == self.max_retries or not is_retryable(e):
+                    raise
+                await asyncio.sleep(self._retry_delay(attempt, e, tokens))
+                continue
+            self._settle(tokens, result)
+            return result
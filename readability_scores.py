@@ -0,0 +1,149 @@
+"""
+Local readability engine.
+Tokenizes each text once, counts syllables through a memoized word table and
+derives Flesch-Kincaid, Gunning Fog, SMOG and Coleman-Liau from the same
+counts. Formulas, tokenization and rounding follow textstat 0.7.3 so scores
+match the library the analyzer used before.
+"""
+
+import math
+import re
+from functools import lru_cache
+from importlib import resources
+from typing import Callable, Dict, FrozenSet, List, NamedTuple, Optional, Sequence, Tuple
+
+import textstat
+from pyphen import Pyphen
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+PUNCT_RE = re.compile(r"[^\w\s]")
+SENTENCE_RE = re.compile(r"\b[^.!?]+[.!?]*", re.UNICODE)
+DIFFICULT_RE = re.compile(r"[\w\='‘’]+")
+SYLLABLE_THRESHOLD = 3
+
+_pyphen = Pyphen(lang='en_US')
+
+def _load_easy_words() -> Optional[FrozenSet[str]]:
+    """textstat's Dale-Chall easy-word list, read as package data; None when this textstat does not ship it."""
+    try:
+        with (resources.files('textstat') / 'resources' / 'en' / 'easy_words.txt').open(encoding='utf-8') as f:
+            return frozenset(line.strip() for line in f)
+    except OSError:
+        return None
+
+EASY_WORDS = _load_easy_words()
+# Without the bundled list, ask textstat word by word (slower, but the same answer for 3+ syllable words).
+is_easy_word: Callable[[str], bool] = EASY_WORDS.__contains__ if EASY_WORDS is not None else textstat.is_easy_word
+
+class TextCounts(NamedTuple):
+    words: int
+    sentences: int
+    syllables: int
+    polysyllables: int
+    difficult_words: int
+    letters: int
+
+@lru_cache(maxsize=200_000)
+def word_syllables(word: str) -> int:
+    """Syllables in a lowercased word with punctuation removed."""
+    return len(_pyphen.positions(word)) + 1 if word else 0
+
+@lru_cache(maxsize=200_000)
+def _token_stats(token: str) -> Tuple[int, int, Tuple[str, ...]]:
+    # (letters, syllables, difficult words) for one whitespace-separated token.
+    lowered = token.lower()
+    cleaned = PUNCT_RE.sub('', lowered)
+    difficult = tuple(
+        piece for piece in DIFFICULT_RE.findall(lowered)
+        if not is_easy_word(piece) and word_syllables(PUNCT_RE.sub('', piece)) >= SYLLABLE_THRESHOLD
+    )
+    return len(cleaned), word_syllables(cleaned), difficult
+
+def _sentence_count(text: str) -> int:
+    sentences = SENTENCE_RE.findall(text)
+    short = sum(1 for s in sentences if len(PUNCT_RE.sub('', s).split()) <= 2)
+    return max(1, len(sentences) - short)
+
+def count_text(text: str) -> TextCounts:
+    words = syllables = polysyllables = letters = 0
+    difficult = set()
+    for token in text.split():
+        token_letters, token_syllables, token_difficult = _token_stats(token)
+        if token_letters:
+            words += 1
+            letters += token_letters
+            syllables += token_syllables
+            if token_syllables >= 3:
+                polysyllables += 1
+        difficult.update(token_difficult)
+    return TextCounts(words, _sentence_count(text), syllables, polysyllables, len(difficult), letters)
+
+def _round(number: float, points: int = 0) -> float:
+    p = 10 ** points
+    return float(math.floor((number * p) + math.copysign(0.5, number))) / p
+
+def _ratio(numerator: float, denominator: float, points: int) -> float:
+    return _round(numerator / denominator, points) if denominator else 0.0
+
+def scores_from_counts(c: TextCounts) -> Dict[str, float]:
+    asl = _ratio(c.words, c.sentences, 1)
+    asw = _ratio(c.syllables, c.words, 1)
+    fog = _round(0.4 * (asl + c.difficult_words / c.words * 100), 2) if c.words else 0.0
+    smog = _round(1.043 * (30 * (c.polysyllables / c.sentences)) ** .5 + 3.1291, 1) if c.sentences >= 3 else 0.0
+    letters = _round(_ratio(c.letters, c.words, 2) * 100, 2)
+    sentences = _round(_ratio(c.sentences, c.words, 2) * 100, 2)
+    return {
+        'flesch_kincaid_grade': _round(0.39 * asl + 11.8 * asw - 15.59, 1),
+        'gunning_fog_score': fog,
+        'smog_index': smog,
+        'coleman_liau_index': _round(0.058 * letters - 0.296 * sentences - 15.8, 2),
+    }
+
+def score_text(text: str) -> Dict[str, float]:
+    return scores_from_counts(count_text(text))
+
+def score_paragraphs(paragraphs: Sequence[str]) -> List[float]:
+    """Flesch-Kincaid grade for each paragraph, in order."""
+    return score_batch(paragraphs, metrics=('flesch_kincaid_grade',))['flesch_kincaid_grade']
+
+def _np_round(values, points: int = 0):
+    p = 10 ** points
+    return np.floor(values * p + np.copysign(0.5, values)) / p
+
+def _np_ratio(numerator, denominator, points: int):
+    safe = np.where(denominator == 0, 1, denominator)
+    return np.where(denominator == 0, 0.0, _np_round(numerator / safe, points))
+
+def score_batch(texts: Sequence[str], metrics: Sequence[str] = ('flesch_kincaid_grade', 'gunning_fog_score',
+                                                                'smog_index', 'coleman_liau_index')) -> Dict[str, List[float]]:
+    """Score many texts at once; returns one list per metric, aligned with texts.
+
+    Counting is done per text (sharing the memoized syllable table); the
+    formulas are evaluated over whole columns with NumPy when it is installed.
+    """
+    counts = [count_text(text) for text in texts]
+    if np is None or not counts:
+        per_text = [scores_from_counts(c) for c in counts]
+        return {m: [s[m] for s in per_text] for m in metrics}
+    c = np.array(counts, dtype=float).reshape(-1, len(TextCounts._fields))
+    words, sentences, syllables, poly, difficult, letters = c.T
+    asl = _np_ratio(words, sentences, 1)
+    asw = _np_ratio(syllables, words, 1)
+    safe_words = np.where(words == 0, 1, words)
+    columns = {}
+    if 'flesch_kincaid_grade' in metrics:
+        columns['flesch_kincaid_grade'] = _np_round(0.39 * asl + 11.8 * asw - 15.59, 1)
+    if 'gunning_fog_score' in metrics:
+        columns['gunning_fog_score'] = np.where(words == 0, 0.0, _np_round(0.4 * (asl + difficult / safe_words * 100), 2))
+    if 'smog_index' in metrics:
+        smog = 1.043 * np.sqrt(30 * poly / np.maximum(sentences, 1)) + 3.1291
+        columns['smog_index'] = np.where(sentences >= 3, _np_round(smog, 1), 0.0)
+    if 'coleman_liau_index' in metrics:
+        letters_per = _np_round(_np_ratio(letters, words, 2) * 100, 2)
+        sentences_per = _np_round(_np_ratio(sentences, words, 2) * 100, 2)
+        columns['coleman_liau_index'] = _np_round(0.058 * letters_per - 0.296 * sentences_per - 15.8, 2)
+    return {m: columns[m].tolist() for m in metrics}
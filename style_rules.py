@@ -0,0 +1,97 @@
+"""
+Deterministic style and structure checks for the Documentation Analyzer Agent.
+Works on the parsed headings, paragraphs and lists with precompiled regular
+expressions and a single pass over the heading levels, so a document is
+checked in milliseconds. Findings fill structure.hierarchy_issues and
+style_guidelines.rule_issues, and back the LLM-free pre-screen mode.
+"""
+
+import re
+from typing import Any, Dict, List
+
+LONG_SENTENCE_WORDS = 30
+
+SENTENCE_RE = re.compile(r'(?<=[.!?])\s+(?=["“(\[]?[A-Z0-9])')
+WORD_RE = re.compile(r"[\w'’-]+")
+# A form of "to be" followed by a past participle (regular -ed or a common irregular one).
+PASSIVE_RE = re.compile(
+    r"\b(?:am|is|are|was|were|be|been|being)\s+(?:\w+ly\s+)?"
+    r"(?:\w+ed|built|chosen|done|drawn|given|known|made|put|sent|set|shown|taken|seen|found|kept|held|"
+    r"run|written|read|shared|hidden|bought|brought|begun|broken|sold|told|thrown)\b",
+    re.IGNORECASE
+)
+# Microsoft Style Guide word choices: banned term -> preferred wording.
+BANNED_TERMS = {
+    'utilize': 'use', 'utilise': 'use', 'in order to': 'to', 'click on': 'select', 'please': 'omit "please"',
+    'simply': 'omit "simply"', 'e.g.': 'for example', 'i.e.': 'that is', 'etc.': 'a complete list or "and more"',
+    'whitelist': 'allowlist', 'blacklist': 'blocklist', 'abort': 'stop or cancel', 'via': 'through or by using',
+    'leverage': 'use', 'in the event that': 'if', 'prior to': 'before',
+}
+BANNED_RE = re.compile(
+    r'(?<![\w.])(' + '|'.join(re.escape(term) for term in sorted(BANNED_TERMS, key=len, reverse=True)) + r')(?!\w)',
+    re.IGNORECASE
+)
+# Steps in an ordered list should start with a verb; these openings mean they do not.
+NON_IMPERATIVE_RE = re.compile(
+    r"^(?:you|we|they|it|this|that|these|those|the|a|an|there|users?|your|our)\b|^\w+(?:ing|ed)\b",
+    re.IGNORECASE
+)
+
+def _issue(rule: str, location: str, text: str, message: str) -> Dict[str, str]:
+    return {'rule': rule, 'location': location, 'text': text, 'message': message}
+
+def heading_issues(headings: List[Dict[str, Any]]) -> List[str]:
+    """Skipped heading levels, e.g. an H4 directly under an H2."""
+    issues = []
+    previous = None
+    for heading in headings:
+        level = heading['level']
+        if previous is not None and level > previous + 1:
+            issues.append(f"Heading level jumps from H{previous} to H{level} in the '{heading['text']}' section"
+                          f" - consider adding an H{previous + 1} level")
+        previous = level
+    return issues
+
+def sentence_issues(paragraphs: List[str]) -> List[Dict[str, str]]:
+    issues = []
+    for p, paragraph in enumerate(paragraphs, 1):
+        for sentence in SENTENCE_RE.split(paragraph):
+            words = len(WORD_RE.findall(sentence))
+            if words > LONG_SENTENCE_WORDS:
+                issues.append(_issue('long_sentence', f'paragraph {p}', sentence,
+                                     f"Sentence has {words} words; split it into sentences under {LONG_SENTENCE_WORDS}"))
+            for match in PASSIVE_RE.finditer(sentence):
+                issues.append(_issue('passive_voice', f'paragraph {p}', match.group(0),
+                                     f"Passive voice '{match.group(0)}'; say who does the action"))
+    return issues
+
+def list_issues(lists: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+    """Ordered lists are procedures, so every step should start with an imperative verb."""
+    issues = []
+    for l, lst in enumerate(lists, 1):
+        if lst['type'] != 'ol':
+            continue
+        for i, item in enumerate(lst['items'], 1):
+            if item and NON_IMPERATIVE_RE.match(item):
+                issues.append(_issue('non_imperative_step', f'list {l} item {i}', item,
+                                     "Start the step with a verb, e.g. 'Select', 'Enter', 'Configure'"))
+    return issues
+
+def banned_term_issues(content: Dict[str, Any]) -> List[Dict[str, str]]:
+    issues = []
+    blocks = [(f'heading {h}', heading['text']) for h, heading in enumerate(content['headings'], 1)]
+    blocks += [(f'paragraph {p}', paragraph) for p, paragraph in enumerate(content['paragraphs'], 1)]
+    blocks += [(f'list {l} item {i}', item) for l, lst in enumerate(content['lists'], 1)
+               for i, item in enumerate(lst['items'], 1)]
+    for location, text in blocks:
+        for match in BANNED_RE.finditer(text or ''):
+            term = match.group(1)
+            issues.append(_issue('banned_term', location, term,
+                                 f"Replace '{term}' with {BANNED_TERMS[term.lower()]}"))
+    return issues
+
+def style_issues(content: Dict[str, Any]) -> List[Dict[str, str]]:
+    return sentence_issues(content['paragraphs']) + list_issues(content['lists']) + banned_term_issues(content)
+
+def rule_suggestions(issues: List[Dict[str, str]]) -> List[str]:
+    return [f"{issue['message']} ({issue['location']})" for issue in issues]
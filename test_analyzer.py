@@ -5,8 +5,11 @@ Includes mock analysis for testing without API calls.
 """
 
 import json
+import threading
+import time
 from datetime import datetime
-from doc_analyzer import DocumentationAnalyzer
+from types import SimpleNamespace
+from doc_analyzer import DocumentationAnalyzer, RateLimiter
 
 class MockDocumentationAnalyzer(DocumentationAnalyzer):
     """Mock analyzer for testing without API calls."""
@@ -105,6 +108,146 @@ class MockDocumentationAnalyzer(DocumentationAnalyzer):
             ]
         }
 
+class FakeMessages:
+    """Stands in for client.messages; answers every prompt after a fixed latency."""
+
+    def __init__(self, latency=0.0, reply=None):
+        self.latency = latency
+        self.reply = reply
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def create(self, model, max_tokens, messages):
+        with self._lock:
+            self.calls.append(messages[0]['content'])
+        time.sleep(self.latency)
+        text = self.reply or "Overall fine.\nConsider adding a short summary before the first section of this article."
+        usage = SimpleNamespace(input_tokens=len(messages[0]['content']) // 4, output_tokens=len(text) // 4)
+        return SimpleNamespace(content=[SimpleNamespace(text=text)], usage=usage)
+
+    def stream(self, model, max_tokens, messages):
+        return FakeStream(STREAMED_RESPONSE, chunk_size=7)
+
+STREAMED_RESPONSE = "The article is readable.\n" + "".join(
+    f"{i}. Consider rewriting paragraph {i} so that it leads with the action.\n" for i in range(1, 16)
+) + "Overall a solid guide."
+
+class FakeStream:
+    """Context manager mimicking client.messages.stream(); records how much text was consumed."""
+
+    def __init__(self, text, chunk_size):
+        self.chunks = [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)]
+        self.consumed = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    @property
+    def text_stream(self):
+        for chunk in self.chunks:
+            self.consumed += 1
+            yield chunk
+
+def make_fake_analyzer(latency=0.0, **kwargs):
+    """Real analyzer wired to a fake Anthropic client and the mock article content."""
+    analyzer = DocumentationAnalyzer('test-key', **kwargs)
+    analyzer.client = SimpleNamespace(messages=FakeMessages(latency))
+    analyzer.fetch_content = MockDocumentationAnalyzer().fetch_content
+    return analyzer
+
+def _without_timestamp(result):
+    return {k: v for k, v in result.items() if k != 'analysis_timestamp'}
+
+def test_concurrent_output_matches_sequential():
+    url = "https://help.moengage.com/hc/en-us/articles/test-push-notifications"
+    sequential = make_fake_analyzer().analyze_document(url)
+    concurrent = make_fake_analyzer(concurrent=True).analyze_document(url)
+    assert _without_timestamp(sequential) == _without_timestamp(concurrent)
+
+def test_concurrent_takes_about_one_round_trip():
+    analyzer = make_fake_analyzer(latency=0.3, concurrent=True)
+    start = time.monotonic()
+    analyzer.analyze_document("https://help.moengage.com/hc/en-us/articles/test")
+    assert time.monotonic() - start < 0.6
+    assert len(analyzer.client.messages.calls) == 4
+
+def test_rate_limiter_allows_burst_then_refills():
+    limiter = RateLimiter(requests_per_minute=2, period=0.2)
+    start = time.monotonic()
+    for _ in range(2):
+        limiter.acquire()
+    assert time.monotonic() - start < 0.05
+    for _ in range(2):
+        limiter.acquire()
+    assert time.monotonic() - start >= 0.2
+
+def test_suggestion_parser_matches_batch_extraction():
+    from doc_analyzer import SuggestionParser
+    expected = MockDocumentationAnalyzer()._extract_feedback_suggestions(STREAMED_RESPONSE)
+    for chunk_size in (1, 5, 64, len(STREAMED_RESPONSE)):
+        parser = SuggestionParser()
+        for i in range(0, len(STREAMED_RESPONSE), chunk_size):
+            parser.feed(STREAMED_RESPONSE[i:i + chunk_size])
+        parser.close()
+        assert parser.suggestions == expected
+
+def test_streaming_stops_once_suggestion_cap_is_reached():
+    received = []
+    analyzer = make_fake_analyzer(on_suggestion=lambda name, suggestion: received.append((name, suggestion)))
+    streams = []
+    def stream(model, max_tokens, messages):
+        streams.append(FakeStream(STREAMED_RESPONSE, chunk_size=7))
+        return streams[-1]
+    analyzer.client.messages.stream = stream
+    result = analyzer.analyze_readability(analyzer.fetch_page('u')[0])
+    assert len(result['suggestions']) == 10
+    assert [s for name, s in received] == result['suggestions']
+    assert streams[0].consumed < len(streams[0].chunks)
+
+def test_stream_analysis_yields_suggestions_then_result():
+    analyzer = make_fake_analyzer()
+    events = list(analyzer.stream_analysis(analyzer.fetch_page('u')[0]))
+    suggestions = [e for e in events if 'suggestion' in e]
+    assert {e['analyzer'] for e in suggestions} == {'readability', 'structure', 'completeness', 'style_guidelines'}
+    assert 'result' in events[-1]
+    assert events[-1]['result']['style_guidelines']['suggestions'] == [
+        e['suggestion'] for e in suggestions if e['analyzer'] == 'style_guidelines']
+
+COMBINED_REPLY = """```json
+{"readability": {"assessment": "Clear for marketers.", "suggestions": ["Define SDK on first use"]},
+ "structure": {"assessment": "Logical order.", "suggestions": ["Add a Quick Start section"]},
+ "completeness": {"assessment": "Missing iOS example.", "suggestions": ["Add an iOS code sample", " "]},
+ "style_guidelines": {"assessment": "Mostly active voice.", "suggestions": []}}
+```"""
+
+def test_combined_mode_makes_one_call_and_keeps_schema():
+    analyzer = make_fake_analyzer(combined=True)
+    analyzer.client.messages.reply = COMBINED_REPLY
+    result = analyzer.analyze_document("https://help.moengage.com/hc/en-us/articles/test")
+    reference = make_fake_analyzer().analyze_document("https://help.moengage.com/hc/en-us/articles/test")
+    assert len(analyzer.client.messages.calls) == 1
+    assert result.keys() == reference.keys()
+    for name in ('readability', 'structure', 'completeness', 'style_guidelines'):
+        assert result[name].keys() == reference[name].keys()
+    assert result['completeness']['suggestions'] == ['Add an iOS code sample']
+    assert result['structure']['assessment'] == 'Logical order.'
+    assert result['readability']['flesch_kincaid_grade'] == reference['readability']['flesch_kincaid_grade']
+
+def test_combined_mode_falls_back_for_unparseable_sections():
+    analyzer = make_fake_analyzer(combined=True)
+    result = analyzer.analyze_document("https://help.moengage.com/hc/en-us/articles/test")
+    assert len(analyzer.client.messages.calls) == 5
+    assert result['style_guidelines']['suggestions']
+
+def test_mock_analyzer_runs_the_full_pipeline(monkeypatch):
+    # The overridden fetch_content is used, and the options __init__ skipped fall back to their defaults.
+    monkeypatch.setattr(DocumentationAnalyzer, 'session', None)
+    result = MockDocumentationAnalyzer().analyze_document('https://help.moengage.com/hc/en-us/articles/test')
+    assert result['readability']['flesch_kincaid_grade'] == 8.5 and result['metadata']['paragraph_count'] == 5
+
 def run_mock_test():
     """Run a test analysis using mock data."""
     print("Running Mock Analysis Test")
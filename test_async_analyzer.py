@@ -0,0 +1,175 @@
+"""Tests for the asyncio engine using httpx's mock transport and a fake async Anthropic client."""
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import httpx
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from async_analyzer import AsyncDocumentationAnalyzer
+from doc_analyzer import ANALYZERS, DocumentationAnalyzer
+from llm_cache import LLMCache
+from page_store import PageStore
+from test_analyzer import STREAMED_RESPONSE, FakeMessages, FakeStream, make_fake_analyzer
+from test_chunking import long_content
+from test_page_store import HTML, FakeSession
+
+URLS = [f"https://help.moengage.com/hc/en-us/articles/{i}" for i in range(20)]
+
+class FakeAsyncMessages:
+    def __init__(self, latency=0.0):
+        self.sync = FakeMessages()
+        self.latency = latency
+        self.in_flight = 0
+        self.peak = 0
+
+    async def create(self, model, max_tokens, messages):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(self.latency)
+        self.in_flight -= 1
+        return self.sync.create(model, max_tokens, messages)
+
+    def stream(self, model, max_tokens, messages):
+        return FakeAsyncStream(STREAMED_RESPONSE, chunk_size=7)
+
+class FakeAsyncStream(FakeStream):
+    """Async counterpart of FakeStream, for AsyncAnthropic's messages.stream()."""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    @property
+    async def text_stream(self):
+        for chunk in self.chunks:
+            self.consumed += 1
+            yield chunk
+
+def make_async_analyzer(handler=None, latency=0.0, **kwargs):
+    analyzer = AsyncDocumentationAnalyzer('test-key', **kwargs)
+    analyzer.client = SimpleNamespace(messages=FakeAsyncMessages(latency), close=analyzer.client.close)
+    transport = httpx.MockTransport(handler or (lambda request: httpx.Response(200, text=HTML)))
+    analyzer.http = httpx.AsyncClient(transport=transport)
+    return analyzer
+
+async def _collect(analyzer, urls):
+    async with analyzer:
+        return [result async for result in analyzer.analyze_urls(urls)]
+
+def _without_timestamp(result):
+    return {k: v for k, v in result.items() if k != 'analysis_timestamp'}
+
+def test_async_output_matches_sync_analyzer():
+    result = asyncio.run(_collect(make_async_analyzer(), URLS[:1]))[0]
+    sync = DocumentationAnalyzer('test-key')
+    sync.client = SimpleNamespace(messages=FakeMessages())
+    sync.session = FakeSession()
+    assert _without_timestamp(result) == _without_timestamp(sync.analyze_document(URLS[0]))
+
+def test_many_articles_share_one_event_loop():
+    analyzer = make_async_analyzer(latency=0.2, max_concurrency=32, requests_per_minute=0)
+    start = time.monotonic()
+    results = asyncio.run(_collect(analyzer, URLS))
+    assert time.monotonic() - start < 1.5
+    assert sorted(r['url'] for r in results) == sorted(URLS)
+    assert analyzer.client.messages.peak > 4
+
+def test_semaphore_bounds_articles_in_flight():
+    analyzer = make_async_analyzer(latency=0.05, max_concurrency=2, requests_per_minute=0)
+    asyncio.run(_collect(analyzer, URLS[:6]))
+    assert analyzer.client.messages.peak <= 2 * 4
+
+def test_fetch_retries_rate_limited_responses():
+    attempts = []
+    def handler(request):
+        attempts.append(request.url)
+        if len(attempts) == 1:
+            return httpx.Response(429, headers={'Retry-After': '0'})
+        return httpx.Response(200, text=HTML)
+    results = asyncio.run(_collect(make_async_analyzer(handler, metrics=True), URLS[:1]))
+    assert len(attempts) == 2
+    assert results[0]['metrics']['retries'] == 1
+
+def test_fetch_retries_transport_errors():
+    attempts = []
+    def handler(request):
+        attempts.append(request.url)
+        if len(attempts) == 1:
+            raise httpx.ConnectError('connection reset', request=request)
+        return httpx.Response(200, text=HTML)
+    results = asyncio.run(_collect(make_async_analyzer(handler, metrics=True, backoff=0), URLS[:1]))
+    assert len(attempts) == 2 and 'error' not in results[0]
+    assert results[0]['metrics']['retries'] == 1
+
+def test_combined_fallback_is_chunked_like_the_sync_engine():
+    content = long_content(repeat=12)
+    sync = make_fake_analyzer(combined=True, chunk_tokens=300)
+    expected = sync.analyze_content(content)
+    analyzer = make_async_analyzer(combined=True, chunk_tokens=300)
+    async def run():
+        async with analyzer:
+            return await analyzer.analyze_content(content)
+    result = asyncio.run(run())
+    assert _without_timestamp(result) == _without_timestamp(expected)
+    assert len(analyzer.client.messages.sync.calls) == len(sync.client.messages.calls) > len(ANALYZERS) + 1
+
+def test_aclose_shuts_down_only_its_own_executor():
+    analyzer = make_async_analyzer()
+    asyncio.run(analyzer.aclose())
+    assert analyzer.executor._shutdown
+    executor = ThreadPoolExecutor(max_workers=1)
+    asyncio.run(make_async_analyzer(executor=executor).aclose())
+    assert not executor._shutdown
+    executor.shutdown()
+
+def test_failures_are_labelled_by_stage():
+    results = asyncio.run(_collect(make_async_analyzer(lambda request: httpx.Response(404)), URLS[:2]))
+    assert all(r['error'].startswith('Fetch failed') for r in results)
+    analyzer = make_async_analyzer()
+    async def broken(content):
+        raise ValueError('no sections')
+    analyzer.analyze_content = broken
+    assert asyncio.run(_collect(analyzer, URLS[:1]))[0]['error'] == 'Analysis failed: no sections'
+
+def test_sync_clients_are_never_built():
+    analyzer = make_async_analyzer()
+    asyncio.run(_collect(analyzer, URLS[:1]))
+    assert analyzer.core._client is None and analyzer.core._session is None
+
+def test_sqlite_calls_run_off_the_event_loop(tmp_path):
+    threads = set()
+    def recorded(method):
+        def wrapper(*args):
+            threads.add(threading.get_ident())
+            return method(*args)
+        return wrapper
+    store, cache = PageStore(str(tmp_path / 'pages.sqlite')), LLMCache(str(tmp_path / 'cache.sqlite'))
+    for obj, names in ((store, ('get', 'save_page', 'save_result')), (cache, ('get', 'put'))):
+        for name in names:
+            setattr(obj, name, recorded(getattr(obj, name)))
+    results = asyncio.run(_collect(make_async_analyzer(page_store=store, cache=cache), URLS[:1]))
+    assert threads and threading.get_ident() not in threads
+    assert 'error' not in results[0] and store.get(URLS[0])['result'] == results[0]
+
+def test_stream_analysis_yields_suggestions_then_result():
+    async def run():
+        async with make_async_analyzer() as analyzer:
+            content, _ = await analyzer.fetch_page(URLS[0])
+            return [event async for event in analyzer.stream_analysis(content)]
+    events = asyncio.run(run())
+    suggestions = [e for e in events if 'suggestion' in e]
+    assert {e['analyzer'] for e in suggestions} == {'readability', 'structure', 'completeness', 'style_guidelines'}
+    assert 'result' in events[-1]
+    assert events[-1]['result']['readability']['suggestions'] == [
+        e['suggestion'] for e in suggestions if e['analyzer'] == 'readability']
+
+def test_parsing_in_a_process_pool():
+    with ProcessPoolExecutor(1) as executor:
+        results = asyncio.run(_collect(make_async_analyzer(executor=executor), URLS[:2]))
+    assert all('error' not in r for r in results)
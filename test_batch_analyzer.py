@@ -0,0 +1,53 @@
+"""Tests for the batch/crawl mode, using the fake Anthropic client from test_analyzer."""
+
+import json
+
+from batch_analyzer import BatchAnalyzer, load_completed, load_urls
+from test_analyzer import make_fake_analyzer
+
+URLS = [f"https://help.moengage.com/hc/en-us/articles/{i}" for i in range(6)]
+
+def _read_jsonl(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+def test_load_urls_from_text_and_sitemap(tmp_path):
+    listing = tmp_path / 'urls.txt'
+    listing.write_text("# help center\n" + "\n".join(URLS[:2]) + "\n\n")
+    sitemap = tmp_path / 'sitemap.xml'
+    sitemap.write_text('<?xml version="1.0"?><urlset>' +
+                       ''.join(f'<url><loc>{u}</loc></url>' for u in URLS[:3]) + '</urlset>')
+    assert load_urls(str(listing)) == URLS[:2]
+    assert load_urls(str(sitemap)) == URLS[:3]
+
+def test_batch_streams_one_record_per_article(tmp_path):
+    output = tmp_path / 'results.jsonl'
+    stats = BatchAnalyzer(make_fake_analyzer(), fetch_workers=3, analysis_workers=2).run(URLS, str(output))
+    records = _read_jsonl(output)
+    assert stats == {'skipped': 0, 'analyzed': len(URLS), 'failed': 0, 'unchanged': 0}
+    assert sorted(r['url'] for r in records) == sorted(URLS)
+    assert all('readability' in r for r in records)
+
+def test_batch_resumes_after_crash(tmp_path):
+    output = tmp_path / 'results.jsonl'
+    done = {'url': URLS[0], 'title': 'done'}
+    failed = {'url': URLS[1], 'error': 'Fetch failed: timeout'}
+    partial = {'url': URLS[3], 'readability': {'error': 'LLM failed: HTTP 529'}, 'structure': {'assessment': 'ok'}}
+    output.write_text(json.dumps(done) + '\n' + json.dumps(failed) + '\n' + json.dumps(partial) +
+                      '\n{"url": "' + URLS[2])
+    assert load_completed(str(output)) == {URLS[0]}
+
+    stats = BatchAnalyzer(make_fake_analyzer()).run(URLS, str(output))
+    records = _read_jsonl(output)
+    assert stats['skipped'] == 1 and stats['analyzed'] == len(URLS) - 1
+    assert [r['url'] for r in records].count(URLS[0]) == 1
+
+def test_batch_records_fetch_errors(tmp_path):
+    def broken_fetch(url):
+        raise ValueError("Could not locate main article content")
+    analyzer = make_fake_analyzer()
+    analyzer.fetch_content = broken_fetch
+    output = tmp_path / 'results.jsonl'
+    stats = BatchAnalyzer(analyzer).run(URLS[:2], str(output))
+    assert stats['failed'] == 2
+    assert all(r['error'].startswith('Fetch failed') for r in _read_jsonl(output))
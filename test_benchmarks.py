@@ -0,0 +1,34 @@
+"""Smoke tests for the offline benchmark harness (local corpus server and fake Anthropic endpoint)."""
+
+from argparse import Namespace
+
+import requests
+
+from benchmarks.bench import bench_llm_path, regressions
+from benchmarks.corpus import load_corpus
+from benchmarks.servers import corpus_server
+
+def _args(**overrides):
+    args = dict(latency=0.0, rate_limit_every=3, retry_after=0.01, rpm=0, chunk_tokens=None, repeat=1,
+                fetch_workers=2, analysis_workers=2, parse_workers=0)
+    return Namespace(**dict(args, **overrides))
+
+def test_corpus_server_supports_conditional_requests():
+    with corpus_server(load_corpus()[:1]) as urls:
+        first = requests.get(urls[0])
+        again = requests.get(urls[0], headers={'If-None-Match': first.headers['ETag']})
+    assert first.status_code == 200 and '<article' in first.text
+    assert again.status_code == 304
+
+def test_injected_rate_limits_are_retried_by_the_real_sdk_path(monkeypatch):
+    monkeypatch.setenv('ANTHROPIC_BASE_URL', 'http://unused')
+    pages = load_corpus()[:3]
+    for path in ('single', 'batch'):
+        result = bench_llm_path(_args(), pages, path)
+        assert result['articles'] == 3 and result['failures'] == 0
+        assert result['injected_429s'] > 0 and result['llm_requests'] == 12 + result['injected_429s']
+
+def test_regressions_compare_against_baseline():
+    baseline = {'batch': {'articles_per_sec': 10.0, 'p95_ms': 100.0, 'peak_rss_mb': 80.0}}
+    current = [{'path': 'batch', 'articles_per_sec': 7.0, 'p95_ms': 110.0, 'peak_rss_mb': 80.0}]
+    assert regressions(current, baseline, 0.2) == ['batch: articles/sec 10.0 -> 7.0']
@@ -0,0 +1,104 @@
+"""Tests for token-aware chunking of long articles."""
+
+import time
+
+from chunking import chunk_content, count_tokens, merge_suggestions, section_spans
+from page_store import PageStore
+from test_analyzer import FakeMessages, MockDocumentationAnalyzer, _without_timestamp, make_fake_analyzer
+
+SECTION = ("Marketers configure each campaign from the dashboard and choose the audience segment first. "
+           "Then they pick a delivery time that suits the users in every region. ")
+
+def long_content(sections=8, repeat=6):
+    headings = [{'level': 2, 'text': f'Step {i}'} for i in range(sections)]
+    full_text = ' '.join(f"Step {i} {SECTION * repeat}".strip() for i in range(sections))
+    return {'url': 'https://help.moengage.com/hc/en-us/articles/long', 'title': 'SDK Integration Guide',
+            'full_text': full_text, 'headings': headings, 'paragraphs': [SECTION * repeat] * sections,
+            'lists': [], 'code_blocks': [], 'word_count': len(full_text.split()), 'paragraph_count': sections}
+
+def test_token_estimate_needs_no_api():
+    assert count_tokens('') == 0
+    assert count_tokens('Set up the SDK.') == 5
+    assert count_tokens('x' * 400) == 100
+
+def test_chunks_follow_headings_and_fit_budget():
+    content = long_content()
+    chunks = chunk_content(content, max_tokens=400)
+    assert len(chunks) > 1 and all(chunk['tokens'] <= 400 for chunk in chunks)
+    assert all(chunk['text'].startswith('Step') for chunk in chunks)
+    assert [h for chunk in chunks for h in chunk['headings']] == [h['text'] for h in content['headings']]
+    assert ' '.join(chunk['text'] for chunk in chunks) == content['full_text']
+
+def test_oversized_section_is_split_at_sentences():
+    content = long_content(sections=1, repeat=30)
+    chunks = chunk_content(content, max_tokens=200)
+    assert len(chunks) > 3 and all(chunk['tokens'] <= 200 for chunk in chunks)
+    assert all(chunk['text'].endswith('.') for chunk in chunks)
+    assert len(section_spans(content)) == 1
+
+def test_merge_interleaves_and_drops_near_duplicates():
+    merged = merge_suggestions([
+        ['1. Consider adding a summary at the top of the page.', 'Add screenshots for each step.'],
+        ['- Consider adding a summary at the top of this page', 'Define SDK on first use.'],
+    ], limit=10)
+    assert merged == ['1. Consider adding a summary at the top of the page.', 'Add screenshots for each step.',
+                      'Define SDK on first use.']
+
+def test_long_article_is_analyzed_in_full_in_parallel():
+    analyzer = make_fake_analyzer(latency=0.2, chunk_tokens=400, concurrent=True)
+    content = long_content()
+    chunks = analyzer.chunks_for('readability', content)
+    start = time.monotonic()
+    result = analyzer.analyze_content(content)
+    assert time.monotonic() - start < 2 * 0.2
+    assert len(analyzer.client.messages.calls) == 3 * len(chunks) + 1
+    for name in ('readability', 'completeness', 'style_guidelines'):
+        assert result[name]['coverage']['ratio'] == 1.0
+        assert result[name]['coverage']['chunks'] == len(chunks)
+    assert result['readability']['suggestions'] == [
+        "Consider adding a short summary before the first section of this article."
+    ]
+
+def test_short_articles_keep_single_prompt():
+    content = MockDocumentationAnalyzer().fetch_content('u')
+    chunked = make_fake_analyzer(chunk_tokens=400)
+    result = chunked.analyze_content(content)
+    assert result['readability']['coverage']['ratio'] == 1.0
+    del result['readability']['coverage'], result['completeness']['coverage'], result['style_guidelines']['coverage']
+    assert _without_timestamp(result) == _without_timestamp(make_fake_analyzer().analyze_content(content))
+
+def test_max_chunks_caps_calls_and_reports_partial_coverage():
+    analyzer = make_fake_analyzer(chunk_tokens=400, max_chunks=2)
+    content = long_content()
+    result = analyzer.analyze_content(content)
+    assert result['readability']['coverage']['chunks'] == 2
+    assert result['readability']['coverage']['ratio'] < 1.0
+
+def test_article_fitting_one_chunk_is_sent_whole():
+    analyzer = make_fake_analyzer(chunk_tokens=4000)
+    content = long_content(sections=4, repeat=12)
+    assert len(content['full_text']) > 3000 and len(analyzer.chunks_for('readability', content)) == 1
+    result = analyzer.analyze_content(content)
+    assert result['readability']['coverage'] == {'chunks': 1, 'analyzed_chunks': 1, 'ratio': 1.0,
+                                                 'characters_analyzed': len(content['full_text']),
+                                                 'characters_total': len(content['full_text'])}
+    assert any(content['full_text'] in call for call in analyzer.client.messages.calls)
+    assert not result['readability']['assessment'].startswith('[Part')
+
+class FailingPart(FakeMessages):
+    def create(self, model, max_tokens, messages):
+        if messages[0]['content'].startswith('Analyze readability (part 2 of'):
+            raise RuntimeError('HTTP 500')
+        return super().create(model, max_tokens, messages)
+
+def test_partly_failed_section_is_neither_stored_nor_snapshotted(tmp_path):
+    store = PageStore(str(tmp_path / 'pages.sqlite'))
+    content = long_content()
+    store.save_page(content['url'], '', None, None, content)
+    analyzer = make_fake_analyzer(chunk_tokens=300, page_store=store, incremental=True)
+    analyzer.client.messages = FailingPart()
+    section = analyzer.analyze_content(content)['readability']
+    assert section['coverage']['analyzed_chunks'] == section['coverage']['chunks'] - 1
+    assert section['error'].startswith('LLM failed for 1 of') and section['assessment']
+    assert store.get(content['url'])['result'] is None
+    assert 'readability' not in store.get_snapshot(content['url'])['prompts']
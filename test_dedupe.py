@@ -0,0 +1,68 @@
+"""Tests for cross-document boilerplate stripping and near-duplicate reuse."""
+
+import json
+
+from batch_analyzer import BatchAnalyzer
+from benchmarks.corpus import make_article
+from dedupe import CorpusIndex, minhash, shingles, similarity
+from extractor import extract_content
+from test_analyzer import MockDocumentationAnalyzer, make_fake_analyzer
+
+FOOTER = ('<p>Was this article helpful? Contact <a href="mailto:support@moengage.com">support@moengage.com</a> '
+          'or read our <a href="/terms">Terms of Service</a>.</p>')
+BASE = 'https://help.moengage.com/hc/en-us/articles/'
+
+def _page(index, edit=''):
+    return make_article(index).replace('</div></article>', f'{edit}{FOOTER}</div></article>')
+
+def test_minhash_estimates_similarity():
+    text = extract_content('u', make_article(1))['full_text']
+    edited = text.replace('Section 2', 'Part 2', 1)
+    other = extract_content('u', make_article(2))['full_text']
+    assert similarity(minhash(shingles(text)), minhash(shingles(edited))) > 0.9
+    assert similarity(minhash(shingles(text)), minhash(shingles(other))) < 0.3
+
+def test_blocks_on_many_pages_are_stripped():
+    index = CorpusIndex(min_pages=3)
+    docs = [extract_content(f'u{i}', _page(i)) for i in range(3)]
+    for doc in docs[:2]:
+        index.observe(doc)
+    assert index.strip(docs[0]) == (docs[0], 0)
+    index.observe(docs[2])
+    stripped, blocks = index.strip(docs[0])
+    assert blocks == 1 and 'Terms of Service' not in stripped['full_text']
+    assert stripped['paragraphs'] == docs[0]['paragraphs'][:-1] and stripped['headings'] == docs[0]['headings']
+    assert stripped['full_text'] in docs[0]['full_text'].replace(' Was this article', '')
+    # The footer's links join its text without separators in paragraphs but with spaces in full_text.
+    as_dict, blocks = index.strip(docs[0].as_dict())
+    assert blocks == 1 and as_dict['full_text'] == ' '.join(stripped['full_text'].split())
+    # Plain content dicts (e.g. from the page store) are stripped too.
+    plain = dict(MockDocumentationAnalyzer().fetch_content('u'))
+    plain['paragraphs'] = plain['paragraphs'] + [docs[0]['paragraphs'][-1]]
+    plain['full_text'] += ' ' + docs[0]['paragraphs'][-1]
+    stripped, blocks = index.strip(plain)
+    assert blocks == 1 and stripped['full_text'].endswith('going live.') and stripped['paragraph_count'] == 5
+
+def test_batch_reuses_near_duplicates_and_reports_savings(tmp_path):
+    pages = {f'{BASE}{i}': _page(i) for i in range(4)}
+    pages[f'{BASE}copy'] = _page(2, edit='<p>Updated for SDK version 12.</p>')
+    analyzer = make_fake_analyzer()
+    analyzer.fetch_page = lambda url, parser=None: (extract_content(url, pages[url]), None)
+    output = tmp_path / 'results.jsonl'
+    stats = BatchAnalyzer(analyzer, fetch_workers=1, analysis_workers=1, dedupe=CorpusIndex()).run(
+        list(pages), str(output))
+    records = {r['url']: r for r in map(json.loads, output.read_text().splitlines())}
+
+    assert stats['analyzed'] == 5 and stats['duplicates'] == 1 and stats['boilerplate_blocks'] >= 3
+    assert len(analyzer.client.messages.calls) == 4 * 4
+    copy = records[f'{BASE}copy']
+    assert copy['duplicate_of']['url'] == f'{BASE}2' and copy['duplicate_of']['similarity'] >= 0.9
+    assert copy['readability']['assessment'] == records[f'{BASE}2']['readability']['assessment']
+    assert copy['metadata']['word_count'] == records[f'{BASE}2']['metadata']['word_count'] + 5
+    # Metrics and metadata describe the whole article; only the prompts lose the boilerplate.
+    original = extract_content(f'{BASE}3', pages[f'{BASE}3'])
+    assert records[f'{BASE}3']['metadata']['word_count'] == original['word_count']
+    assert records[f'{BASE}3']['metadata']['paragraph_count'] == original['paragraph_count']
+    assert records[f'{BASE}3']['boilerplate']['blocks_removed'] == 1
+    assert stats['tokens_saved'] >= copy['duplicate_of']['tokens_saved'] > 0
+    assert not any('Terms of Service' in call for call in analyzer.client.messages.calls[-4:])
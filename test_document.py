@@ -0,0 +1,46 @@
+"""Tests for the compact Document content model."""
+
+import copy
+import json
+import pickle
+
+import pytest
+
+from benchmarks.bench_memory import measure
+from benchmarks.corpus import load_corpus
+from doc_analyzer import DocumentationAnalyzer
+from document import FIELDS
+from extractor import extract_content
+from page_store import PageStore
+from test_extractor import HELP_CENTER_PAGE
+from test_page_store import URL, FakeSession
+
+def test_fields_are_rebuilt_from_the_shared_text():
+    doc = extract_content('u', HELP_CENTER_PAGE)
+    assert doc['paragraphs'] == doc.paragraphs and doc.paragraph_count == len(doc.paragraphs)
+    assert doc['lists'][0] == {'type': 'ol', 'items': ['Create an appGet theAPP_ID', 'Get theAPP_ID', 'Add the SDK']}
+    assert doc['headings'][0]['level'] == 1 and all(p in doc.full_text for p in ('Prerequisites', 'Done.'))
+    assert set(doc) == set(doc.as_dict()) and len(doc) == 9
+
+def test_extra_keys_copy_and_pickle():
+    doc = extract_content('u', HELP_CENTER_PAGE)
+    with pytest.raises(KeyError):
+        doc['full_text'] = 'replaced'
+    scored = copy.copy(doc)
+    scored['readability_scores'] = {'flesch_kincaid_grade': 5.0}
+    assert 'readability_scores' not in doc and scored.get('readability_scores') == {'flesch_kincaid_grade': 5.0}
+    assert scored.full_text is doc.full_text
+    assert pickle.loads(pickle.dumps(scored)) == scored
+
+def test_document_holds_less_than_a_content_dict():
+    pages = load_corpus()[:10]
+    assert measure(pages, as_dict=False)['retained_kb'] < 0.75 * measure(pages, as_dict=True)['retained_kb']
+
+def test_fetch_content_returns_a_plain_dict(tmp_path):
+    analyzer = DocumentationAnalyzer('test-key', page_store=PageStore(str(tmp_path / 'pages.sqlite')))
+    analyzer.session = FakeSession()
+    content = analyzer.fetch_content(URL)
+    # The same nine keys as before, also when the content comes back from the page store (304).
+    assert type(content) is dict and list(content) == list(FIELDS) == list(analyzer.fetch_content(URL)) and json.loads(json.dumps(content)) == content
+    content['full_text'] = 'replaced'
+    assert content.copy()['full_text'] == 'replaced'
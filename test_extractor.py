@@ -0,0 +1,59 @@
+"""Tests that the lxml extractor reproduces the original BeautifulSoup extraction."""
+
+import re
+
+import pytest
+from bs4 import BeautifulSoup
+
+from extractor import extract_content
+
+def legacy_extract(url, html):
+    """The original html.parser extraction from fetch_content, kept as the reference."""
+    soup = BeautifulSoup(html, 'html.parser')
+    article_content = soup.find('article') or soup.find('div', class_='article-body') or soup.find('main')
+    if not article_content:
+        article_content = soup.find('div', {'class': re.compile(r'content|article|body')})
+    title = (soup.find('h1') or soup.find('title')).get_text(strip=True) if soup.find('h1') or soup.find('title') else "No title"
+    headings = [{'level': int(h.name[1]), 'text': h.get_text(strip=True)} for h in article_content.find_all(['h1','h2','h3','h4','h5','h6'])]
+    paragraphs = [p.get_text(strip=True) for p in article_content.find_all('p') if p.get_text(strip=True)]
+    lists = [{'type': ul.name, 'items': [li.get_text(strip=True) for li in ul.find_all('li')]} for ul in article_content.find_all(['ul','ol'])]
+    code_blocks = [c.get_text(strip=True) for c in article_content.find_all(['code','pre'])]
+    full_text = article_content.get_text(separator=' ', strip=True)
+    return {
+        'url': url, 'title': title, 'full_text': full_text, 'headings': headings,
+        'paragraphs': paragraphs, 'lists': lists, 'code_blocks': code_blocks,
+        'word_count': len(full_text.split()), 'paragraph_count': len(paragraphs)
+    }
+
+HELP_CENTER_PAGE = """<!DOCTYPE html><html><head><title>Push | MoEngage</title>
+<script>var a = "<p>not text</p>";</script></head><body>
+<nav><a href="/">Home</a> &gt; Push</nav>
+<article class="article"><header><h1 class="article-title">Push&nbsp;Notifications <small>Android</small></h1></header>
+<div class="article-body"><p>Use <strong>MoEngage</strong> to send push &amp; in-app messages.<!-- hidden --> Really.</p>
+<h2>Prerequisites</h2><ol><li>Create an app<ul><li>Get the <code>APP_ID</code></li></ul></li><li><p>Add the SDK</p></li></ol>
+<pre><code class="lang-java">MoEngage.initialize(this, "APP_ID");
+</code></pre><style>.x{}</style><h3>Tips</h3><p>  </p><p>Done.</p>
+<template><h4>Hidden</h4></template><table><tr><td>a</td><td>b</td></tr></table></div></article>
+<footer><p>&copy; MoEngage</p></footer></body></html>"""
+
+FALLBACK_PAGES = [
+    '<html><body><div class="wrapper"><div class="article-body"><h2>Only body</h2><p>text one</p></div></div></body></html>',
+    '<html><head><title>T</title></head><body><main><h2>x</h2><p>y <em>z</em></p></main></body></html>',
+    '<html><body><div class="page-content"><h4>x</h4><p>y</p></div></body></html>',
+]
+
+NESTED_PAGE = ('<html><body><article><h1>Outer</h1><p>outer text here</p>'
+               '<article><p>inner</p></article></article><footer><h1>Footer</h1></footer></body></html>')
+
+@pytest.mark.parametrize('html', [HELP_CENTER_PAGE, NESTED_PAGE] + FALLBACK_PAGES)
+@pytest.mark.parametrize('partial', [False, True])
+def test_matches_beautifulsoup_extraction(html, partial):
+    assert extract_content('u', html, partial=partial) == legacy_extract('u', html)
+
+def test_missing_container_raises():
+    with pytest.raises(ValueError):
+        extract_content('u', '<html><body><p>no article here</p></body></html>')
+
+def test_partial_parse_keeps_the_outer_article():
+    doc = extract_content('u', NESTED_PAGE, partial=True)
+    assert doc['full_text'] == 'Outer outer text here inner' and doc['title'] == 'Outer'
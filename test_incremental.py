@@ -0,0 +1,69 @@
+"""Tests for incremental re-analysis driven by section-level snapshots."""
+
+from types import SimpleNamespace
+
+from doc_analyzer import DocumentationAnalyzer
+from page_store import PageStore
+from test_analyzer import FakeMessages
+from test_page_store import URL, FakeSession
+
+PARAGRAPHS = [f"Paragraph {i} explains how marketers configure campaign number {i} for their audience." for i in range(40)]
+
+def page(paragraphs, nav='Home'):
+    body = ''.join(f'<p>{p}</p>' for p in paragraphs)
+    return (f'<html><body><nav>{nav}</nav><article><h1>Campaign Setup</h1><h2>Steps</h2>{body}'
+            '<ul><li>Create a segment</li><li>Schedule</li></ul></article></body></html>')
+
+def analyze(store, html, etag, **kwargs):
+    analyzer = DocumentationAnalyzer('test-key', page_store=store, incremental=True, **kwargs)
+    analyzer.client = SimpleNamespace(messages=FakeMessages())
+    analyzer.session = FakeSession(html, etag)
+    return analyzer, analyzer.analyze_document(URL)
+
+def full_analysis(html):
+    analyzer = DocumentationAnalyzer('test-key')
+    analyzer.client = SimpleNamespace(messages=FakeMessages())
+    analyzer.session = FakeSession(html)
+    return analyzer.analyze_document(URL)
+
+def _report_free(result):
+    return {k: v for k, v in result.items() if k not in ('analysis_timestamp', 'incremental')}
+
+def test_first_run_recomputes_everything(tmp_path):
+    analyzer, result = analyze(PageStore(str(tmp_path / 'pages.sqlite')), page(PARAGRAPHS), '"v1"')
+    assert len(analyzer.client.messages.calls) == 4
+    assert result['incremental']['baseline'] is None and result['incremental']['reused'] == []
+    assert _report_free(result) == _report_free(full_analysis(page(PARAGRAPHS)))
+
+def test_body_edit_skips_title_only_structure_prompt(tmp_path):
+    store = PageStore(str(tmp_path / 'pages.sqlite'))
+    _, first = analyze(store, page(PARAGRAPHS), '"v1"')
+    edited = ['Marketers can now skip this step entirely.'] + PARAGRAPHS[1:]
+    analyzer, result = analyze(store, page(edited), '"v2"')
+    prompts = analyzer.client.messages.calls
+    assert len(prompts) == 3 and not any(p.startswith('Structure analysis') for p in prompts)
+    report = result['incremental']
+    assert report['baseline'] == first['analysis_timestamp']
+    assert report['changed']['paragraphs'] == {'added': 1, 'removed': 1}
+    assert report['changed']['title'] is False
+    assert 'structure.assessment' in report['reused'] and 'readability.assessment' in report['recomputed']
+    assert report['paragraph_grades_reused'] == len(PARAGRAPHS) - 1
+    assert _report_free(result) == _report_free(full_analysis(page(edited)))
+
+def test_edit_beyond_prompt_slices_only_recomputes_metrics(tmp_path):
+    store = PageStore(str(tmp_path / 'pages.sqlite'))
+    analyze(store, page(PARAGRAPHS), '"v1"')
+    edited = PARAGRAPHS[:-1] + ['The last paragraph is much shorter now.']
+    analyzer, result = analyze(store, page(edited), '"v2"')
+    assert analyzer.client.messages.calls == []
+    assert all(part.endswith('.metrics') for part in result['incremental']['recomputed'])
+    assert 'style_guidelines.assessment' in result['incremental']['reused']
+    assert _report_free(result) == _report_free(full_analysis(page(edited)))
+
+def test_markup_only_change_reuses_everything(tmp_path):
+    store = PageStore(str(tmp_path / 'pages.sqlite'))
+    analyze(store, page(PARAGRAPHS), '"v1"')
+    analyzer, result = analyze(store, page(PARAGRAPHS, nav='Start'), '"v2"')
+    assert analyzer.client.messages.calls == []
+    assert result['incremental']['recomputed'] == []
+    assert result['incremental']['paragraph_grades_reused'] == len(PARAGRAPHS)
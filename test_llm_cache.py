@@ -0,0 +1,44 @@
+"""Tests for the persistent LLM response cache."""
+
+import time
+
+from llm_cache import LLMCache
+from test_analyzer import make_fake_analyzer
+
+URL = "https://help.moengage.com/hc/en-us/articles/test-push-notifications"
+
+def test_rerun_of_unchanged_article_makes_no_api_calls(tmp_path):
+    cache_path = str(tmp_path / 'cache.sqlite')
+    first = make_fake_analyzer(cache=LLMCache(cache_path))
+    first.analyze_document(URL)
+    assert len(first.client.messages.calls) == 4
+
+    second = make_fake_analyzer(cache=LLMCache(cache_path))
+    result = second.analyze_document(URL)
+    assert second.client.messages.calls == []
+    assert second.cache.stats()['hits'] == 4 and second.cache.misses == 0
+    assert result['readability']['suggestions']
+
+def test_key_includes_model_and_max_tokens(tmp_path):
+    cache = LLMCache(str(tmp_path / 'cache.sqlite'))
+    cache.put('model-a', 'prompt', 1500, 'answer')
+    assert cache.get('model-a', 'prompt', 1500) == 'answer'
+    assert cache.get('model-b', 'prompt', 1500) is None
+    assert cache.get('model-a', 'prompt', 500) is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+def test_expired_entries_are_evicted(tmp_path):
+    cache = LLMCache(str(tmp_path / 'cache.sqlite'), max_age=0.05)
+    cache.put('m', 'p', 10, 'old')
+    time.sleep(0.1)
+    assert cache.get('m', 'p', 10) is None
+    assert cache.stats()['entries'] == 0
+
+def test_size_limit_drops_least_recently_used(tmp_path):
+    cache = LLMCache(str(tmp_path / 'cache.sqlite'), max_bytes=250)
+    for i in range(3):
+        cache.put('m', f'p{i}', 10, 'x' * 100)
+        time.sleep(0.01)
+    assert cache.get('m', 'p0', 10) is None
+    assert cache.get('m', 'p2', 10) == 'x' * 100
+    assert cache.stats()['bytes'] <= 250
@@ -0,0 +1,99 @@
+"""Tests for the Message Batches backend against a fake batches client and the fake HTTP server."""
+
+import itertools
+import json
+from types import SimpleNamespace
+
+from batch_analyzer import BatchAnalyzer
+from benchmarks.servers import fake_anthropic_server
+from doc_analyzer import ANALYZERS, DocumentationAnalyzer
+from llm_cache import LLMCache
+from message_batches import MessageBatchBackend
+from test_analyzer import FakeMessages, MockDocumentationAnalyzer, make_fake_analyzer
+
+URLS = [f"https://help.moengage.com/hc/en-us/articles/{i}" for i in range(3)]
+
+class FakeBatches:
+    """Accepts a batch, reports it in progress for a couple of polls, then serves results."""
+
+    def __init__(self, polls_until_done=2, fail_ids=()):
+        self.polls_until_done = polls_until_done
+        self.fail_ids = set(fail_ids)
+        self.submitted = []
+        self._ids = itertools.count()
+
+    def create(self, requests):
+        batch_id = f'msgbatch_{next(self._ids)}'
+        self.submitted.append((batch_id, requests))
+        return SimpleNamespace(id=batch_id, processing_status='in_progress')
+
+    def retrieve(self, batch_id):
+        self.polls_until_done -= 1
+        return SimpleNamespace(id=batch_id, processing_status='ended' if self.polls_until_done <= 0 else 'in_progress')
+
+    def results(self, batch_id):
+        requests = dict(self.submitted)[batch_id]
+        for request in reversed(requests):
+            custom_id = request['custom_id']
+            if custom_id in self.fail_ids:
+                yield SimpleNamespace(custom_id=custom_id, result=SimpleNamespace(type='errored', error='overloaded'))
+                continue
+            prompt = request['params']['messages'][0]['content']
+            text = FakeMessages().create(None, None, [{'content': prompt}]).content[0].text
+            yield SimpleNamespace(custom_id=custom_id, result=SimpleNamespace(
+                type='succeeded', message=SimpleNamespace(content=[SimpleNamespace(text=text)])))
+
+def make_batch_analyzer(batches, **kwargs):
+    analyzer = make_fake_analyzer(**kwargs)
+    analyzer.client.messages.batches = batches
+    return analyzer
+
+def _without_timestamp(result):
+    return {k: v for k, v in result.items() if k != 'analysis_timestamp'}
+
+def test_batch_results_match_synchronous_schema():
+    contents = [MockDocumentationAnalyzer().fetch_content(url) for url in URLS]
+    batches = FakeBatches()
+    results = MessageBatchBackend(make_batch_analyzer(batches), poll_interval=0).analyze_contents(contents)
+    expected = [make_fake_analyzer().analyze_content(content) for content in contents]
+    assert [_without_timestamp(r) for r in results] == [_without_timestamp(r) for r in expected]
+    assert len(batches.submitted) == 1 and len(batches.submitted[0][1]) == len(URLS) * len(ANALYZERS)
+
+def test_failed_requests_are_reported_per_analyzer():
+    batches = FakeBatches(fail_ids={'doc0-structure'})
+    content = MockDocumentationAnalyzer().fetch_content(URLS[0])
+    result = MessageBatchBackend(make_batch_analyzer(batches), poll_interval=0).analyze_contents([content])[0]
+    assert result['structure']['error'] == 'Structure analysis failed: overloaded'
+    assert result['structure']['assessment'] is None and result['structure']['suggestions'] == []
+    assert result['readability']['suggestions']
+
+def test_cached_prompts_are_not_resubmitted(tmp_path):
+    cache = LLMCache(str(tmp_path / 'cache.sqlite'))
+    content = MockDocumentationAnalyzer().fetch_content(URLS[0])
+    MessageBatchBackend(make_batch_analyzer(FakeBatches(), cache=cache), poll_interval=0).analyze_contents([content])
+    batches = FakeBatches()
+    MessageBatchBackend(make_batch_analyzer(batches, cache=cache), poll_interval=0).analyze_contents([content])
+    assert batches.submitted == []
+
+def test_batch_runner_writes_jsonl_per_group(tmp_path):
+    batches = FakeBatches(polls_until_done=0)
+    analyzer = make_batch_analyzer(batches)
+    output = tmp_path / 'results.jsonl'
+    stats = BatchAnalyzer(analyzer).run_message_batches(
+        URLS, str(output), MessageBatchBackend(analyzer, poll_interval=0), docs_per_batch=2)
+    assert stats['analyzed'] == len(URLS)
+    assert len(batches.submitted) == 2
+    assert len(output.read_text().splitlines()) == len(URLS)
+
+def test_real_sdk_client_runs_batches_over_http(monkeypatch, tmp_path):
+    with fake_anthropic_server() as (base, stats):
+        monkeypatch.setenv('ANTHROPIC_BASE_URL', base)
+        analyzer = DocumentationAnalyzer('test-key')
+        analyzer.fetch_content = MockDocumentationAnalyzer().fetch_content
+        output = tmp_path / 'results.jsonl'
+        result = BatchAnalyzer(analyzer).run_message_batches(
+            URLS, str(output), MessageBatchBackend(analyzer, poll_interval=0))
+        records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert result['analyzed'] == len(URLS) and result['failed'] == 0
+    assert stats.requests == len(URLS) * len(ANALYZERS)
+    assert all('error' not in r[name] and r[name]['assessment'] for r in records for name in ANALYZERS)
@@ -0,0 +1,61 @@
+"""Tests for per-stage timing and token instrumentation."""
+
+import json
+
+from batch_analyzer import BatchAnalyzer
+from llm_cache import LLMCache
+from metrics import JsonLogSink, PrometheusTextfileSink
+from test_analyzer import make_fake_analyzer
+from test_page_store import FakeSession
+
+URL = "https://help.moengage.com/hc/en-us/articles/test-push-notifications"
+
+def test_metrics_block_records_stages_and_tokens():
+    analyzer = make_fake_analyzer(concurrent=True, metrics=True)
+    metrics = analyzer.analyze_document(URL)['metrics']
+    prompts = analyzer.client.messages.calls
+    assert metrics['llm_calls'] == 4
+    assert metrics['input_tokens'] == sum(len(p) // 4 for p in prompts)
+    assert metrics['output_tokens'] > 0
+    for stage in ('total', 'readability_scores', 'llm_readability', 'llm_structure',
+                  'llm_completeness', 'llm_style_guidelines', 'rate_limit_wait'):
+        assert stage in metrics['stages']
+
+def test_metrics_are_off_by_default():
+    assert 'metrics' not in make_fake_analyzer().analyze_document(URL)
+
+def test_cache_hits_are_counted(tmp_path):
+    cache = LLMCache(str(tmp_path / 'cache.sqlite'))
+    make_fake_analyzer(cache=cache).analyze_document(URL)
+    metrics = make_fake_analyzer(cache=cache, metrics=True).analyze_document(URL)['metrics']
+    assert (metrics['cache_hits'], metrics['cache_misses'], metrics['llm_calls']) == (4, 0, 0)
+
+def test_sinks_receive_every_document(tmp_path):
+    log, prom = tmp_path / 'metrics.jsonl', tmp_path / 'analyzer.prom'
+    analyzer = make_fake_analyzer(metrics_sink=JsonLogSink(str(log)))
+    urls = [f"{URL}-{i}" for i in range(3)]
+    BatchAnalyzer(analyzer).run(urls, str(tmp_path / 'out.jsonl'))
+    records = [json.loads(line) for line in log.read_text().splitlines()]
+    assert sorted(r['url'] for r in records) == sorted(urls)
+    assert all(r['llm_calls'] == 4 for r in records)
+
+    sink = PrometheusTextfileSink(str(prom))
+    for record in records:
+        sink.emit(record['url'], record)
+    text = prom.read_text()
+    assert 'doc_analyzer_documents_total 3' in text
+    assert 'doc_analyzer_llm_calls_total 12' in text
+    assert 'doc_analyzer_stage_seconds_total{stage="llm_readability"}' in text
+
+def test_parse_and_scoring_are_timed_separately(tmp_path):
+    analyzer = make_fake_analyzer(metrics=True)
+    del analyzer.fetch_content
+    analyzer.session = FakeSession()
+    stages = analyzer.analyze_document(URL)['metrics']['stages']
+    assert stages['parse'] > 0 and stages['readability_scores'] > 0
+    # Also when a process pool parses and scores the page.
+    log = tmp_path / 'metrics.jsonl'
+    analyzer.metrics_sink = JsonLogSink(str(log))
+    BatchAnalyzer(analyzer, parse_workers=1).run([URL + '-pool'], str(tmp_path / 'out.jsonl'))
+    stages = json.loads(log.read_text())['stages']
+    assert stages['parse'] > 0 and stages['readability_scores'] > 0
@@ -0,0 +1,79 @@
+"""Tests for the streaming JSONL and summary sinks."""
+
+import csv
+import gzip
+import json
+import tracemalloc
+
+import pytest
+
+from batch_analyzer import BatchAnalyzer, load_completed
+from output_sinks import SUMMARY_COLUMNS, JsonlSink, Sink, complete_lines, is_jsonl, open_sinks, summary_row
+from test_analyzer import make_fake_analyzer
+
+URLS = [f"https://help.moengage.com/hc/en-us/articles/{i}" for i in range(4)]
+
+def _record(i):
+    return {
+        'url': URLS[i % len(URLS)], 'title': f'Article {i} – café', 'analysis_timestamp': '2024-01-01T00:00:00',
+        'metadata': {'word_count': 100 + i, 'paragraph_count': 5, 'heading_count': 3, 'code_blocks_count': 1},
+        'readability': {'flesch_kincaid_grade': 8.5, 'suggestions': ['a', 'b']},
+        'structure': {'suggestions': ['c']}, 'completeness': {'suggestions': []},
+        'style_guidelines': {'suggestions': ['d'], 'rule_issues': []},
+    }
+
+def test_jsonl_sink_writes_compact_gzip_lines(tmp_path):
+    path = str(tmp_path / 'results.jsonl.gz')
+    with open_sinks(path) as sink:
+        for i in range(3):
+            sink.write(_record(i))
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    assert [json.loads(line) for line in lines] == [_record(i) for i in range(3)]
+    assert ', ' not in lines[0] and '": ' not in lines[0] and 'café' in lines[0]
+
+def test_csv_summary_has_metadata_and_scores(tmp_path):
+    path = tmp_path / 'summary.csv'
+    with open_sinks(summary=str(path)) as sink:
+        sink.write(_record(0))
+        sink.write({'url': URLS[1], 'error': 'Fetch failed: timeout'})
+    with open(path, encoding='utf-8', newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert tuple(rows[0]) == SUMMARY_COLUMNS
+    assert rows[0]['word_count'] == '100' and rows[0]['flesch_kincaid_grade'] == '8.5'
+    assert rows[0]['suggestion_count'] == '4' and rows[0]['error'] == ''
+    assert rows[1]['error'] == 'Fetch failed: timeout' and rows[1]['word_count'] == ''
+
+def test_resume_truncated_gzip_output(tmp_path):
+    path = tmp_path / 'results.jsonl.gz'
+    with JsonlSink(str(path)) as sink:
+        sink.write({'url': URLS[0], 'title': 'done'})
+        sink.write({'url': URLS[1], 'title': 'lost'})
+    path.write_bytes(path.read_bytes()[:-20])  # crash while the second record was being written
+    assert load_completed(str(path)) == {URLS[0]}
+
+    stats = BatchAnalyzer(make_fake_analyzer()).run(URLS, str(path), summary_path=str(tmp_path / 'summary.csv'))
+    records = [json.loads(line) for line in complete_lines(str(path))]
+    assert stats['skipped'] == 1 and stats['analyzed'] == len(URLS) - 1
+    assert sorted(r['url'] for r in records) == sorted(URLS)
+    with open(tmp_path / 'summary.csv', encoding='utf-8') as f:
+        assert len(f.read().splitlines()) == len(URLS)  # header plus the three new articles
+
+def test_memory_stays_flat_with_run_size(tmp_path):
+    def peak(n):
+        tracemalloc.start()
+        with open_sinks(str(tmp_path / f'{n}.jsonl.gz'), str(tmp_path / f'{n}.csv')) as sink:
+            for i in range(n):
+                sink.write(_record(i))
+        _, high = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return high
+    small, large = peak(200), peak(2000)
+    assert large < small * 1.5
+    assert summary_row(_record(1))['word_count'] == 101
+
+def test_sinks_must_implement_write_and_jsonl_paths_match_exactly():
+    with pytest.raises(TypeError):
+        Sink()
+    assert all(is_jsonl(path) for path in ('out.jsonl', 'out.jsonl.gz', 'out.jsonl.zst'))
+    assert not any(is_jsonl(path) for path in ('report.json', 'report.json.gz', 'report.zst'))
@@ -0,0 +1,81 @@
+"""Tests for conditional fetching backed by the local page store."""
+
+from types import SimpleNamespace
+
+from doc_analyzer import DocumentationAnalyzer
+from page_store import PageStore
+from test_analyzer import FakeMessages
+
+URL = "https://help.moengage.com/hc/en-us/articles/test-push-notifications"
+HTML = """<html><head><title>Push Notifications</title></head><body>
+<article><h1>Setting Up Push Notifications</h1>
+<p>Integrate the SDK into your project before you send your first campaign.</p>
+<h2>Prerequisites</h2><ul><li>Android SDK</li><li>iOS SDK</li></ul>
+<pre><code>MoEngage.initialize(this, "YOUR_APP_ID")</code></pre></article></body></html>"""
+
+class FakeSession:
+    """Serves HTML with an ETag and answers 304 when the client already has it."""
+
+    def __init__(self, html=HTML, etag='"v1"'):
+        self.html = html
+        self.etag = etag
+        self.requests = []
+
+    def get(self, url, timeout=None, headers=None):
+        headers = headers or {}
+        self.requests.append(headers)
+        if headers.get('If-None-Match') == self.etag:
+            return SimpleNamespace(status_code=304, headers={}, text='', raise_for_status=lambda: None)
+        return SimpleNamespace(status_code=200, headers={'ETag': self.etag, 'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'},
+                               text=self.html, raise_for_status=lambda: None)
+
+def make_store_analyzer(store, session):
+    analyzer = DocumentationAnalyzer('test-key', page_store=store)
+    analyzer.client = SimpleNamespace(messages=FakeMessages())
+    analyzer.session = session
+    return analyzer
+
+def test_unchanged_page_skips_reanalysis(tmp_path):
+    store = PageStore(str(tmp_path / 'pages.sqlite'))
+    first = make_store_analyzer(store, FakeSession())
+    result = first.analyze_document(URL)
+    assert len(first.client.messages.calls) == 4
+
+    second = make_store_analyzer(store, FakeSession())
+    assert second.analyze_document(URL) == result
+    assert second.session.requests[0]['If-None-Match'] == '"v1"'
+    assert 'If-Modified-Since' in second.session.requests[0]
+    assert second.client.messages.calls == []
+
+def test_changed_page_is_parsed_and_analyzed_again(tmp_path):
+    store = PageStore(str(tmp_path / 'pages.sqlite'))
+    make_store_analyzer(store, FakeSession()).analyze_document(URL)
+    changed = make_store_analyzer(store, FakeSession(HTML.replace('first campaign', 'next campaign'), '"v2"'))
+    result = changed.analyze_document(URL)
+    assert len(changed.client.messages.calls) == 4
+    assert store.get(URL)['etag'] == '"v2"'
+    assert store.get(URL)['result'] == result
+
+def test_session_retries_rate_limits_and_server_errors():
+    adapter = DocumentationAnalyzer('test-key', pool_size=64).session.get_adapter(URL)
+    assert adapter._pool_maxsize == 64
+    assert 429 in adapter.max_retries.status_forcelist and 503 in adapter.max_retries.status_forcelist
+
+class FailingReadability(FakeMessages):
+    def create(self, model, max_tokens, messages):
+        if messages[0]['content'].startswith('Analyze readability'):
+            raise RuntimeError('HTTP 500')
+        return super().create(model, max_tokens, messages)
+
+def test_result_with_failed_sections_is_not_replayed(tmp_path):
+    store = PageStore(str(tmp_path / 'pages.sqlite'))
+    failing = make_store_analyzer(store, FakeSession())
+    failing.client = SimpleNamespace(messages=FailingReadability())
+    assert failing.analyze_document(URL)['readability']['error'] == 'LLM failed: HTTP 500'
+    assert store.get(URL)['result'] is None
+
+    healthy = make_store_analyzer(store, FakeSession())
+    result = healthy.analyze_document(URL)
+    assert healthy.session.requests[0]['If-None-Match'] == '"v1"'
+    assert 'error' not in result['readability'] and len(healthy.client.messages.calls) == 4
+    assert store.get(URL)['result'] == result
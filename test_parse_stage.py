@@ -0,0 +1,44 @@
+"""Tests for the process-pool parse and scoring stage."""
+
+import json
+from types import SimpleNamespace
+
+from batch_analyzer import BatchAnalyzer
+from doc_analyzer import DocumentationAnalyzer
+from extractor import extract_content
+from parse_stage import parse_and_score
+from readability_scores import score_paragraphs, score_text
+from test_analyzer import FakeMessages
+from test_page_store import HTML, URL, FakeSession
+
+def test_parse_and_score_adds_precomputed_scores():
+    content = parse_and_score(URL, HTML)
+    extracted = extract_content(URL, HTML)
+    assert {k: v for k, v in content.items() if k != 'readability_scores'} == extracted
+    assert content['readability_scores'] == dict(score_text(extracted['full_text']),
+                                                 paragraph_grades=score_paragraphs(extracted['paragraphs']))
+
+def test_readability_section_reuses_precomputed_scores():
+    analyzer = DocumentationAnalyzer('test-key')
+    content = dict(extract_content(URL, HTML), readability_scores={'flesch_kincaid_grade': 99, 'paragraph_grades': []})
+    assert analyzer.readability_section(content, 'ok')['flesch_kincaid_grade'] == 99
+    del content['readability_scores']
+    assert analyzer.readability_section(content, 'ok') == analyzer.readability_section(parse_and_score(URL, HTML), 'ok')
+
+def _run(tmp_path, parse_workers):
+    analyzer = DocumentationAnalyzer('test-key')
+    analyzer.client = SimpleNamespace(messages=FakeMessages())
+    analyzer.session = FakeSession()
+    output = tmp_path / f'results-{parse_workers}.jsonl'
+    urls = [f'{URL}-{i}' for i in range(4)]
+    stats = BatchAnalyzer(analyzer, fetch_workers=2, analysis_workers=2, parse_workers=parse_workers).run(urls, str(output))
+    with open(output, encoding='utf-8') as f:
+        records = [json.loads(line) for line in f]
+    for record in records:
+        del record['analysis_timestamp']
+    return stats, sorted(records, key=lambda r: r['url'])
+
+def test_process_pool_output_matches_in_thread_parsing(tmp_path):
+    stats, pooled = _run(tmp_path, parse_workers=2)
+    assert stats['analyzed'] == 4
+    assert pooled == _run(tmp_path, parse_workers=0)[1]
@@ -0,0 +1,81 @@
+"""Tests for the shared token-bucket scheduler and how analyzers report failed LLM calls."""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from rate_limiter import RateLimiter
+from test_analyzer import FakeMessages, make_fake_analyzer
+
+class StatusError(Exception):
+    def __init__(self, status_code, retry_after=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(headers={'retry-after': retry_after} if retry_after else {})
+
+class FlakyMessages(FakeMessages):
+    """Raises the queued errors first, then answers like FakeMessages."""
+
+    def __init__(self, errors):
+        super().__init__()
+        self.errors = list(errors)
+        self.attempts = 0
+
+    def create(self, model, max_tokens, messages):
+        self.attempts += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return super().create(model, max_tokens, messages)
+
+def test_tokens_per_minute_bucket_limits_large_requests():
+    limiter = RateLimiter(requests_per_minute=0, tokens_per_minute=100, period=0.2)
+    start = time.monotonic()
+    limiter.acquire(100)
+    limiter.acquire(50)
+    assert time.monotonic() - start >= 0.1
+
+def test_unused_reserved_tokens_are_refunded():
+    limiter = RateLimiter(requests_per_minute=0, tokens_per_minute=1000, period=60)
+    usage = SimpleNamespace(usage=SimpleNamespace(input_tokens=100, output_tokens=100))
+    limiter.call(lambda: usage, tokens=900)
+    assert limiter.tokens.level == pytest.approx(800, abs=1)
+
+def test_retry_after_pauses_every_worker():
+    limiter = RateLimiter(requests_per_minute=0, backoff=0.01)
+    errors = [StatusError(429, retry_after='0.2')]
+    def request():
+        if errors:
+            raise errors.pop()
+        return 'ok'
+    start = time.monotonic()
+    assert limiter.call(request) == 'ok'
+    assert time.monotonic() - start >= 0.2
+    limiter.pause(0.1)
+    assert limiter._reserve() > 0
+
+def test_non_retryable_errors_are_raised_immediately():
+    limiter = RateLimiter(requests_per_minute=0)
+    calls = []
+    def request():
+        calls.append(1)
+        raise StatusError(400)
+    with pytest.raises(StatusError):
+        limiter.call(request)
+    assert len(calls) == 1
+
+def test_overloaded_calls_are_retried_and_counted():
+    analyzer = make_fake_analyzer(metrics=True, rate_limiter=RateLimiter(backoff=0.01))
+    analyzer.client.messages = FlakyMessages([StatusError(529), StatusError(503)])
+    result = analyzer.analyze_document('https://help.moengage.com/hc/en-us/articles/1')
+    assert all('error' not in result[name] for name in ('readability', 'structure'))
+    assert result['metrics']['retries'] == 2 and result['metrics']['llm_calls'] == 4
+
+def test_exhausted_retries_become_error_fields_not_assessments():
+    analyzer = make_fake_analyzer(rate_limiter=RateLimiter(max_retries=1, backoff=0.01))
+    analyzer.client.messages = FlakyMessages([StatusError(500), StatusError(500)])
+    result = analyzer.analyze_document('https://help.moengage.com/hc/en-us/articles/1')
+    assert result['readability']['error'] == 'LLM failed: HTTP 500'
+    assert result['readability']['assessment'] is None and result['readability']['suggestions'] == []
+    assert 'flesch_kincaid_grade' in result['readability']
+    assert 'error' not in result['structure']
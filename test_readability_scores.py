@@ -0,0 +1,66 @@
+"""Tests that the local readability engine agrees with textstat."""
+
+import pytest
+import textstat
+
+import readability_scores
+from readability_scores import score_batch, score_paragraphs, score_text, word_syllables
+from test_analyzer import MockDocumentationAnalyzer
+
+TOLERANCE = 0.05
+
+ARTICLE = MockDocumentationAnalyzer().fetch_content('u')
+TEXTS = [
+    ARTICLE['full_text'],
+    "Click Settings > App Settings > Push. Enter your FCM server key (e.g., AAAA...). Save. Then verify "
+    "the integration using the 'Test' button: it sends a notification to registered devices.",
+    "MoEngage's re-engagement campaigns—configured via the dashboard—aren't hard! Use v1.2.3 of the SDK; "
+    "e.g. call init() first. Done?",
+    "Segmentation, personalization and orchestration capabilities significantly accelerate "
+    "cross-channel experimentation. Administrators typically configure authentication. "
+    "Organizations prioritize deliverability optimization. Analytics visualization simplifies attribution.",
+    "Hi.",
+    "",
+]
+TEXTSTAT = {
+    'flesch_kincaid_grade': textstat.flesch_kincaid_grade,
+    'gunning_fog_score': textstat.gunning_fog,
+    'smog_index': textstat.smog_index,
+    'coleman_liau_index': textstat.coleman_liau_index,
+}
+
+@pytest.mark.parametrize('text', TEXTS)
+def test_scores_match_textstat(text):
+    scores = score_text(text)
+    for metric, reference in TEXTSTAT.items():
+        assert scores[metric] == pytest.approx(reference(text), abs=TOLERANCE), metric
+
+@pytest.mark.parametrize('numpy', [True, False])
+def test_batch_matches_single_document_scores(monkeypatch, numpy):
+    if not numpy:
+        monkeypatch.setattr(readability_scores, 'np', None)
+    elif readability_scores.np is None:
+        pytest.skip('numpy not installed')
+    batch = score_batch(TEXTS)
+    for i, text in enumerate(TEXTS):
+        single = score_text(text)
+        assert {metric: column[i] for metric, column in batch.items()} == single
+
+def test_paragraph_grades_follow_paragraph_order():
+    grades = score_paragraphs(ARTICLE['paragraphs'])
+    assert grades == [textstat.flesch_kincaid_grade(p) for p in ARTICLE['paragraphs']]
+
+def test_syllable_table_is_memoized():
+    word_syllables.cache_clear()
+    readability_scores._token_stats.cache_clear()
+    score_text("Notification notification, notification.")
+    assert word_syllables.cache_info().misses == 1
+
+def test_easy_words_fall_back_to_textstat(monkeypatch):
+    monkeypatch.setattr(readability_scores, 'is_easy_word', textstat.is_easy_word)
+    readability_scores._token_stats.cache_clear()
+    try:
+        for text in TEXTS:
+            assert score_text(text)['gunning_fog_score'] == pytest.approx(textstat.gunning_fog(text), abs=TOLERANCE)
+    finally:
+        readability_scores._token_stats.cache_clear()
@@ -0,0 +1,58 @@
+"""Tests for the deterministic style and structure rules and the LLM-free pre-screen mode."""
+
+import time
+
+from style_rules import banned_term_issues, heading_issues, list_issues, sentence_issues, style_issues
+from test_analyzer import MockDocumentationAnalyzer, make_fake_analyzer
+
+def _rules(issues):
+    return [issue['rule'] for issue in issues]
+
+def test_skipped_heading_levels_are_reported():
+    headings = [{'level': 1, 'text': 'Setup'}, {'level': 2, 'text': 'Install'},
+                {'level': 4, 'text': 'Advanced Configuration'}, {'level': 2, 'text': 'Test'}, {'level': 3, 'text': 'iOS'}]
+    assert heading_issues(headings) == [
+        "Heading level jumps from H2 to H4 in the 'Advanced Configuration' section - consider adding an H3 level"
+    ]
+
+def test_passive_voice_and_long_sentences():
+    long_sentence = ' '.join(['word'] * 31) + '.'
+    issues = sentence_issues(['The campaign is sent to every user. Send the campaign now.', long_sentence])
+    assert _rules(issues) == ['passive_voice', 'long_sentence']
+    assert issues[0]['text'] == 'is sent' and issues[0]['location'] == 'paragraph 1'
+    assert issues[1]['location'] == 'paragraph 2'
+
+def test_only_ordered_list_steps_must_be_imperative():
+    lists = [{'type': 'ul', 'items': ['Android SDK', 'The iOS SDK']},
+             {'type': 'ol', 'items': ['Download the SDK', 'You add it to the project', 'Configuring the app']}]
+    issues = list_issues(lists)
+    assert [issue['location'] for issue in issues] == ['list 2 item 2', 'list 2 item 3']
+
+def test_banned_terms_with_replacements():
+    content = {'headings': [{'level': 1, 'text': 'Utilize segments'}],
+               'paragraphs': ['Click on Save in order to continue, e.g. after editing.'], 'lists': []}
+    issues = banned_term_issues(content)
+    assert [issue['text'] for issue in issues] == ['Utilize', 'Click on', 'in order to', 'e.g.']
+    assert issues[1]['message'] == "Replace 'Click on' with select"
+
+def test_rules_run_in_milliseconds():
+    content = MockDocumentationAnalyzer().fetch_content('u')
+    content = dict(content, paragraphs=content['paragraphs'] * 40)
+    start = time.perf_counter()
+    style_issues(content)
+    assert time.perf_counter() - start < 0.05
+
+def test_prescreen_mode_makes_no_llm_calls():
+    analyzer = make_fake_analyzer(prescreen=True)
+    result = analyzer.analyze_document('https://help.moengage.com/hc/en-us/articles/1')
+    assert analyzer.client.messages.calls == [] and result['prescreen'] is True
+    assert result['readability']['assessment'] is None and 'flesch_kincaid_grade' in result['readability']
+    assert result['style_guidelines']['suggestions'] == [
+        f"{issue['message']} ({issue['location']})" for issue in result['style_guidelines']['rule_issues']
+    ][:10]
+
+def test_full_analysis_includes_rule_findings():
+    result = make_fake_analyzer().analyze_document('https://help.moengage.com/hc/en-us/articles/1')
+    content = MockDocumentationAnalyzer().fetch_content('u')
+    assert result['style_guidelines']['rule_issues'] == style_issues(content)
+    assert result['structure']['hierarchy_issues'] == heading_issues(content['headings'])